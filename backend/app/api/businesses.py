@@ -2,15 +2,64 @@
 API endpoints for business search.
 Following Single Responsibility Principle - only handles HTTP routing.
 """
-from fastapi import APIRouter, HTTPException
-from app.models import SearchCriteria, SearchResponse, Business
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import AsyncIterator, Optional
+import asyncio
+import json
+import re
+import time
+from app.models import (
+    SearchCriteria, SearchResponse, Business, JobSubmitRequest, SearchJob, JobStatus,
+    BatchSearchRequest, BatchItemStatus, EnrichRequest, ExportFormat, ResultSetQuery, ResultPage
+)
 from app.services.factory import ServiceFactory
+from app.services.job_queue import QueueFullError
+from app.services.deadline import deadline_scope, search_within_budget, stream_within_budget
+from app.services.strategy_runner import HedgedStrategyRunner
+from app.services.enrichment import EnrichmentBatch, ENRICH_WEBSITES
+from app.services.exporters import (
+    business_row, get_row_writer, encode_rows, accepts_gzip, gzip_chunks,
+    ExportUnavailableError, EXPORT_BATCH_ROWS
+)
+from app.services.playwright_scraper import NO_RESULTS_NAME
+from app.services.result_sets import InvalidCursorError
+from app.services.dedup import DedupIndex
 
 router = APIRouter(prefix="/api/businesses", tags=["businesses"])
 
 
+class _ClientDisconnected(Exception):
+    """The client went away before the response was ready."""
+
+
+async def _until_disconnect(request: Request, awaitable):
+    """
+    Await `awaitable`, cancelling it (and releasing its browser) as soon as
+    the client disconnects.
+    """
+    task = asyncio.ensure_future(awaitable)
+    
+    async def watch():
+        while True:
+            message = await request.receive()
+            if message["type"] == "http.disconnect":
+                task.cancel()
+                return
+    
+    watcher = asyncio.create_task(watch())
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if watcher.done():
+            raise _ClientDisconnected()
+        raise
+    finally:
+        watcher.cancel()
+
+
 @router.post("/search", response_model=SearchResponse)
-async def search_businesses(criteria: SearchCriteria):
+async def search_businesses(criteria: SearchCriteria, request: Request):
     """
     Search for businesses based on criteria.
     
@@ -18,28 +67,467 @@ async def search_businesses(criteria: SearchCriteria):
         criteria: Search criteria including industry, location, radius
         
     Returns:
-        SearchResponse with list of businesses
+        SearchResponse with list of businesses; partial is set when
+        time_budget_s ran out first
     """
     try:
         # Get service from factory 
         search_service = ServiceFactory.get_search_service()
         
         # Execute search
-        businesses = await search_service.search_businesses(criteria)
+        businesses, partial = await _until_disconnect(
+            request, search_within_budget(search_service, criteria)
+        )
         
         # Build query string for response
         query = f"{criteria.industry} near {criteria.location}"
+        result_set = ServiceFactory.get_result_sets().create(query, criteria, businesses, partial)
         
         return SearchResponse(
             query=query,
             total_results=len(businesses),
-            businesses=businesses
+            businesses=businesses,
+            partial=partial,
+            result_set_id=result_set.id
         )
+    except _ClientDisconnected:
+        # Nobody is listening; 499 is what proxies log for this
+        return Response(status_code=499)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+@router.post("/search/stream")
+async def stream_search_businesses(criteria: SearchCriteria):
+    """
+    Search for businesses, streaming each one as soon as it is extracted.
+    
+    The response is newline-delimited JSON: one {"type": "business"} frame
+    per business, then a {"type": "summary"} frame (or {"type": "error"}).
+    The summary's partial is set when time_budget_s ran out first, and its
+    result_set_id can be paged through with /results/{id}.
+    Disconnecting cancels the search.
+    
+    With enrich, websites are fetched once the search is done, and after
+    the summary come {"type": "enrichment"} frames with the email and
+    social links found for a business "index", then {"type": "enrichment_done"}.
+    """
+    search_service = ServiceFactory.get_search_service()
+    query = f"{criteria.industry} near {criteria.location}"
+    enrich = ENRICH_WEBSITES if criteria.enrich is None else criteria.enrich
+    
+    async def frames():
+        total = 0
+        result_set = ServiceFactory.get_result_sets().create(query, criteria)
+        enrichment = EnrichmentBatch(ServiceFactory.get_enricher()) if enrich else None
+        try:
+            with deadline_scope(criteria.time_budget_s) as deadline:
+                try:
+                    async for business in stream_within_budget(search_service, criteria):
+                        yield json.dumps({
+                            "type": "business",
+                            "index": total,
+                            "business": business.model_dump()
+                        }) + "\n"
+                        result_set.add(business)
+                        if enrichment is not None:
+                            enrichment.add(total, business)
+                        total += 1
+                except Exception as e:
+                    yield json.dumps({"type": "error", "detail": f"Search failed: {str(e)}"}) + "\n"
+                    return
+                partial = bool(deadline and deadline.partial)
+            
+            result_set.finish(partial)
+            yield json.dumps({
+                "type": "summary", "query": query, "total_results": total, "partial": partial,
+                "result_set_id": result_set.id
+            }) + "\n"
+            
+            if enrichment is None:
+                return
+            enriched = 0
+            async for index, business in enrichment.results():
+                result_set.update(index, business)
+                yield _enrichment_frame(index, business)
+                enriched += 1
+            yield json.dumps({"type": "enrichment_done", "enriched": enriched}) + "\n"
+        finally:
+            # Also stops fetching websites when the client goes away
+            if enrichment is not None:
+                await enrichment.aclose()
+    
+    return StreamingResponse(
+        frames(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/search/batch")
+async def batch_search_businesses(request: BatchSearchRequest):
+    """
+    Run many searches, streaming each result as soon as its search finishes.
+    
+    Searches run concurrently up to the available browser capacity, paced
+    by the per-host rate limiter; throttled searches are retried after a
+    backoff. The response is newline-delimited JSON: one {"type": "result"}
+    frame per search (in completion order, with its "index" in the
+    request), then a {"type": "summary"} frame.
+    """
+    batch_runner = ServiceFactory.get_batch_runner()
+    
+    async def frames():
+        started = time.monotonic()
+        counts = {status.value: 0 for status in BatchItemStatus}
+        async for result in batch_runner.run(request.searches, request.concurrency):
+            counts[result.status.value] += 1
+            yield json.dumps({"type": "result", **result.model_dump(mode="json")}) + "\n"
+        
+        yield json.dumps({
+            "type": "summary",
+            "total": len(request.searches),
+            **counts,
+            "elapsed_s": round(time.monotonic() - started, 3)
+        }) + "\n"
+    
+    return StreamingResponse(
+        frames(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _enrichment_frame(index: int, business: Business) -> str:
+    return json.dumps({
+        "type": "enrichment",
+        "index": index,
+        "email": business.email,
+        "social_links": business.social_links
+    }) + "\n"
+
+
+@router.post("/enrich")
+async def enrich_businesses(request: EnrichRequest):
+    """
+    Look up emails and social links on the websites of already scraped businesses.
+    
+    The response is newline-delimited JSON: one {"type": "enrichment"} frame
+    per business that gained contact details (in completion order, with its
+    "index" in the request), then a {"type": "summary"} frame.
+    """
+    enricher = ServiceFactory.get_enricher()
+    
+    async def frames():
+        started = time.monotonic()
+        enriched = 0
+        async for index, business in enricher.enrich_all(request.businesses):
+            yield _enrichment_frame(index, business)
+            enriched += 1
+        
+        yield json.dumps({
+            "type": "summary",
+            "total": len(request.businesses),
+            "enriched": enriched,
+            "elapsed_s": round(time.monotonic() - started, 3)
+        }) + "\n"
+    
+    return StreamingResponse(
+        frames(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _export_response(
+    request: Request, export_format: ExportFormat, batches: AsyncIterator[list[list]], *name_parts: str
+) -> StreamingResponse:
+    """
+    Stream row batches as an export file download, gzipped when the client
+    accepts it and the format is not compressed already.
+    """
+    try:
+        writer = get_row_writer(export_format.value)
+    except ExportUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    slug = re.sub(r'[^0-9a-z]+', '-', ' '.join(name_parts).casefold()).strip('-')
+    filename = f"businesses-{slug}" if slug else "businesses"
+    body = encode_rows(writer, batches)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{writer.extension}"',
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    }
+    if writer.compressible:
+        headers["Vary"] = "Accept-Encoding"
+        if accepts_gzip(request.headers.get("accept-encoding")):
+            body = gzip_chunks(body)
+            headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=writer.media_type, headers=headers)
+
+
+@router.post("/export")
+async def export_batch_search(
+    batch: BatchSearchRequest,
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format")
+):
+    """
+    Run many searches and stream their businesses as one CSV, XLSX or
+    Parquet file, writing each search's rows as soon as it finishes.
+    
+    Failed and throttled searches contribute no rows; /search/batch reports
+    per-search outcomes.
+    """
+    batch_runner = ServiceFactory.get_batch_runner()
+    
+    async def batches():
+        async for result in batch_runner.run(batch.searches, batch.concurrency):
+            if result.status == BatchItemStatus.COMPLETED:
+                yield [
+                    business_row(business, result.criteria)
+                    for business in result.businesses if business.name != NO_RESULTS_NAME
+                ]
+    
+    return _export_response(request, export_format, batches())
+
+
+@router.post("/jobs", response_model=SearchJob, response_model_exclude={"businesses"}, status_code=202)
+async def submit_search_job(request: JobSubmitRequest):
+    """
+    Queue a search to run in the background.
+    
+    Returns 429 with the current queue depth when the queue is full.
+    """
+    job_queue = ServiceFactory.get_job_queue()
+    try:
+        return job_queue.submit(request.criteria, request.priority)
+    except QueueFullError as e:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(e), "queue_depth": e.depth},
+            headers={"Retry-After": "30"}
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=SearchJob, response_model_exclude={"businesses"})
+async def get_search_job(job_id: str):
+    """Status of a background search."""
+    job = ServiceFactory.get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/results", response_model=SearchResponse)
+async def get_search_job_results(job_id: str):
+    """Results of a completed background search."""
+    job = ServiceFactory.get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status.value}")
+    
+    return SearchResponse(
+        query=f"{job.criteria.industry} near {job.criteria.location}",
+        total_results=len(job.businesses),
+        businesses=job.businesses,
+        partial=bool(job.partial),
+        result_set_id=job.result_set_id
+    )
+
+
+@router.get("/jobs/{job_id}/export")
+async def export_search_job_results(
+    job_id: str,
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format")
+):
+    """Results of a completed background search as a CSV, XLSX or Parquet file."""
+    job = ServiceFactory.get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status.value}")
+    
+    async def batches():
+        businesses = [business for business in job.businesses if business.name != NO_RESULTS_NAME]
+        for start in range(0, len(businesses), EXPORT_BATCH_ROWS):
+            yield [business_row(business, job.criteria) for business in businesses[start:start + EXPORT_BATCH_ROWS]]
+    
+    return _export_response(request, export_format, batches(), job.criteria.industry, job.criteria.location)
+
+
+@router.delete("/jobs/{job_id}", response_model=SearchJob, response_model_exclude={"businesses"})
+async def cancel_search_job(job_id: str):
+    """Cancel a queued or running background search."""
+    job = ServiceFactory.get_job_queue().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/results/{result_set_id}", response_model=ResultPage)
+async def get_result_page(result_set_id: str, query: ResultSetQuery = Depends()):
+    """
+    A page of a search's results, sorted and filtered on the server.
+    
+    Pass the previous page's next_cursor, with the same sort and filters,
+    for the next page. Nothing is scraped; an expired result set is a 404.
+    """
+    result_sets = ServiceFactory.get_result_sets()
+    result_set = result_sets.get(result_set_id)
+    if result_set is None:
+        raise HTTPException(status_code=404, detail="Result set not found or expired")
+    try:
+        return result_sets.page(result_set, query)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/results/{result_set_id}/export")
+async def export_result_set(
+    result_set_id: str,
+    request: Request,
+    query: ResultSetQuery = Depends(),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format")
+):
+    """A result set, with its sort and filters applied (cursor and limit ignored), as a file."""
+    result_set = ServiceFactory.get_result_sets().get(result_set_id)
+    if result_set is None:
+        raise HTTPException(status_code=404, detail="Result set not found or expired")
+    view = result_set.view(query)
+    
+    async def batches():
+        for start in range(0, len(view), EXPORT_BATCH_ROWS):
+            yield [
+                business_row(result_set.businesses[index], result_set.criteria)
+                for index in view[start:start + EXPORT_BATCH_ROWS]
+                if result_set.businesses[index].name != NO_RESULTS_NAME
+            ]
+    
+    return _export_response(request, export_format, batches(), result_set.query)
+
+
+@router.get("/results")
+async def result_set_stats():
+    """Result sets held for paged reads."""
+    return ServiceFactory.get_result_sets().stats()
+
+
+@router.get("/jobs")
+async def job_queue_stats():
+    """Queue depth and running job count."""
+    return ServiceFactory.get_job_queue().stats()
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "business-scraper-api"}
\ No newline at end of file
+    return {"status": "healthy", "service": "business-scraper-api"}
+
+
+@router.get("/pool")
+async def pool_stats():
+    """Browser pool occupancy, for sizing BROWSER_POOL_SIZE."""
+    return ServiceFactory.get_browser_pool().stats()
+
+
+@router.get("/cache")
+async def cache_stats():
+    """Search cache hit/miss counters and size."""
+    return ServiceFactory.get_search_cache().stats()
+
+
+@router.get("/store")
+async def store_stats():
+    """Local business store size and how often it answered searches."""
+    store = ServiceFactory.get_business_store()
+    return store.stats() if store else {"enabled": False}
+
+
+@router.get("/store/export")
+async def export_store(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    industry: Optional[str] = None,
+    location: Optional[str] = None
+):
+    """
+    Businesses in the local store as a CSV, XLSX or Parquet file: all of
+    them, or with industry and location, the last run of that search.
+    Rows are read from SQLite a page at a time.
+    """
+    store = ServiceFactory.get_business_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Business store is disabled")
+    if (industry is None) != (location is None):
+        raise HTTPException(status_code=400, detail="Give both industry and location, or neither")
+    criteria = SearchCriteria(industry=industry, location=location) if industry is not None else None
+    
+    async def batches():
+        async for businesses in store.iter_businesses(industry, location, EXPORT_BATCH_ROWS):
+            yield [business_row(business, criteria) for business in businesses]
+    
+    return _export_response(request, export_format, batches(), industry or "", location or "")
+
+
+@router.get("/store/duplicates")
+async def store_duplicates(limit: int = Query(20, ge=0, le=1000)):
+    """
+    Groups of stored businesses that look like the same business (same
+    phone, or a similar name at a compatible address). The store is read a
+    page at a time and only normalized keys and names are kept.
+    """
+    store = ServiceFactory.get_business_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Business store is disabled")
+    index = DedupIndex()
+    names: list[str] = []
+    
+    def add(businesses: list[Business]):
+        for business in businesses:
+            index.add(business)
+            names.append(business.name)
+    
+    def summary() -> dict:
+        groups = index.groups()
+        return {
+            **index.stats(),
+            "duplicate_groups": len(groups),
+            "duplicates": sum(len(group) - 1 for group in groups),
+            "sample": [[names[i] for i in group] for group in groups[:limit]],
+        }
+    
+    # Matching and grouping are pure Python over the whole store: keep them off the event loop
+    async for businesses in store.iter_businesses(batch_size=EXPORT_BATCH_ROWS):
+        await asyncio.to_thread(add, businesses)
+    return await asyncio.to_thread(summary)
+
+
+@router.get("/ratelimit")
+async def rate_limit_stats():
+    """Per-host token buckets and throttling backoff."""
+    return ServiceFactory.get_rate_limiter().stats()
+
+
+@router.get("/strategies")
+async def strategy_stats():
+    """Hedging mode and per-pattern success rates of the search strategies (worker processes report their own in their stats)."""
+    if ServiceFactory.get_search_workers() is not None or not ServiceFactory.uses_browser():
+        return {"enabled": False}
+    scraper = ServiceFactory.get_local_scraper()
+    return scraper.stats() if isinstance(scraper, HedgedStrategyRunner) else {"enabled": False}
+
+
+@router.get("/enrichment")
+async def enrichment_stats():
+    """Website enrichment counters and cache sizes."""
+    return ServiceFactory.get_enricher().stats()
+
+
+@router.get("/inflight")
+async def inflight_stats():
+    """Searches currently being scraped and how many callers were coalesced."""
+    return ServiceFactory.get_single_flight().stats()
@@ -2,15 +2,43 @@
 Main FastAPI application.
 Entry point for the backend service.
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.api.businesses import router as businesses_router
+from app.services.factory import ServiceFactory
+from app.services.telemetry import configure_logging, request_id_var
 import os
+import uuid
+
+
+configure_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start shared resources on startup and release them on shutdown."""
+    # With worker processes each worker owns its browser; otherwise this process does
+    scraper_backend = ServiceFactory.get_search_workers() or ServiceFactory.get_browser_pool()
+    job_queue = ServiceFactory.get_job_queue()
+    await scraper_backend.start()
+    await job_queue.start()
+    try:
+        yield
+    finally:
+        await job_queue.stop()
+        await scraper_backend.stop()
+        await ServiceFactory.get_http_client().close()
+        await ServiceFactory.get_public_http_client().close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Business Scraper API",
     description="API for scraping and searching business information",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 allowed_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
 # Configure CORS
@@ -20,8 +48,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    """Tag each request (and everything it logs) with an ID, echoed in X-Request-ID."""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # Include routers
 app.include_router(businesses_router)
 
@@ -36,6 +78,12 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
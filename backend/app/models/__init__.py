@@ -4,6 +4,7 @@ Following Single Responsibility Principle - only defines data structure.
 """
 from pydantic import BaseModel, Field
 from typing import Optional
+from enum import Enum
 
 
 class Business(BaseModel):
@@ -15,6 +16,8 @@ class Business(BaseModel):
     website: Optional[str] = None
     rating: Optional[float] = None
     reviews_count: Optional[int] = None
+    social_links: Optional[dict[str, str]] = Field(default=None, description="Social profiles found on the business website, by network")
+    refreshed_at: Optional[float] = Field(default=None, description="When details were last scraped, if served from the local business store")
 
 
 class SearchCriteria(BaseModel):
@@ -23,10 +26,138 @@ class SearchCriteria(BaseModel):
     location: str = Field(..., description="Location (e.g., 'New York, NY')")
     radius_km: Optional[int] = Field(default=10, description="Search radius in kilometers")
     max_results: Optional[int] = Field(default=20, ge=1, le=100, description="Maximum number of results")
+    detail_concurrency: Optional[int] = Field(default=None, ge=1, le=10, description="Parallel tabs for detail extraction (defaults to DETAIL_CONCURRENCY)")
+    max_age_s: Optional[int] = Field(default=None, ge=0, description="Answer from the local business store when its data is at most this old (defaults to BUSINESS_STORE_MAX_AGE_S; 0 always scrapes)")
+    tiling: Optional[bool] = Field(default=None, description="Split radius_km into a grid of Maps viewports searched in parallel (defaults to GEO_TILING)")
+    time_budget_s: Optional[float] = Field(default=None, gt=0, le=600, description="Return whatever has been extracted after this many seconds, flagged as partial")
+    enrich: Optional[bool] = Field(default=None, description="Look up emails and social links on business websites after the results are streamed (defaults to ENRICH_WEBSITES)")
 
 
 class SearchResponse(BaseModel):
     """Response model for business search."""
     query: str
     total_results: int
-    businesses: list[Business]
\ No newline at end of file
+    businesses: list[Business]
+    partial: bool = Field(default=False, description="The time budget ran out before the search finished")
+    result_set_id: Optional[str] = Field(default=None, description="ID for paged, sorted and filtered reads of these results")
+
+
+class CachedSearch(BaseModel):
+    """A cached search result and how many results were asked for."""
+    businesses: list[Business]
+    max_results: int
+    stored_at: float
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background search job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobSubmitRequest(BaseModel):
+    """Request body for submitting a background search."""
+    criteria: SearchCriteria
+    priority: int = Field(default=0, ge=0, le=9, description="Lower runs first")
+
+
+class SearchJob(BaseModel):
+    """A background search job and its outcome."""
+    id: str
+    status: JobStatus
+    priority: int
+    criteria: SearchCriteria
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    queue_position: Optional[int] = None
+    total_results: Optional[int] = None
+    partial: Optional[bool] = None
+    result_set_id: Optional[str] = None
+    error: Optional[str] = None
+    businesses: Optional[list[Business]] = None
+
+
+class BatchSearchRequest(BaseModel):
+    """Request body for running many searches in one call."""
+    searches: list[SearchCriteria] = Field(..., min_length=1, max_length=500)
+    concurrency: Optional[int] = Field(default=None, ge=1, le=32, description="Searches in flight at once (defaults to browser capacity)")
+
+
+class BatchItemStatus(str, Enum):
+    """Outcome of one search in a batch."""
+    COMPLETED = "completed"
+    FAILED = "failed"
+    THROTTLED = "throttled"
+
+
+class BatchItemResult(BaseModel):
+    """One finished search of a batch."""
+    index: int
+    status: BatchItemStatus
+    criteria: SearchCriteria
+    attempts: int
+    elapsed_s: float
+    total_results: int = 0
+    partial: bool = False
+    businesses: list[Business] = []
+    error: Optional[str] = None
+
+
+class EnrichRequest(BaseModel):
+    """Request body for looking up contact details of already scraped businesses."""
+    businesses: list[Business] = Field(..., min_length=1, max_length=500)
+
+
+class ExportFormat(str, Enum):
+    """File formats businesses can be exported as."""
+    CSV = "csv"
+    XLSX = "xlsx"
+    PARQUET = "parquet"
+
+
+class ResultSetSort(str, Enum):
+    """What a result set can be sorted by; rank is the order the search returned."""
+    RANK = "rank"
+    RATING = "rating"
+    REVIEWS_COUNT = "reviews_count"
+    NAME = "name"
+
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class ResultSetQuery(BaseModel):
+    """Sort, filters and page of a result set read."""
+    sort: ResultSetSort = ResultSetSort.RANK
+    order: SortOrder = SortOrder.ASC
+    min_rating: Optional[float] = Field(default=None, ge=0, le=5)
+    min_reviews: Optional[int] = Field(default=None, ge=0)
+    has_phone: Optional[bool] = None
+    has_website: Optional[bool] = None
+    has_email: Optional[bool] = None
+    cursor: Optional[str] = Field(default=None, description="next_cursor of the previous page")
+    limit: int = Field(default=25, ge=1, le=100)
+
+
+class ResultSetRow(BaseModel):
+    """A business and its position in the search's own order."""
+    index: int
+    business: Business
+
+
+class ResultPage(BaseModel):
+    """One page of a sorted, filtered result set."""
+    result_set_id: str
+    query: str
+    total_results: int
+    matching_results: int
+    rows: list[ResultSetRow]
+    next_cursor: Optional[str] = None
+    complete: bool
+    partial: bool = False
@@ -0,0 +1,103 @@
+"""
+Batch search scheduling.
+Following Single Responsibility Principle - only runs a list of searches to completion.
+
+Searches run concurrently up to the scraping capacity (browser contexts,
+or contexts across worker processes). Pacing against Google is left to the
+rate limiter inside the search service. A throttled search is retried
+after the host's backoff expires, and results are yielded as each search
+finishes rather than in request order.
+"""
+from typing import AsyncIterator, Callable, Optional
+import asyncio
+import logging
+import os
+import time
+from app.models import SearchCriteria, BatchItemResult, BatchItemStatus
+from app.services.interfaces import IBusinessSearchService
+from app.services.rate_limiter import ThrottledError
+from app.services.deadline import search_within_budget
+
+
+# Tries per search before giving up on a throttled one
+BATCH_MAX_ATTEMPTS = int(os.getenv("BATCH_MAX_ATTEMPTS", "3"))
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSearchRunner:
+    """Runs batches of searches with bounded concurrency and throttling retries."""
+
+    def __init__(
+        self,
+        service_provider: Callable[[], IBusinessSearchService],
+        concurrency: int,
+        max_attempts: int = BATCH_MAX_ATTEMPTS,
+    ):
+        self.service_provider = service_provider
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+
+    async def run(
+        self,
+        searches: list[SearchCriteria],
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[BatchItemResult]:
+        """
+        Yield one result per search, in completion order.
+
+        Closing the iterator (e.g. the client disconnected) cancels every
+        search still queued or running.
+        """
+        service = self.service_provider()
+        limit = max(1, min(concurrency or self.concurrency, len(searches)))
+        semaphore = asyncio.Semaphore(limit)
+        finished: asyncio.Queue = asyncio.Queue()
+
+        async def run_item(index: int, criteria: SearchCriteria):
+            async with semaphore:
+                finished.put_nowait(await self._run_item(service, index, criteria))
+
+        logger.info(
+            "Batch started",
+            extra={"fields": {"searches": len(searches), "concurrency": limit}}
+        )
+        tasks = [asyncio.create_task(run_item(i, criteria)) for i, criteria in enumerate(searches)]
+        try:
+            for _ in tasks:
+                yield await finished.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_item(self, service: IBusinessSearchService, index: int, criteria: SearchCriteria) -> BatchItemResult:
+        started = time.monotonic()
+
+        def result(status: BatchItemStatus, attempts: int, **fields) -> BatchItemResult:
+            return BatchItemResult(
+                index=index,
+                status=status,
+                criteria=criteria,
+                attempts=attempts,
+                elapsed_s=round(time.monotonic() - started, 3),
+                **fields
+            )
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                businesses, partial = await search_within_budget(service, criteria)
+                return result(
+                    BatchItemStatus.COMPLETED, attempt,
+                    total_results=len(businesses), partial=partial, businesses=businesses
+                )
+            except ThrottledError as e:
+                if attempt == self.max_attempts:
+                    return result(BatchItemStatus.THROTTLED, attempt, error=str(e))
+                # The rate limiter holds the retry until the host's backoff expires
+                logger.info(
+                    "Batch search throttled, retrying",
+                    extra={"fields": {"index": index, "attempt": attempt, "reason": e.reason}}
+                )
+            except Exception as e:
+                return result(BatchItemStatus.FAILED, attempt, error=f"Search failed: {str(e)}")
@@ -0,0 +1,246 @@
+"""
+Long-lived Chromium browser pool.
+Following Single Responsibility Principle - only manages browser lifecycle.
+
+One browser process is launched for the lifetime of the app. Each search
+borrows an isolated BrowserContext, which is recycled after a number of uses
+or discarded as soon as it crashes. A search that was cancelled or closed
+early (hedge losers, disconnects, early stops) returns its context like any
+other; only Playwright errors other than timeouts count as crashes. With a ResponseCache, every context's
+requests are served through it.
+"""
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeout
+from contextlib import asynccontextmanager
+from typing import Optional, List, AsyncIterator
+import asyncio
+import logging
+import os
+from app.services.request_routing import RoutingPolicy, RequestRouter, get_routing_policy
+from app.services.response_cache import ResponseCache
+from app.services.telemetry import span
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+class _PooledContext:
+    """A browser context plus its bookkeeping."""
+
+    def __init__(self, context: BrowserContext, router: RequestRouter):
+        self.context = context
+        self.router = router
+        self.uses = 0
+        self.crashed = False
+
+
+class BrowserPool:
+    """Keeps one browser alive and leases BrowserContexts to searches."""
+
+    def __init__(
+        self,
+        max_contexts: Optional[int] = None,
+        max_uses_per_context: Optional[int] = None,
+        headless: bool = True,
+        user_agent: str = DEFAULT_USER_AGENT,
+        routing_policy: Optional[RoutingPolicy] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        self.max_contexts = max_contexts or int(os.getenv("BROWSER_POOL_SIZE", "4"))
+        self.max_uses_per_context = max_uses_per_context or int(os.getenv("BROWSER_CONTEXT_MAX_USES", "20"))
+        self.headless = headless
+        self.user_agent = user_agent
+        self.routing_policy = routing_policy or get_routing_policy()
+        self.response_cache = response_cache
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._idle: List[_PooledContext] = []
+        self._semaphore = asyncio.Semaphore(self.max_contexts)
+        self._launch_lock = asyncio.Lock()
+
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._recycled = 0
+        self._crashed = 0
+        self._leases = 0
+        self._blocked_requests = 0
+        self._allowed_requests = 0
+        self._estimated_bytes_saved = 0
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self):
+        """Start Playwright and launch the shared browser."""
+        if self.started:
+            return
+        self._playwright = await async_playwright().start()
+        await self._ensure_browser()
+        logger.info("Browser pool started", extra={"fields": {"max_contexts": self.max_contexts}})
+
+    async def stop(self):
+        """Close every context, the browser and Playwright."""
+        for pooled in self._idle:
+            await self._close_context(pooled)
+        self._idle.clear()
+
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        logger.info("Browser pool stopped")
+
+    @asynccontextmanager
+    async def context(self, session: Optional[str] = None) -> AsyncIterator[BrowserContext]:
+        """
+        Lease an isolated BrowserContext for the duration of one search.
+
+        Blocks while all contexts are in use. A context is recycled after
+        max_uses_per_context leases, and thrown away if the browser failed
+        under the search (target closed, crashed page, ...).
+        `session` names the search's traffic when recording or replaying.
+        """
+        if not self.started:
+            raise RuntimeError("Browser pool is not started")
+
+        with span("browser_acquire") as acquire:
+            self._waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self._waiting -= 1
+            acquire.set(in_use=self._in_use)
+
+        pooled = None
+        try:
+            with span("browser_checkout"):
+                pooled = await self._checkout()
+            pooled.router.reset(session)
+            self._in_use += 1
+            self._leases += 1
+            pooled.uses += 1
+            try:
+                yield pooled.context
+            except PlaywrightError as e:
+                # Timeouts are the page being slow, not the context being broken
+                if not isinstance(e, PlaywrightTimeout):
+                    pooled.crashed = True
+                raise
+            finally:
+                self._in_use -= 1
+                await self._checkin(pooled)
+        finally:
+            self._semaphore.release()
+
+    async def _ensure_browser(self) -> Browser:
+        """Launch the browser, or relaunch it if it disconnected."""
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._browser is not None:
+                    logger.warning("Browser disconnected, relaunching")
+                    self._idle.clear()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=self.headless,
+                    args=['--disable-blink-features=AutomationControlled']
+                )
+            return self._browser
+
+    async def _checkout(self) -> _PooledContext:
+        """Take an idle context, or create a new one."""
+        browser = await self._ensure_browser()
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.context.browser is browser:
+                return pooled
+            await self._close_context(pooled)
+
+        context = await browser.new_context(
+            user_agent=self.user_agent,
+            viewport={'width': 1920, 'height': 1080}
+        )
+        pooled = _PooledContext(context, RequestRouter(self.routing_policy, self.response_cache))
+        try:
+            await pooled.router.attach(context)
+        except BaseException:
+            # Not handed out yet, so nothing else will close it; the caller
+            # releases the semaphore slot
+            await self._close_context(pooled)
+            raise
+        self._created += 1
+        return pooled
+
+    async def _checkin(self, pooled: _PooledContext):
+        """Return a context to the pool, or retire it."""
+        self._record_routing(pooled.router)
+
+        if pooled.crashed:
+            self._crashed += 1
+            await self._close_context(pooled)
+            return
+
+        if pooled.uses >= self.max_uses_per_context:
+            self._recycled += 1
+            await self._close_context(pooled)
+            return
+
+        # Close leftover pages so the next search starts clean
+        for page in list(pooled.context.pages):
+            try:
+                await page.close()
+            except Exception:
+                pooled.crashed = True
+        if pooled.crashed:
+            self._crashed += 1
+            await self._close_context(pooled)
+            return
+
+        self._idle.append(pooled)
+
+    def _record_routing(self, router: RequestRouter):
+        """Log what routing saved during one search and add it to the totals."""
+        saved = router.snapshot()
+        self._blocked_requests += saved["blocked_requests"]
+        self._allowed_requests += saved["allowed_requests"]
+        self._estimated_bytes_saved += saved["estimated_bytes_saved"]
+        if saved["blocked_requests"]:
+            logger.info("Blocked requests during search", extra={"fields": saved})
+
+    async def _close_context(self, pooled: _PooledContext):
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        """Pool occupancy, for sizing."""
+        return {
+            "started": self.started,
+            "browser_connected": bool(self._browser and self._browser.is_connected()),
+            "max_contexts": self.max_contexts,
+            "max_uses_per_context": self.max_uses_per_context,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "waiting": self._waiting,
+            "leases": self._leases,
+            "contexts_created": self._created,
+            "contexts_recycled": self._recycled,
+            "contexts_crashed": self._crashed,
+            "routing": {
+                "policy": self.routing_policy.name,
+                "allowed_requests": self._allowed_requests,
+                "blocked_requests": self._blocked_requests,
+                "estimated_bytes_saved": self._estimated_bytes_saved,
+            },
+            "response_cache": self.response_cache.stats() if self.response_cache else None,
+        }
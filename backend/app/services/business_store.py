@@ -0,0 +1,348 @@
+"""
+Persistent local store of scraped businesses.
+Following Single Responsibility Principle - only remembers businesses across searches.
+
+Every scraped business is upserted into SQLite. A row is matched on its
+normalized phone number (with the same name) or on a name/address
+fingerprint. Rows are indexed by the search run they were found by (the
+industry, location, radius and whether the search was tiled), so a repeat
+search can be answered from the store while its data is fresh. Only stale
+or missing listings are scraped again.
+"""
+from typing import AsyncIterator, Optional
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import time
+from app.models import SearchCriteria, Business
+from app.services.interfaces import IBusinessSearchService
+from app.services.deadline import is_partial
+from app.services.geo_tiling import tiling_enabled
+from app.services.playwright_scraper import clean_phone, NO_RESULTS_NAME
+
+
+BUSINESS_STORE_PATH = os.getenv("BUSINESS_STORE_PATH", "business_store.sqlite3")
+# Default for SearchCriteria.max_age_s; 0 means always scrape
+BUSINESS_STORE_MAX_AGE_S = int(os.getenv("BUSINESS_STORE_MAX_AGE_S", "0"))
+
+_BUSINESS_FIELDS = ("name", "phone", "email", "address", "website", "rating", "reviews_count")
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Lowercase alphanumerics separated by single spaces."""
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', (text or '').casefold()).split())
+
+
+def phone_key(phone: Optional[str]) -> Optional[str]:
+    """Digits of the cleaned phone number, or None if there are none."""
+    digits = re.sub(r'\D', '', clean_phone(phone) or '')
+    return digits or None
+
+
+def fingerprint(name: str, address: Optional[str]) -> str:
+    """Identity of a business without a phone number: normalized name and address."""
+    return f"{_normalize(name)}|{_normalize(address)}"
+
+
+def run_key(criteria: SearchCriteria) -> tuple[str, str, int, int]:
+    """
+    (industry, location, radius_km, tiled) of a search run. A wider or tiled
+    search finds different businesses, so it is a different run; tiling is
+    resolved against GEO_TILING the same way the scraper does.
+    """
+    return (
+        _normalize(criteria.industry),
+        _normalize(criteria.location),
+        criteria.radius_km or 0,
+        int(tiling_enabled(criteria.tiling)),
+    )
+
+
+class BusinessStore:
+    """SQLite table of businesses plus the searches they were found by."""
+
+    def __init__(self, path: str = BUSINESS_STORE_PATH, default_max_age_s: int = BUSINESS_STORE_MAX_AGE_S):
+        self.path = path
+        self.default_max_age_s = default_max_age_s
+        self.served = 0
+        self.resolved_listings = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = asyncio.Lock()
+        # WAL lets worker processes read while another one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        run_columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(search_runs)")]
+        if run_columns and "radius_km" not in run_columns:
+            # Runs used to be keyed on industry/location only and cannot be told
+            # apart; drop them (not the businesses) and let searches rebuild them
+            logger.info("Dropping search runs recorded without radius and tiling")
+            self._conn.executescript("DROP TABLE business_searches; DROP TABLE search_runs;")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS businesses ("
+            " id INTEGER PRIMARY KEY, phone_key TEXT, fingerprint TEXT NOT NULL,"
+            " name TEXT NOT NULL, phone TEXT, email TEXT, address TEXT, website TEXT,"
+            " rating REAL, reviews_count INTEGER,"
+            " first_seen REAL NOT NULL, last_seen REAL NOT NULL, refreshed_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_businesses_phone ON businesses (phone_key);"
+            "CREATE INDEX IF NOT EXISTS idx_businesses_fingerprint ON businesses (fingerprint);"
+            "CREATE TABLE IF NOT EXISTS business_searches ("
+            " industry TEXT NOT NULL, location TEXT NOT NULL, radius_km INTEGER NOT NULL,"
+            " tiled INTEGER NOT NULL, business_id INTEGER NOT NULL,"
+            " rank INTEGER NOT NULL, run_at REAL NOT NULL,"
+            " PRIMARY KEY (industry, location, radius_km, tiled, business_id));"
+            "CREATE INDEX IF NOT EXISTS idx_business_searches_run"
+            " ON business_searches (industry, location, radius_km, tiled, run_at);"
+            "CREATE TABLE IF NOT EXISTS search_runs ("
+            " industry TEXT NOT NULL, location TEXT NOT NULL, radius_km INTEGER NOT NULL,"
+            " tiled INTEGER NOT NULL, max_results INTEGER NOT NULL,"
+            " result_count INTEGER NOT NULL, stored_count INTEGER NOT NULL, run_at REAL NOT NULL,"
+            " PRIMARY KEY (industry, location, radius_km, tiled));"
+        )
+        self._conn.commit()
+
+    def max_age_for(self, criteria: SearchCriteria) -> int:
+        return self.default_max_age_s if criteria.max_age_s is None else criteria.max_age_s
+
+    async def fresh_search(self, criteria: SearchCriteria) -> Optional[list[Business]]:
+        """
+        Businesses from the last run of this search (see run_key), if that
+        run and every row it returned are within max_age_s; otherwise None.
+        """
+        max_age_s = self.max_age_for(criteria)
+        if max_age_s <= 0:
+            return None
+        async with self._lock:
+            businesses = await asyncio.to_thread(self._fresh_search, criteria, max_age_s)
+        if businesses is not None:
+            self.served += 1
+        return businesses
+
+    async def resolve_listing(self, listing: dict, criteria: SearchCriteria) -> Optional[Business]:
+        """
+        The stored business for a feed listing ({name, address, ...}) if it
+        was refreshed within max_age_s, so its details need not be scraped.
+        """
+        max_age_s = self.max_age_for(criteria)
+        if max_age_s <= 0:
+            return None
+        async with self._lock:
+            business = await asyncio.to_thread(
+                self._find_fresh, fingerprint(listing['name'], listing.get('address')), max_age_s
+            )
+        if business is not None:
+            self.resolved_listings += 1
+        return business
+
+    async def record(self, criteria: SearchCriteria, businesses: list[Business]):
+        """Upsert a search's businesses and remember which search found them."""
+        businesses = [b for b in businesses if b.name != NO_RESULTS_NAME]
+        if not businesses:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._record, criteria, businesses)
+
+    async def iter_businesses(
+        self,
+        industry: Optional[str] = None,
+        location: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[Business]]:
+        """
+        Stored businesses a page at a time: all of them, or those of the most
+        recent run of one industry/location (whatever its radius and tiling)
+        in rank order. Only one page is in memory, and the lock is released
+        between pages so searches keep recording.
+        """
+        after = -1
+        while True:
+            async with self._lock:
+                page = await asyncio.to_thread(self._page, industry, location, after, batch_size)
+            if not page:
+                return
+            after = page[-1][0]
+            yield [business for _, business in page]
+            if len(page) < batch_size:
+                return
+
+    def _page(
+        self, industry: Optional[str], location: Optional[str], after: int, limit: int
+    ) -> list[tuple[int, Business]]:
+        """(sort key, business) pairs after `after`, keyset-paginated."""
+        if industry is None or location is None:
+            rows = self._conn.execute(
+                "SELECT id AS sort_key, * FROM businesses WHERE id > ? ORDER BY id LIMIT ?",
+                (after, limit)
+            ).fetchall()
+        else:
+            run = self._conn.execute(
+                "SELECT industry, location, radius_km, tiled, run_at FROM search_runs"
+                " WHERE industry = ? AND location = ? ORDER BY run_at DESC LIMIT 1",
+                (_normalize(industry), _normalize(location))
+            ).fetchone()
+            if run is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT s.rank AS sort_key, b.* FROM business_searches s"
+                " JOIN businesses b ON b.id = s.business_id"
+                " WHERE s.industry = ? AND s.location = ? AND s.radius_km = ? AND s.tiled = ?"
+                " AND s.run_at = ? AND s.rank > ? ORDER BY s.rank LIMIT ?",
+                (*run, after, limit)
+            ).fetchall()
+        return [(row["sort_key"], self._to_business(row)) for row in rows]
+
+    def _fresh_search(self, criteria: SearchCriteria, max_age_s: int) -> Optional[list[Business]]:
+        key = run_key(criteria)
+        now = time.time()
+        run = self._conn.execute(
+            "SELECT max_results, result_count, stored_count, run_at FROM search_runs"
+            " WHERE industry = ? AND location = ? AND radius_km = ? AND tiled = ?",
+            key
+        ).fetchone()
+        if run is None:
+            return None
+        run_max_results, result_count, stored_count, run_at = run
+        exhausted = result_count < run_max_results
+        if now - run_at > max_age_s or (run_max_results < criteria.max_results and not exhausted):
+            return None
+
+        rows = self._conn.execute(
+            "SELECT b.* FROM business_searches s JOIN businesses b ON b.id = s.business_id"
+            " WHERE s.industry = ? AND s.location = ? AND s.radius_km = ? AND s.tiled = ?"
+            " AND s.run_at = ? AND b.refreshed_at >= ?"
+            " ORDER BY s.rank LIMIT ?",
+            (*key, run_at, now - max_age_s, criteria.max_results)
+        ).fetchall()
+        # Some of the run's businesses went stale: scrape again
+        if len(rows) < min(criteria.max_results, stored_count):
+            return None
+        return [self._to_business(row) for row in rows]
+
+    def _find_fresh(self, key: str, max_age_s: int) -> Optional[Business]:
+        row = self._conn.execute(
+            "SELECT * FROM businesses WHERE fingerprint = ? AND refreshed_at >= ?"
+            " ORDER BY refreshed_at DESC LIMIT 1",
+            (key, time.time() - max_age_s)
+        ).fetchone()
+        return self._to_business(row) if row else None
+
+    def _record(self, criteria: SearchCriteria, businesses: list[Business]):
+        key = run_key(criteria)
+        now = time.time()
+        with self._conn:
+            # Duplicates within one result collapse into a single row
+            business_ids = []
+            for business in businesses:
+                business_id = self._upsert(business, now)
+                if business_id not in business_ids:
+                    business_ids.append(business_id)
+            for rank, business_id in enumerate(business_ids):
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO business_searches"
+                    " (industry, location, radius_km, tiled, business_id, rank, run_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (*key, business_id, rank, now)
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_runs"
+                " (industry, location, radius_km, tiled, max_results, result_count, stored_count, run_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, criteria.max_results, len(businesses), len(business_ids), now)
+            )
+
+    def _upsert(self, business: Business, now: float) -> int:
+        key = phone_key(business.phone)
+        identity = fingerprint(business.name, business.address)
+        # Served from the store rather than scraped: keep its refresh time
+        refreshed_at = business.refreshed_at or now
+        values = [getattr(business, field) for field in _BUSINESS_FIELDS]
+
+        existing = None
+        if key:
+            # Same phone and same name; chains can share a phone across branches
+            existing = self._conn.execute(
+                "SELECT id FROM businesses WHERE phone_key = ? AND fingerprint LIKE ?",
+                (key, _normalize(business.name) + "|%")
+            ).fetchone()
+        if existing is None:
+            existing = self._conn.execute(
+                "SELECT id FROM businesses WHERE fingerprint = ?", (identity,)
+            ).fetchone()
+
+        if existing is None:
+            cursor = self._conn.execute(
+                f"INSERT INTO businesses (phone_key, fingerprint, {', '.join(_BUSINESS_FIELDS)},"
+                " first_seen, last_seen, refreshed_at)"
+                f" VALUES (?, ?, {', '.join('?' for _ in _BUSINESS_FIELDS)}, ?, ?, ?)",
+                (key, identity, *values, now, now, refreshed_at)
+            )
+            return cursor.lastrowid
+
+        # Newer non-empty values win; missing ones keep what we already had
+        assignments = ', '.join(f"{field} = COALESCE(?, {field})" for field in _BUSINESS_FIELDS)
+        self._conn.execute(
+            f"UPDATE businesses SET {assignments},"
+            " phone_key = COALESCE(?, phone_key), fingerprint = ?,"
+            " last_seen = ?, refreshed_at = MAX(refreshed_at, ?) WHERE id = ?",
+            (*values, key, identity, now, refreshed_at, existing[0])
+        )
+        return existing[0]
+
+    def _to_business(self, row: sqlite3.Row) -> Business:
+        return Business(
+            **{field: row[field] for field in _BUSINESS_FIELDS},
+            refreshed_at=row["refreshed_at"]
+        )
+
+    def stats(self) -> dict:
+        businesses, with_phone = self._conn.execute(
+            "SELECT COUNT(*), COUNT(phone_key) FROM businesses"
+        ).fetchone()
+        searches = self._conn.execute("SELECT COUNT(*) FROM search_runs").fetchone()[0]
+        return {
+            "path": self.path,
+            "businesses": businesses,
+            "with_phone": with_phone,
+            "searches": searches,
+            "default_max_age_s": self.default_max_age_s,
+            "searches_served": self.served,
+            "listings_resolved": self.resolved_listings,
+        }
+
+
+class StoreBackedSearchService(IBusinessSearchService):
+    """Decorates a search service to record every result and answer fresh searches from the store."""
+
+    def __init__(self, inner: IBusinessSearchService, store: BusinessStore):
+        self.inner = inner
+        self.store = store
+
+    async def search_businesses(self, criteria: SearchCriteria) -> list[Business]:
+        stored = await self.store.fresh_search(criteria)
+        if stored is not None:
+            logger.info("Answered from business store", extra={"fields": {"results": len(stored)}})
+            return stored
+
+        businesses = await self.inner.search_businesses(criteria)
+        if not is_partial():
+            await self.store.record(criteria, businesses)
+        return businesses
+
+    async def stream_businesses(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        stored = await self.store.fresh_search(criteria)
+        if stored is not None:
+            for business in stored:
+                yield business
+            return
+
+        # Record only a completed stream, like the search cache
+        businesses = []
+        async for business in self.inner.stream_businesses(criteria):
+            businesses.append(business)
+            yield business
+        # A partial run would later be served as the whole result
+        if not is_partial():
+            await self.store.record(criteria, businesses)
@@ -0,0 +1,141 @@
+"""
+Per-search time budgets.
+Following Single Responsibility Principle - only tracks how long a search may still run.
+
+A Deadline is opened for one search with `deadline_scope` and read anywhere
+below it through a ContextVar. The scraper clamps its waits to the time
+left and stops extracting once the deadline passes, without the budget
+being threaded through every call. Code that stops early because time ran
+out calls `mark_partial`, so the caller can flag the result as partial
+and the cache and store layers can leave it out.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional
+import asyncio
+import os
+import time
+from app.models import SearchCriteria, Business
+from app.services.interfaces import IBusinessSearchService
+
+
+# Past the budget, how long a search may overrun before it is cut off
+DEADLINE_GRACE_S = float(os.getenv("DEADLINE_GRACE_S", "3"))
+
+
+class Deadline:
+    """Point in time a search must finish by, and whether it had to stop short."""
+
+    def __init__(self, budget_s: float):
+        self.budget_s = budget_s
+        self.at = time.monotonic() + budget_s
+        self.partial = False
+
+    def remaining_s(self) -> float:
+        return max(0.0, self.at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+
+deadline_var: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(budget_s: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """Apply a budget to everything run inside the block; no budget leaves things as they are."""
+    if not budget_s:
+        yield deadline_var.get()
+        return
+    deadline = Deadline(budget_s)
+    token = deadline_var.set(deadline)
+    try:
+        yield deadline
+    finally:
+        deadline_var.reset(token)
+
+
+def time_left_s() -> Optional[float]:
+    """Seconds until the current deadline, or None without one."""
+    deadline = deadline_var.get()
+    return deadline.remaining_s() if deadline else None
+
+
+def deadline_expired() -> bool:
+    deadline = deadline_var.get()
+    return deadline is not None and deadline.expired
+
+
+def clamp_timeout_ms(timeout_ms: int) -> int:
+    """A wait timeout cut down to the time left (never 0, which Playwright reads as no timeout)."""
+    left = time_left_s()
+    if left is None:
+        return timeout_ms
+    return max(1, min(timeout_ms, int(left * 1000)))
+
+
+def mark_partial():
+    """Record that the current search stopped early because its deadline passed."""
+    deadline = deadline_var.get()
+    if deadline is not None:
+        deadline.partial = True
+
+
+def is_partial() -> bool:
+    deadline = deadline_var.get()
+    return deadline is not None and deadline.partial
+
+
+async def stream_within_budget(service: IBusinessSearchService, criteria: SearchCriteria) -> AsyncIterator[Business]:
+    """
+    Stream a search under the current deadline.
+
+    The scraper is expected to stop by the deadline on its own. If it is
+    still running DEADLINE_GRACE_S later it is cancelled and the search is
+    marked partial. Closing this iterator cancels the search.
+    """
+    deadline = deadline_var.get()
+    if deadline is None:
+        async for business in service.stream_businesses(criteria):
+            yield business
+        return
+
+    # The search runs in its own task so the cutoff never lands in the consumer
+    found: asyncio.Queue = asyncio.Queue()
+    finished = object()
+
+    async def pump():
+        cutoff = asyncio.timeout(deadline.remaining_s() + DEADLINE_GRACE_S)
+        try:
+            async with cutoff:
+                async for business in service.stream_businesses(criteria):
+                    found.put_nowait(business)
+        except TimeoutError:
+            if not cutoff.expired():
+                raise
+            deadline.partial = True
+        finally:
+            found.put_nowait(finished)
+
+    task = asyncio.create_task(pump())
+    try:
+        while (item := await found.get()) is not finished:
+            yield item
+        # Re-raise whatever stopped the search
+        await task
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def search_within_budget(
+    service: IBusinessSearchService, criteria: SearchCriteria
+) -> tuple[list[Business], bool]:
+    """Run a search under criteria.time_budget_s; returns the businesses and whether they are partial."""
+    if not criteria.time_budget_s:
+        return await service.search_businesses(criteria), False
+
+    with deadline_scope(criteria.time_budget_s) as deadline:
+        businesses = [business async for business in stream_within_budget(service, criteria)]
+        return businesses, deadline.partial
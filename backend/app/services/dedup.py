@@ -0,0 +1,438 @@
+"""
+Normalization and fuzzy deduplication of scraped businesses.
+Following Single Responsibility Principle - only decides which businesses are the same one.
+
+The same business turns up in overlapping searches, in both the Maps and
+web results, and with its phone and address written differently. Each
+business is reduced once to keys: its phone in E.164 form, a canonical
+address and a canonical name. It is compared only with businesses that
+share a blocking key (the phone, the house number plus the start of the
+name, or the whole name), never with the entire list. Matches are joined
+with union-find, so if A matches B and B matches C, all three end up in
+one group even when A and C do not match directly.
+"""
+from functools import lru_cache
+from prometheus_client import Counter
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Union
+import os
+import re
+import unicodedata
+from app.models import SearchCriteria, Business
+from app.services.interfaces import IBusinessSearchService
+from app.services.playwright_scraper import clean_phone
+
+
+DEDUP_RESULTS = os.getenv("DEDUP_RESULTS", "on") == "on"
+# Region assumed for phone numbers written without a country code
+DEDUP_DEFAULT_REGION = os.getenv("DEDUP_DEFAULT_REGION", "US")
+# Trigram similarity of canonical names needed to match, and when the phones are equal
+DEDUP_NAME_THRESHOLD = float(os.getenv("DEDUP_NAME_THRESHOLD", "0.7"))
+DEDUP_PHONE_NAME_THRESHOLD = float(os.getenv("DEDUP_PHONE_NAME_THRESHOLD", "0.4"))
+# Blocks this large (a chain's name, a mall's phone) stop taking new members
+DEDUP_MAX_BLOCK = int(os.getenv("DEDUP_MAX_BLOCK", "64"))
+
+DUPLICATES_DROPPED = Counter(
+    "search_duplicates_dropped_total",
+    "Businesses dropped from search results as duplicates of an earlier one"
+)
+
+# Calling code and trunk prefix per region, for numbers without a country code
+_REGIONS = {
+    "US": ("1", ""), "CA": ("1", ""),
+    "GB": ("44", "0"), "IE": ("353", "0"), "AU": ("61", "0"), "NZ": ("64", "0"), "ZA": ("27", "0"),
+    "IN": ("91", "0"), "JP": ("81", "0"), "BR": ("55", "0"),
+    "DE": ("49", "0"), "FR": ("33", "0"), "NL": ("31", "0"), "BE": ("32", "0"), "CH": ("41", "0"),
+    "AT": ("43", "0"), "SE": ("46", "0"),
+    # Italy keeps its leading 0 after the country code; these have no trunk prefix
+    "IT": ("39", ""), "ES": ("34", ""), "PT": ("351", ""), "MX": ("52", ""),
+}
+_PHONE_EXTENSION = re.compile(r'\s*(?:ext\.?|extension|x|#)\s*\d{1,6}\s*$', re.IGNORECASE)
+_NON_DIGITS = re.compile(r'\D')
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+_ADDRESS_ABBREVIATIONS = {
+    "street": "st", "str": "st", "avenue": "ave", "av": "ave", "road": "rd", "boulevard": "blvd",
+    "drive": "dr", "lane": "ln", "court": "ct", "place": "pl", "square": "sq", "terrace": "ter",
+    "highway": "hwy", "parkway": "pkwy", "crescent": "cres", "circle": "cir", "trail": "trl",
+    "suite": "unit", "ste": "unit", "apt": "unit", "apartment": "unit", "floor": "fl",
+    "north": "n", "south": "s", "east": "e", "west": "w",
+    "northeast": "ne", "northwest": "nw", "southeast": "se", "southwest": "sw",
+    "saint": "st", "mount": "mt", "fort": "ft",
+}
+_COUNTRY_SUFFIXES = (
+    ("united", "states"), ("united", "states", "of", "america"), ("usa",), ("us",),
+    ("canada",), ("united", "kingdom"), ("uk",),
+)
+_NAME_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "ltd", "limited", "co", "corp", "corporation", "company",
+    "plc", "gmbh", "pty", "sa", "srl",
+}
+
+
+def _fold(text: str) -> str:
+    """Casefolded ASCII-ish text: accents dropped, so 'Café' and 'Cafe' agree."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def normalize_phone(phone: Optional[str], region: str = DEDUP_DEFAULT_REGION) -> Optional[str]:
+    """
+    A phone number in E.164 form (+14165550123), or None if it does not
+    look like a complete number. Numbers without a country code are read
+    as numbers of `region`; extensions are dropped.
+    """
+    if not phone:
+        return None
+    text = _PHONE_EXTENSION.sub('', phone.strip())
+    digits = _NON_DIGITS.sub('', text)
+    code, trunk = _REGIONS.get(region.upper(), _REGIONS["US"])
+    if text.startswith('+'):
+        number = digits
+    elif digits.startswith('00'):
+        number = digits[2:]
+    elif code == "1" and digits.startswith('011'):
+        number = digits[3:]
+    elif code == "1":
+        if len(digits) == 11 and digits[0] == '1':
+            digits = digits[1:]
+        if len(digits) != 10:
+            return None
+        number = code + digits
+    else:
+        if trunk and digits.startswith(trunk):
+            digits = digits[len(trunk):]
+        number = code + digits
+    # E.164 allows at most 15 digits; fewer than 8 is not a full number anywhere
+    return f"+{number}" if 8 <= len(number) <= 15 else None
+
+
+def format_phone(e164: str) -> str:
+    """Display form: (XXX) XXX-XXXX within North America, E.164 elsewhere."""
+    if e164.startswith("+1") and len(e164) == 12:
+        return clean_phone(e164[2:])
+    return e164
+
+
+def canonical_address(address: Optional[str]) -> str:
+    """Address as lowercase tokens with street types, units and directions abbreviated, no country."""
+    if not address:
+        return ''
+    text = _fold(address).replace('#', ' unit ')
+    tokens = []
+    for token in _NON_ALNUM.sub(' ', text).split():
+        token = _ADDRESS_ABBREVIATIONS.get(token, token)
+        # "Suite #5" is one unit, not two
+        if not (token == "unit" and tokens and tokens[-1] == "unit"):
+            tokens.append(token)
+    for suffix in _COUNTRY_SUFFIXES:
+        if len(tokens) > len(suffix) and tuple(tokens[-len(suffix):]) == suffix:
+            tokens = tokens[:-len(suffix)]
+            break
+    return ' '.join(tokens)
+
+
+def canonical_name(name: Optional[str]) -> str:
+    """Name as lowercase tokens, without apostrophes, a leading 'the' or legal suffixes."""
+    if not name:
+        return ''
+    text = _fold(name).replace('&', ' and ').replace("'", '').replace('’', '')
+    tokens = _NON_ALNUM.sub(' ', text).split()
+    while len(tokens) > 1 and tokens[-1] in _NAME_SUFFIXES:
+        tokens.pop()
+    if len(tokens) > 1 and tokens[0] == "the":
+        tokens = tokens[1:]
+    return ' '.join(tokens)
+
+
+@lru_cache(maxsize=65536)
+def _trigrams(text: str) -> frozenset:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the canonical names' character trigrams."""
+    if a == b:
+        return 1.0
+    grams_a, grams_b = _trigrams(a), _trigrams(b)
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+def _house_number(address: str) -> Optional[str]:
+    """First number of a canonical address that is not a unit number."""
+    tokens = iter(address.split())
+    for token in tokens:
+        if token == "unit":
+            next(tokens, None)
+        elif token[0].isdigit():
+            return token
+    return None
+
+
+def _addresses_compatible(a: str, b: str) -> bool:
+    """Whether two canonical addresses can be the same place: one missing, or the shorter mostly within the longer."""
+    if not a or not b or a == b:
+        return True
+    if _house_number(a) != _house_number(b):
+        return False
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    return len(tokens_a & tokens_b) / min(len(tokens_a), len(tokens_b)) >= 0.8
+
+
+_NO_MATCH, _WEAK, _STRONG = 0, 1, 2
+
+
+class DedupIndex:
+    """
+    Incremental duplicate finder: add businesses one at a time and learn
+    which earlier business each one duplicates.
+
+    Only the keys are kept, not the businesses, so a corpus of hundreds of
+    thousands of rows fits in memory.
+    """
+
+    def __init__(
+        self,
+        region: str = DEDUP_DEFAULT_REGION,
+        name_threshold: float = DEDUP_NAME_THRESHOLD,
+        phone_name_threshold: float = DEDUP_PHONE_NAME_THRESHOLD,
+        max_block: int = DEDUP_MAX_BLOCK,
+    ):
+        self.region = region
+        self.name_threshold = name_threshold
+        self.phone_name_threshold = phone_name_threshold
+        self.max_block = max_block
+        self.comparisons = 0
+        self.full_blocks = 0
+        self._phones: List[Optional[str]] = []
+        self._names: List[str] = []
+        self._addresses: List[str] = []
+        self._parents: List[int] = []
+        # Per root: whether the group has a business with more than a name
+        self._anchored: List[bool] = []
+        # Most blocks hold one business; keep those as a bare index
+        self._blocks: Dict[str, Union[int, List[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def add(self, business: Business) -> int:
+        """
+        Index a business; returns the index of the first business it is a
+        duplicate of, or its own index if it is new.
+        """
+        return self.add_keys(
+            normalize_phone(business.phone, self.region),
+            canonical_name(business.name),
+            canonical_address(business.address)
+        )
+
+    def add_keys(self, phone: Optional[str], name: str, address: str) -> int:
+        """add() for keys that were already normalized, e.g. in bulk."""
+        index = len(self._parents)
+        self._phones.append(phone)
+        self._names.append(name)
+        self._addresses.append(address)
+        self._parents.append(index)
+
+        keys = self._block_keys(phone, name, address)
+        self._anchored.append(bool(phone or address))
+        weak_roots = set()
+        for candidate in self._candidates(keys):
+            root = self.find(candidate)
+            if root == self.find(index):
+                continue
+            match = self._match(candidate, index)
+            if match == _STRONG:
+                self._union(candidate, index)
+            elif match == _WEAK:
+                weak_roots.add(root)
+        # A name alone never bridges groups: a bare name joins the one group
+        # it can belong to, and a full business takes in bare names only
+        if weak_roots and self.find(index) == index:
+            if self._anchored[index]:
+                weak_roots = {root for root in weak_roots if not self._anchored[root]}
+            if len(weak_roots) == 1:
+                self._union(weak_roots.pop(), index)
+        for key in keys:
+            self._insert(key, index)
+        return self.find(index)
+
+    def find(self, index: int) -> int:
+        parents = self._parents
+        while parents[index] != index:
+            # Path halving keeps the trees flat
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    def _union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        # The first-seen business stays the root, so it represents its group
+        root, child = (root_a, root_b) if root_a < root_b else (root_b, root_a)
+        self._parents[child] = root
+        self._anchored[root] = self._anchored[root] or self._anchored[child]
+
+    def groups(self) -> List[List[int]]:
+        """Indexes of every group with more than one business, in order of first appearance."""
+        members: Dict[int, List[int]] = {}
+        for index in range(len(self._parents)):
+            members.setdefault(self.find(index), []).append(index)
+        return [group for _, group in sorted(members.items()) if len(group) > 1]
+
+    def _block_keys(self, phone: Optional[str], name: str, address: str) -> List[str]:
+        keys = []
+        if phone:
+            keys.append(f"p{phone}")
+        if name:
+            keys.append(f"n{name}")
+            number = _house_number(address)
+            if number:
+                keys.append(f"a{number}|{name[:4]}")
+                longest = max(name.split(), key=len)
+                if not name.startswith(longest):
+                    keys.append(f"a{number}|{longest[:4]}")
+        return keys
+
+    def _candidates(self, keys: List[str]) -> Iterable[int]:
+        seen = set()
+        for key in keys:
+            block = self._blocks.get(key)
+            if block is None:
+                continue
+            for candidate in (block,) if isinstance(block, int) else block:
+                if candidate not in seen:
+                    seen.add(candidate)
+                    yield candidate
+
+    def _insert(self, key: str, index: int):
+        block = self._blocks.get(key)
+        if block is None:
+            self._blocks[key] = index
+        elif isinstance(block, int):
+            self._blocks[key] = [block, index]
+        elif len(block) < self.max_block:
+            block.append(index)
+            if len(block) == self.max_block:
+                self.full_blocks += 1
+
+    def _match(self, a: int, b: int) -> int:
+        """
+        _STRONG if the phones agree or both addresses do, _WEAK if only the
+        names match because one of the two has nothing but a name, else
+        _NO_MATCH.
+        """
+        self.comparisons += 1
+        phone_a, phone_b = self._phones[a], self._phones[b]
+        if phone_a and phone_b and phone_a != phone_b:
+            return _NO_MATCH
+        address_a, address_b = self._addresses[a], self._addresses[b]
+        if not _addresses_compatible(address_a, address_b):
+            return _NO_MATCH
+        similarity = name_similarity(self._names[a], self._names[b])
+        if phone_a and phone_a == phone_b:
+            return _STRONG if similarity >= self.phone_name_threshold else _NO_MATCH
+        if similarity < self.name_threshold:
+            return _NO_MATCH
+        if address_a and address_b:
+            return _STRONG
+        if phone_a or address_a:
+            if phone_b or address_b:
+                # A phone on one side and an address on the other say nothing about each other
+                return _NO_MATCH
+        elif not (phone_b or address_b) and similarity < 1.0:
+            # Two bare names: only the same name
+            return _NO_MATCH
+        return _WEAK
+
+    def stats(self) -> dict:
+        return {
+            "businesses": len(self._parents),
+            "distinct_businesses": sum(1 for index, parent in enumerate(self._parents) if index == parent),
+            "blocks": len(self._blocks),
+            "full_blocks": self.full_blocks,
+            "comparisons": self.comparisons,
+        }
+
+
+def merge_businesses(group: List[Business]) -> Business:
+    """
+    One business from a group of duplicates: the first one's values, gaps
+    filled from the others. Rating and review count come from whichever
+    has the most reviews.
+    """
+    first = group[0]
+    if len(group) == 1:
+        return first
+    update = {}
+    for field in ("phone", "email", "address", "website"):
+        if not getattr(first, field):
+            value = next((getattr(b, field) for b in group if getattr(b, field)), None)
+            if value:
+                update[field] = value
+    reviewed = max(group, key=lambda b: b.reviews_count or 0)
+    if reviewed.reviews_count and reviewed is not first:
+        update["rating"] = reviewed.rating
+        update["reviews_count"] = reviewed.reviews_count
+    social_links: Dict[str, str] = {}
+    for business in reversed(group):
+        social_links.update(business.social_links or {})
+    if social_links and social_links != (first.social_links or {}):
+        update["social_links"] = social_links
+    return first.model_copy(update=update) if update else first
+
+
+def normalize_business(business: Business, region: str = DEDUP_DEFAULT_REGION) -> Business:
+    """The business with its phone in display form, if it could be normalized."""
+    e164 = normalize_phone(business.phone, region)
+    if e164 is None:
+        return business
+    phone = format_phone(e164)
+    return business if phone == business.phone else business.model_copy(update={"phone": phone})
+
+
+def dedupe_businesses(businesses: List[Business], region: str = DEDUP_DEFAULT_REGION, **options) -> List[Business]:
+    """
+    The businesses with duplicates merged into the first of each group,
+    in order of first appearance, phones normalized.
+    """
+    index = DedupIndex(region, **options)
+    # Keys are computed in one pass before any matching
+    keys = [
+        (normalize_phone(b.phone, region), canonical_name(b.name), canonical_address(b.address))
+        for b in businesses
+    ]
+    groups: Dict[int, List[Business]] = {}
+    for business, (phone, name, address) in zip(businesses, keys):
+        groups.setdefault(index.add_keys(phone, name, address), []).append(business)
+    # Later merges can move a group under an earlier root
+    merged: Dict[int, List[Business]] = {}
+    for root, group in groups.items():
+        merged.setdefault(index.find(root), []).extend(group)
+    return [normalize_business(merge_businesses(group), region) for _, group in sorted(merged.items())]
+
+
+class DeduplicatingSearchService(IBusinessSearchService):
+    """Decorates a search service to merge or drop duplicate businesses in its results."""
+
+    def __init__(self, inner: IBusinessSearchService, region: str = DEDUP_DEFAULT_REGION):
+        self.inner = inner
+        self.region = region
+
+    async def search_businesses(self, criteria: SearchCriteria) -> list[Business]:
+        businesses = await self.inner.search_businesses(criteria)
+        deduplicated = dedupe_businesses(businesses, self.region)
+        if len(deduplicated) < len(businesses):
+            DUPLICATES_DROPPED.inc(len(businesses) - len(deduplicated))
+        return deduplicated
+
+    async def stream_businesses(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        # Earlier businesses were already sent: later duplicates are dropped, not merged
+        index = DedupIndex(self.region)
+        async for business in self.inner.stream_businesses(criteria):
+            if index.add(business) != len(index) - 1:
+                DUPLICATES_DROPPED.inc()
+                continue
+            yield normalize_business(business, self.region)
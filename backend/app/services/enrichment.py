@@ -0,0 +1,471 @@
+"""
+Website enrichment of scraped businesses.
+Following Single Responsibility Principle - only fills in contact details from business websites.
+
+Maps and search results almost never carry an email address. The enricher
+fetches each business's website, and its contact page when the home page
+has no address, then pulls email addresses and social profile links out of
+the HTML. It runs after a search's results have been sent, so it never
+delays them.
+
+Fetches go through a pooled HTTP client of their own, separate from the
+scrapers' one, that only connects to public addresses, since the websites
+(and where they redirect) are not ours to trust. They run a few at a time
+per domain, honour robots.txt, and are each capped in size and time. Pages
+and robots.txt files are cached, so branches of a chain sharing one website
+fetch it once.
+"""
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from lxml import etree, html as lxml_html
+from prometheus_client import Counter
+from typing import AsyncIterator, Dict, NamedTuple, Optional
+from urllib.parse import urljoin, urlparse, unquote
+from urllib.robotparser import RobotFileParser
+import aiohttp
+import asyncio
+import ipaddress
+import logging
+import os
+import re
+import time
+from app.models import Business
+from app.services.http_client import HttpClient, is_public_address
+
+
+# Searches enrich their results unless SearchCriteria.enrich says otherwise
+ENRICH_WEBSITES = os.getenv("ENRICH_WEBSITES", "off") == "on"
+# Businesses enriched at once, and fetches in flight per website
+ENRICH_CONCURRENCY = int(os.getenv("ENRICH_CONCURRENCY", "8"))
+ENRICH_PER_DOMAIN = int(os.getenv("ENRICH_PER_DOMAIN", "2"))
+ENRICH_TIMEOUT_S = float(os.getenv("ENRICH_TIMEOUT_S", "8"))
+# Bytes read per page; the rest of a larger page is ignored
+ENRICH_MAX_BYTES = int(os.getenv("ENRICH_MAX_BYTES", str(512 * 1024)))
+ENRICH_CACHE_TTL_S = float(os.getenv("ENRICH_CACHE_TTL_S", "3600"))
+ENRICH_CACHE_SIZE = int(os.getenv("ENRICH_CACHE_SIZE", "2000"))
+# Also fetch the contact page when the home page has no email address
+ENRICH_CONTACT_PAGE = os.getenv("ENRICH_CONTACT_PAGE", "on") == "on"
+ENRICH_MAX_REDIRECTS = int(os.getenv("ENRICH_MAX_REDIRECTS", "5"))
+ENRICH_USER_AGENT = os.getenv(
+    "ENRICH_USER_AGENT", "Mozilla/5.0 (compatible; LidScoutBot/1.0; business contact lookup)"
+)
+
+ENRICH_FETCHES = Counter(
+    "enrichment_fetches_total",
+    "Website pages requested by the enricher",
+    ["outcome"]
+)
+
+# Bounded, and anchored at the start of the local part, so long runs of word
+# characters in a page cannot make the scan quadratic
+_EMAIL_PATTERN = re.compile(
+    r'(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]{1,64}@(?:[A-Za-z0-9-]{1,63}\.){1,8}[A-Za-z]{2,24}\b'
+)
+# Things shaped like emails that are not: retina images, placeholders, tracker DSNs
+_NOT_EMAIL_SUFFIX = re.compile(r'\.(png|jpe?g|gif|svg|webp|avif|css|js)$', re.IGNORECASE)
+_NOT_EMAIL_DOMAINS = {"example.com", "domain.com", "email.com", "yourdomain.com", "sentry.io", "wixpress.com"}
+_CONTACT_LINK_PATTERN = re.compile(r'contact|kontakt|contacto|contatti|impressum|get-in-touch', re.IGNORECASE)
+
+# Network name by host, for profile links
+_SOCIAL_HOSTS = {
+    "facebook.com": "facebook",
+    "instagram.com": "instagram",
+    "linkedin.com": "linkedin",
+    "twitter.com": "twitter",
+    "x.com": "twitter",
+    "youtube.com": "youtube",
+    "tiktok.com": "tiktok",
+}
+SOCIAL_NETWORKS = tuple(dict.fromkeys(_SOCIAL_HOSTS.values()))
+# Share buttons and tracking pixels rather than the business's own profile
+_SOCIAL_NOT_PROFILE = re.compile(r'^/(sharer|share|intent|dialog|tr|plugins|embed|watch)\b', re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+
+class RefusedUrlError(aiohttp.ClientError):
+    """Raised for a URL the enricher will not fetch: not http(s), or at a non-public address."""
+
+
+def is_public_url(url: str) -> bool:
+    """
+    Whether a URL is http(s) with a host that is not an internal IP address.
+    Hostnames are checked when they are resolved, by the HTTP client.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        return False
+    try:
+        ipaddress.ip_address(parsed.hostname)
+    except ValueError:
+        return True
+    return is_public_address(parsed.hostname)
+
+
+class _Page(NamedTuple):
+    url: str
+    html: str
+
+
+class Contacts(NamedTuple):
+    """What one page says about how to reach the business."""
+    emails: list[str]
+    social_links: Dict[str, str]
+    contact_url: Optional[str]
+
+
+def _site(url: str) -> str:
+    """Host without a leading www., which per-domain limits and email matching go by."""
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _same_site(host: str, site: str) -> bool:
+    return host == site or host.endswith('.' + site)
+
+
+def _clean_email(candidate: str) -> Optional[str]:
+    email = unquote(candidate).strip().strip('.').lower()
+    if not _EMAIL_PATTERN.fullmatch(email) or _NOT_EMAIL_SUFFIX.search(email):
+        return None
+    domain = email.rsplit('@', 1)[1]
+    if any(domain == blocked or domain.endswith('.' + blocked) for blocked in _NOT_EMAIL_DOMAINS):
+        return None
+    return email
+
+
+def _social_network(url: str) -> Optional[str]:
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    for suffix, network in _SOCIAL_HOSTS.items():
+        if host == suffix or host.endswith('.' + suffix):
+            if parsed.path.strip('/') and not _SOCIAL_NOT_PROFILE.match(parsed.path):
+                return network
+            return None
+    return None
+
+
+def extract_contacts(page_html: str, base_url: str) -> Contacts:
+    """Email addresses, social profiles and the contact page link found in a page."""
+    try:
+        root = lxml_html.document_fromstring(page_html)
+    except (ValueError, etree.ParserError):
+        return Contacts([], {}, None)
+
+    emails: list[str] = []
+    social_links: Dict[str, str] = {}
+    contact_url = None
+    site = _site(base_url)
+
+    def add_email(candidate: str):
+        email = _clean_email(candidate)
+        if email and email not in emails:
+            emails.append(email)
+
+    for link in root.iter('a'):
+        href = (link.get('href') or '').strip()
+        if href.lower().startswith('mailto:'):
+            add_email(href[7:].split('?')[0])
+            continue
+        url = urljoin(base_url, href)
+        if not url.startswith(('http://', 'https://')):
+            continue
+        network = _social_network(url)
+        if network:
+            social_links.setdefault(network, url.split('?')[0])
+        elif contact_url is None and _site(url) == site and (
+            _CONTACT_LINK_PATTERN.search(href) or _CONTACT_LINK_PATTERN.search(link.text_content() or '')
+        ):
+            contact_url = url.split('#')[0]
+
+    # Structured data often has the address even when the page text does not
+    for script in root.xpath('//script[@type="application/ld+json"]'):
+        for candidate in _EMAIL_PATTERN.findall(script.text or ''):
+            add_email(candidate)
+    for element in root.xpath('//script|//style|//noscript'):
+        element.drop_tree()
+    for candidate in _EMAIL_PATTERN.findall(root.text_content()):
+        add_email(candidate)
+
+    # An address on the business's own domain is the one to show
+    emails.sort(key=lambda email: not _same_site(email.rsplit('@', 1)[1], site))
+    return Contacts(emails, social_links, contact_url)
+
+
+class _TtlCache:
+    """Small LRU cache whose entries expire after a fixed time."""
+
+    def __init__(self, ttl_s: float, max_entries: int):
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: str):
+        """(True, value) on a fresh hit, else (False, None)."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_s:
+            self._entries.pop(key, None)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    def put(self, key: str, value):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class WebsiteEnricher:
+    """Looks up email addresses and social links on business websites."""
+
+    def __init__(
+        self,
+        http_client: HttpClient,
+        concurrency: int = ENRICH_CONCURRENCY,
+        per_domain: int = ENRICH_PER_DOMAIN,
+        timeout_s: float = ENRICH_TIMEOUT_S,
+        max_bytes: int = ENRICH_MAX_BYTES,
+        cache_ttl_s: float = ENRICH_CACHE_TTL_S,
+        cache_size: int = ENRICH_CACHE_SIZE,
+        contact_page: bool = ENRICH_CONTACT_PAGE,
+        user_agent: str = ENRICH_USER_AGENT,
+    ):
+        self.http_client = http_client
+        self.per_domain = per_domain
+        self.timeout_s = timeout_s
+        self.max_bytes = max_bytes
+        self.contact_page = contact_page
+        self.user_agent = user_agent
+        self._slots = asyncio.Semaphore(concurrency)
+        self._domain_slots: Dict[str, asyncio.Semaphore] = {}
+        self._pages = _TtlCache(cache_ttl_s, cache_size)
+        self._robots = _TtlCache(cache_ttl_s, cache_size)
+        # Fetches in flight by URL, so simultaneous lookups of one site share them
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.enriched = 0
+        self.emails_found = 0
+
+    async def enrich(self, business: Business) -> Business:
+        """
+        The business with email and social_links filled in from its website.
+        An email it already has is kept. Never raises; a site that cannot be
+        read leaves the business as it was.
+        """
+        if not business.website or not is_public_url(business.website):
+            return business
+        async with self._slots:
+            try:
+                contacts = await self._lookup(business.website)
+            except Exception as e:
+                logger.warning(
+                    "Website enrichment failed",
+                    extra={"fields": {"website": business.website, "error": str(e)}}
+                )
+                return business
+
+        self.enriched += 1
+        if not contacts.emails and not contacts.social_links:
+            return business
+        if contacts.emails:
+            self.emails_found += 1
+        return business.model_copy(update={
+            "email": business.email or (contacts.emails[0] if contacts.emails else None),
+            "social_links": {**contacts.social_links, **(business.social_links or {})} or None,
+        })
+
+    async def enrich_all(self, businesses: list[Business]) -> AsyncIterator[tuple[int, Business]]:
+        """Enrich a list of businesses, yielding (index, business) for each one that gained contact details."""
+        batch = EnrichmentBatch(self)
+        try:
+            for index, business in enumerate(businesses):
+                batch.add(index, business)
+            async for item in batch.results():
+                yield item
+        finally:
+            await batch.aclose()
+
+    async def _lookup(self, website: str) -> Contacts:
+        home = await self._fetch(website)
+        if home is None:
+            return Contacts([], {}, None)
+        contacts = await asyncio.to_thread(extract_contacts, home.html, home.url)
+        if contacts.emails or not self.contact_page or not contacts.contact_url:
+            return contacts
+
+        page = await self._fetch(contacts.contact_url)
+        if page is None:
+            return contacts
+        more = await asyncio.to_thread(extract_contacts, page.html, page.url)
+        return Contacts(more.emails, {**more.social_links, **contacts.social_links}, contacts.contact_url)
+
+    def _shared(self, pending: Dict[str, asyncio.Task], key: str, load) -> asyncio.Future:
+        """One `load()` per key at a time; everyone asking meanwhile awaits the same task."""
+        task = pending.get(key)
+        if task is None:
+            task = asyncio.create_task(load())
+            pending[key] = task
+            task.add_done_callback(lambda _: pending.pop(key, None))
+        # One caller going away does not cancel the fetch for the others
+        return asyncio.shield(task)
+
+    async def _fetch(self, url: str) -> Optional[_Page]:
+        """A page's HTML, from the cache or the site; None if it cannot or may not be read."""
+        hit, page = self._pages.get(url)
+        if hit:
+            ENRICH_FETCHES.labels("cached").inc()
+            return page
+        return await self._shared(self._pending, url, lambda: self._load(url))
+
+    async def _load(self, url: str) -> Optional[_Page]:
+        page = None
+        if await self._allowed(url):
+            page = await self._get(url)
+        else:
+            ENRICH_FETCHES.labels("disallowed").inc()
+        # Failures are cached too, so a dead site is not retried for every branch
+        self._pages.put(url, page)
+        return page
+
+    async def _allowed(self, url: str) -> bool:
+        """Whether robots.txt lets us fetch the URL; a missing robots.txt allows everything."""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        hit, robots = self._robots.get(origin)
+        if not hit:
+            robots = await self._shared(self._pending, origin + "/robots.txt", lambda: self._load_robots(origin))
+        return robots.can_fetch(self.user_agent, url)
+
+    async def _load_robots(self, origin: str) -> RobotFileParser:
+        robots = RobotFileParser()
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.timeout_s)
+            async with self._domain_slot(origin):
+                async with self._open(origin + "/robots.txt", {"User-Agent": self.user_agent}, timeout) as response:
+                    if response.status in (401, 403):
+                        robots.disallow_all = True
+                    elif response.status == 200:
+                        body = await response.content.read(self.max_bytes)
+                        robots.parse(body.decode('utf-8', errors='replace').splitlines())
+                    else:
+                        robots.allow_all = True
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            robots.allow_all = True
+        self._robots.put(origin, robots)
+        return robots
+
+    def _domain_slot(self, url: str) -> asyncio.Semaphore:
+        site = _site(url)
+        if site not in self._domain_slots:
+            self._domain_slots[site] = asyncio.Semaphore(self.per_domain)
+        return self._domain_slots[site]
+
+    async def _get(self, url: str) -> Optional[_Page]:
+        timeout = aiohttp.ClientTimeout(total=self.timeout_s)
+        try:
+            async with self._domain_slot(url):
+                async with self._open(
+                    url, {"User-Agent": self.user_agent, "Accept": "text/html"}, timeout
+                ) as response:
+                    content_type = response.headers.get("Content-Type", "")
+                    if response.status != 200 or (content_type and "html" not in content_type):
+                        ENRICH_FETCHES.labels("skipped").inc()
+                        return None
+                    # Stop reading at the cap; what is past it on a page that large is
+                    # rarely contact details
+                    body = bytearray()
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        body += chunk
+                        if len(body) >= self.max_bytes:
+                            ENRICH_FETCHES.labels("truncated").inc()
+                            break
+                    ENRICH_FETCHES.labels("fetched").inc()
+                    return _Page(str(response.url), bytes(body[:self.max_bytes]).decode(
+                        response.charset or 'utf-8', errors='replace'
+                    ))
+        except RefusedUrlError:
+            ENRICH_FETCHES.labels("refused").inc()
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError, LookupError, ValueError):
+            ENRICH_FETCHES.labels("failed").inc()
+            return None
+
+    @asynccontextmanager
+    async def _open(self, url: str, headers: dict, timeout: aiohttp.ClientTimeout) -> AsyncIterator[aiohttp.ClientResponse]:
+        """GET a URL, following redirects only to URLs that pass the same check."""
+        for _ in range(ENRICH_MAX_REDIRECTS + 1):
+            if not is_public_url(url):
+                raise RefusedUrlError(f"Refusing to fetch {url}")
+            async with self.http_client.session.get(
+                url, headers=headers, timeout=timeout, allow_redirects=False
+            ) as response:
+                location = response.headers.get("Location")
+                if response.status not in (301, 302, 303, 307, 308) or not location:
+                    yield response
+                    return
+                url = urljoin(str(response.url), location)
+        raise RefusedUrlError(f"More than {ENRICH_MAX_REDIRECTS} redirects")
+
+    def stats(self) -> dict:
+        return {
+            "enriched": self.enriched,
+            "emails_found": self.emails_found,
+            "cached_pages": len(self._pages),
+            "cached_robots": len(self._robots),
+            "in_flight": len(self._pending),
+        }
+
+
+class EnrichmentBatch:
+    """
+    Businesses being enriched in the background, collected in completion order.
+
+    Businesses can be added while a search is still streaming, but they are
+    only queued: no website is fetched until results() is read, once the
+    search has been answered, so enrichment stays off the scrape's critical
+    path.
+    """
+
+    def __init__(self, enricher: WebsiteEnricher):
+        self.enricher = enricher
+        self._queued: list[tuple[int, Business]] = []
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._originals: Dict[int, Business] = {}
+        self._finished: asyncio.Queue = asyncio.Queue()
+
+    def add(self, index: int, business: Business):
+        if not business.website:
+            return
+        self._queued.append((index, business))
+        self._originals[index] = business
+
+    def __len__(self) -> int:
+        return len(self._originals)
+
+    def _start(self):
+        for index, business in self._queued:
+            task = asyncio.create_task(self.enricher.enrich(business))
+            task.add_done_callback(lambda done, index=index: self._finished.put_nowait((index, done)))
+            self._tasks[index] = task
+        self._queued.clear()
+
+    async def results(self) -> AsyncIterator[tuple[int, Business]]:
+        """Start fetching, then yield (index, enriched business) for every business that gained contact details."""
+        self._start()
+        for _ in range(len(self._tasks)):
+            index, task = await self._finished.get()
+            if task.cancelled():
+                continue
+            business = task.result()
+            if business is not self._originals[index]:
+                yield index, business
+
+    async def aclose(self):
+        """Stop whatever is still running, e.g. when the client went away."""
+        self._queued.clear()
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
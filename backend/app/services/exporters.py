@@ -0,0 +1,309 @@
+"""
+Streaming export of businesses as CSV, XLSX or Parquet.
+Following Single Responsibility Principle - only encodes rows into export files.
+Following Open/Closed Principle - new formats are RowWriter subclasses registered by name.
+
+Rows arrive in batches and each batch is encoded and handed on straight
+away, so memory depends on the batch size, not on the size of the export.
+XLSX is written as a zip in streaming mode (sizes go in data descriptors
+after each entry), so no spreadsheet library is needed. Parquet needs
+pyarrow, which is optional. It buffers one row group at a time.
+"""
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, Optional, Type
+from xml.sax.saxutils import escape
+import asyncio
+import csv
+import io
+import os
+import re
+import zipfile
+import zlib
+from app.models import Business, SearchCriteria
+from app.services.enrichment import SOCIAL_NETWORKS
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+# Rows read and encoded per step
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "1000"))
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+PARQUET_ROW_GROUP_ROWS = int(os.getenv("PARQUET_ROW_GROUP_ROWS", "10000"))
+
+EXPORT_COLUMNS = (
+    "industry", "location",
+    "name", "phone", "email", "address", "website", "rating", "reviews_count",
+    *SOCIAL_NETWORKS,
+)
+_FLOAT_COLUMNS = {"rating"}
+_INT_COLUMNS = {"reviews_count"}
+
+# Characters XML 1.0 does not allow, which scraped text occasionally contains
+_XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+class ExportUnavailableError(Exception):
+    """Raised when an export format's optional dependency is not installed."""
+
+
+def business_row(business: Business, criteria: Optional[SearchCriteria] = None) -> list:
+    """One export row, in EXPORT_COLUMNS order."""
+    social_links = business.social_links or {}
+    return [
+        criteria.industry if criteria else None,
+        criteria.location if criteria else None,
+        business.name, business.phone, business.email, business.address, business.website,
+        business.rating, business.reviews_count,
+        *(social_links.get(network) for network in SOCIAL_NETWORKS),
+    ]
+
+
+class _ChunkSink:
+    """Write-only file that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class RowWriter(ABC):
+    """Encodes batches of rows, returning the bytes ready to send after each call."""
+
+    media_type: str
+    extension: str
+    # Whether gzip content encoding is worth it; zip and Parquet are compressed already
+    compressible: bool = False
+
+    def __init__(self, columns: tuple = EXPORT_COLUMNS):
+        self.columns = columns
+
+    @abstractmethod
+    def write_rows(self, rows: list[list]) -> bytes:
+        """Encode rows; returns the bytes produced so far."""
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        """Finish the file; returns its remaining bytes."""
+
+
+class CsvRowWriter(RowWriter):
+    media_type = "text/csv"
+    extension = "csv"
+    compressible = True
+
+    def __init__(self, columns: tuple = EXPORT_COLUMNS):
+        super().__init__(columns)
+        self._text = io.StringIO(newline="")
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(columns)
+
+    def _drain(self) -> bytes:
+        data = self._text.getvalue().encode("utf-8")
+        self._text.seek(0)
+        self._text.truncate()
+        return data
+
+    def write_rows(self, rows: list[list]) -> bytes:
+        self._writer.writerows(rows)
+        return self._drain()
+
+    def finish(self) -> bytes:
+        return self._drain()
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml"'
+    ' ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml"'
+    ' ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml"'
+    ' Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    ' xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Businesses" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml"'
+    ' Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '</Relationships>'
+)
+
+
+class XlsxRowWriter(RowWriter):
+    """Minimal single-sheet workbook with inline strings, streamed into a zip."""
+
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+
+    def __init__(self, columns: tuple = EXPORT_COLUMNS):
+        super().__init__(columns)
+        self.sink = _ChunkSink()
+        # The sink cannot seek, so zipfile writes each entry's sizes after its data
+        self._zip = zipfile.ZipFile(self.sink, "w", compression=zipfile.ZIP_DEFLATED)
+        for name, content in (
+            ("[Content_Types].xml", _XLSX_CONTENT_TYPES),
+            ("_rels/.rels", _XLSX_ROOT_RELS),
+            ("xl/workbook.xml", _XLSX_WORKBOOK),
+            ("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS),
+        ):
+            self._zip.writestr(name, content)
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        self._sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        )
+        self._sheet.write(self._row_xml(list(columns)))
+
+    @staticmethod
+    def _cell_xml(value) -> str:
+        if value is None:
+            return '<c/>'
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return f'<c><v>{value}</v></c>'
+        text = escape(_XML_ILLEGAL.sub('', str(value)))
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+    def _row_xml(self, row: list) -> bytes:
+        return ('<row>' + ''.join(self._cell_xml(value) for value in row) + '</row>').encode("utf-8")
+
+    def write_rows(self, rows: list[list]) -> bytes:
+        self._sheet.write(b''.join(self._row_xml(row) for row in rows))
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self._sheet.write(b'</sheetData></worksheet>')
+        self._sheet.close()
+        self._zip.close()
+        return self.sink.drain()
+
+
+class ParquetRowWriter(RowWriter):
+    """Columnar file written one row group at a time."""
+
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(self, columns: tuple = EXPORT_COLUMNS, row_group_rows: int = PARQUET_ROW_GROUP_ROWS):
+        if pyarrow is None:
+            raise ExportUnavailableError("Parquet export requires pyarrow to be installed")
+        super().__init__(columns)
+        self.sink = _ChunkSink()
+        self.row_group_rows = row_group_rows
+        self.schema = pyarrow.schema([
+            (column, pyarrow.float64() if column in _FLOAT_COLUMNS
+             else pyarrow.int64() if column in _INT_COLUMNS else pyarrow.string())
+            for column in columns
+        ])
+        self._writer = pyarrow.parquet.ParquetWriter(self.sink, self.schema, compression="snappy")
+        self._pending: list[list] = []
+
+    def _flush_group(self):
+        if not self._pending:
+            return
+        columns = list(zip(*self._pending))
+        self._writer.write_batch(pyarrow.record_batch(
+            [pyarrow.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema
+        ))
+        self._pending = []
+
+    def write_rows(self, rows: list[list]) -> bytes:
+        self._pending.extend(rows)
+        if len(self._pending) >= self.row_group_rows:
+            self._flush_group()
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self._flush_group()
+        self._writer.close()
+        return self.sink.drain()
+
+
+ROW_WRITERS: Dict[str, Type[RowWriter]] = {
+    "csv": CsvRowWriter,
+    "xlsx": XlsxRowWriter,
+    "parquet": ParquetRowWriter,
+}
+
+
+def get_row_writer(export_format: str) -> RowWriter:
+    """A fresh writer for the format; raises ExportUnavailableError if it cannot be written here."""
+    return ROW_WRITERS[export_format]()
+
+
+async def encode_rows(writer: RowWriter, batches: AsyncIterator[list[list]]) -> AsyncIterator[bytes]:
+    """The export file, chunk by chunk, as the row batches come in."""
+    async for rows in batches:
+        if not rows:
+            continue
+        # Encoding is CPU-bound; keep it off the event loop
+        chunk = await asyncio.to_thread(writer.write_rows, rows)
+        if chunk:
+            yield chunk
+    yield await asyncio.to_thread(writer.finish)
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip (and does not give it q=0)."""
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding.strip().lower() in ('gzip', '*'):
+            quality = params.strip()
+            if not quality.startswith('q='):
+                return True
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = EXPORT_GZIP_LEVEL) -> AsyncIterator[bytes]:
+    """Gzip a byte stream chunk by chunk, so nothing is buffered beyond the compressor's window."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -2,17 +2,262 @@
 Service factory for dependency injection.
 Following Dependency Inversion Principle.
 """
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+import os
 from app.services.interfaces import IBusinessSearchService
-from app.services.playwright_scraper import PlaywrightScraperService
+from app.services.browser_pool import BrowserPool
+from app.services.response_cache import ResponseCache, RESPONSE_CACHE_MODE
+from app.services.playwright_scraper import (
+    PlaywrightScraperService, GOOGLE_BASE_URL, NO_RESULTS_NAME, no_results_business
+)
+from app.services.google_scraper import GoogleScraperService
+from app.services.http_client import HttpClient
+from app.services.search_cache import (
+    SearchCache, CachedSearchService, InMemorySearchCacheBackend, SqliteSearchCacheBackend
+)
+from app.services.single_flight import SingleFlight, CoalescingSearchService
+from app.services.job_queue import SearchJobQueue
+from app.services.search_workers import SearchWorkerPool, ProcessSearchService, SEARCH_WORKER_PROCESSES
+from app.services.business_store import BusinessStore, StoreBackedSearchService
+from app.services.rate_limiter import HostRateLimiter, RateLimitedSearchService
+from app.services.batch_search import BatchSearchRunner
+from app.services.strategy_runner import HedgedStrategyRunner, HEDGE_MODE
+from app.services.enrichment import WebsiteEnricher
+from app.services.result_sets import ResultSetStore
+from app.services.dedup import DeduplicatingSearchService, DEDUP_RESULTS
 
 
 class ServiceFactory:
     """Factory for creating service instances."""
     
-    @staticmethod
-    def get_search_service() -> IBusinessSearchService:
+    _browser_pool: Optional[BrowserPool] = None
+    _response_cache: Optional[ResponseCache] = None
+    _search_cache: Optional[SearchCache] = None
+    _single_flight: Optional[SingleFlight] = None
+    _job_queue: Optional[SearchJobQueue] = None
+    _http_client: Optional[HttpClient] = None
+    _public_http_client: Optional[HttpClient] = None
+    _search_workers: Optional[SearchWorkerPool] = None
+    _business_store: Optional[BusinessStore] = None
+    _rate_limiter: Optional[HostRateLimiter] = None
+    _batch_runner: Optional[BatchSearchRunner] = None
+    _strategy_builders: Dict[str, Callable[[], IBusinessSearchService]] = {}
+    _strategy_runner: Optional[HedgedStrategyRunner] = None
+    _enricher: Optional[WebsiteEnricher] = None
+    _result_sets: Optional[ResultSetStore] = None
+    
+    @classmethod
+    def get_browser_pool(cls) -> BrowserPool:
+        """Get the shared browser pool (started in the app lifespan)."""
+        if cls._browser_pool is None:
+            cls._browser_pool = BrowserPool(response_cache=cls.get_response_cache())
+        return cls._browser_pool
+    
+    @classmethod
+    def get_response_cache(cls) -> Optional[ResponseCache]:
+        """
+        Get the disk response cache under the browser contexts.
+        None unless RESPONSE_CACHE_MODE is "cache", "record" or "replay".
+        """
+        if RESPONSE_CACHE_MODE == "off":
+            return None
+        if cls._response_cache is None:
+            cls._response_cache = ResponseCache()
+        return cls._response_cache
+    
+    @classmethod
+    def get_http_client(cls) -> HttpClient:
+        """Get the shared pooled HTTP client (closed in the app lifespan)."""
+        if cls._http_client is None:
+            cls._http_client = HttpClient()
+        return cls._http_client
+    
+    @classmethod
+    def get_public_http_client(cls) -> HttpClient:
+        """
+        Get the HTTP client for URLs supplied from outside, such as business
+        websites; it only connects to public addresses (closed in the app lifespan).
+        """
+        if cls._public_http_client is None:
+            cls._public_http_client = HttpClient(public_only=True)
+        return cls._public_http_client
+    
+    @classmethod
+    def get_search_cache(cls) -> SearchCache:
+        """
+        Get the shared search result cache.
+        SEARCH_CACHE_BACKEND=sqlite keeps it on disk at SEARCH_CACHE_PATH.
+        """
+        if cls._search_cache is None:
+            if os.getenv("SEARCH_CACHE_BACKEND", "memory") == "sqlite":
+                backend = SqliteSearchCacheBackend(os.getenv("SEARCH_CACHE_PATH", "search_cache.sqlite3"))
+            else:
+                backend = InMemorySearchCacheBackend()
+            cls._search_cache = SearchCache(backend)
+        return cls._search_cache
+    
+    @classmethod
+    def get_single_flight(cls) -> SingleFlight:
+        """Get the shared registry of in-flight searches."""
+        if cls._single_flight is None:
+            cls._single_flight = SingleFlight()
+        return cls._single_flight
+    
+    @classmethod
+    def get_search_workers(cls) -> Optional[SearchWorkerPool]:
+        """
+        Get the shared worker process pool (started in the app lifespan).
+        None unless SEARCH_WORKER_PROCESSES > 0, in which case searches run
+        in worker processes instead of this one.
+        """
+        if SEARCH_WORKER_PROCESSES <= 0:
+            return None
+        if cls._search_workers is None:
+            cls._search_workers = SearchWorkerPool(SEARCH_WORKER_PROCESSES)
+        return cls._search_workers
+    
+    @classmethod
+    def get_business_store(cls) -> Optional[BusinessStore]:
+        """
+        Get the persistent business store at BUSINESS_STORE_PATH.
+        BUSINESS_STORE=off disables it.
+        """
+        if os.getenv("BUSINESS_STORE", "sqlite") == "off":
+            return None
+        if cls._business_store is None:
+            cls._business_store = BusinessStore()
+        return cls._business_store
+    
+    @classmethod
+    def get_rate_limiter(cls) -> HostRateLimiter:
+        """Get the shared per-host rate limiter every scrape goes through."""
+        if cls._rate_limiter is None:
+            cls._rate_limiter = HostRateLimiter()
+        return cls._rate_limiter
+    
+    @classmethod
+    def _playwright_scraper(cls, strategy: str = "auto") -> PlaywrightScraperService:
+        store = cls.get_business_store()
+        return PlaywrightScraperService(
+            browser_pool=cls.get_browser_pool(),
+            listing_resolver=store.resolve_listing if store else None,
+            strategy=strategy
+        )
+    
+    @classmethod
+    def register_strategy(cls, name: str, builder: Callable[[], IBusinessSearchService]):
+        """
+        Make a search strategy available to the hedged runner by name.
+        Built in: "maps" and "web" (Playwright) and "http" (Google search over HTTP).
+        """
+        cls._strategy_builders[name] = builder
+        cls._strategy_runner = None
+    
+    @classmethod
+    def get_strategy(cls, name: str) -> IBusinessSearchService:
+        """Build a registered search strategy."""
+        builders = {
+            "maps": lambda: cls._playwright_scraper("maps"),
+            "web": lambda: cls._playwright_scraper("web"),
+            "http": lambda: GoogleScraperService(http_client=cls.get_http_client()),
+            **cls._strategy_builders,
+        }
+        if name not in builders:
+            raise ValueError(f"Unknown search strategy: {name}")
+        return builders[name]()
+    
+    @classmethod
+    def get_strategy_runner(cls) -> HedgedStrategyRunner:
+        """
+        Get the shared hedged runner over SEARCH_STRATEGIES (in order of
+        preference); shared so its success rates accumulate.
+        """
+        if cls._strategy_runner is None:
+            names = [name.strip() for name in os.getenv("SEARCH_STRATEGIES", "maps,web").split(",") if name.strip()]
+            cls._strategy_runner = HedgedStrategyRunner(
+                [(name, cls.get_strategy(name)) for name in names],
+                no_results=no_results_business
+            )
+        return cls._strategy_runner
+    
+    @classmethod
+    def uses_browser(cls) -> bool:
+        """Whether local searches need the browser pool running."""
+        return os.getenv("SEARCH_BACKEND", "playwright") != "http"
+    
+    @classmethod
+    def get_local_scraper(cls) -> IBusinessSearchService:
+        """
+        Get the scraper that runs in this process.
+        SEARCH_BACKEND=http selects the browser-free Google search scraper;
+        HEDGE_MODE=off keeps Maps with a sequential web fallback in one
+        browser context instead of the hedged strategy runner.
+        """
+        if not cls.uses_browser():
+            return GoogleScraperService(http_client=cls.get_http_client())
+        if HEDGE_MODE == "off":
+            return cls._playwright_scraper()
+        return cls.get_strategy_runner()
+    
+    @classmethod
+    def get_search_service(cls) -> IBusinessSearchService:
         """
         Get the business search service implementation.
         Can easily swap implementations here without changing dependent code.
         """
-        return PlaywrightScraperService()
\ No newline at end of file
+        workers = cls.get_search_workers()
+        scraper = ProcessSearchService(workers) if workers else cls.get_local_scraper()
+        if DEDUP_RESULTS:
+            scraper = DeduplicatingSearchService(scraper)
+        # Only real scrapes take a token: cache, single-flight and store hits do not
+        scraper = RateLimitedSearchService(
+            scraper, cls.get_rate_limiter(), urlparse(GOOGLE_BASE_URL).netloc, NO_RESULTS_NAME
+        )
+        store = cls.get_business_store()
+        if store:
+            scraper = StoreBackedSearchService(scraper, store)
+        coalesced = CoalescingSearchService(scraper, cls.get_single_flight())
+        return CachedSearchService(coalesced, cls.get_search_cache())
+    
+    @classmethod
+    def get_job_queue(cls) -> SearchJobQueue:
+        """Get the shared background search queue (started in the app lifespan)."""
+        if cls._job_queue is None:
+            cls._job_queue = SearchJobQueue(
+                service_provider=cls.get_search_service,
+                result_sets=cls.get_result_sets()
+            )
+        return cls._job_queue
+    
+    @classmethod
+    def get_scraping_capacity(cls) -> int:
+        """Searches that can scrape at once: browser contexts, across worker processes if any."""
+        workers = cls.get_search_workers()
+        contexts = cls.get_browser_pool().max_contexts
+        return contexts * workers.processes if workers else contexts
+    
+    @classmethod
+    def get_batch_runner(cls) -> BatchSearchRunner:
+        """
+        Get the batch search scheduler.
+        BATCH_CONCURRENCY overrides the default of one search per browser context.
+        """
+        if cls._batch_runner is None:
+            concurrency = int(os.getenv("BATCH_CONCURRENCY", "0")) or cls.get_scraping_capacity()
+            cls._batch_runner = BatchSearchRunner(cls.get_search_service, concurrency)
+        return cls._batch_runner
+    
+    @classmethod
+    def get_enricher(cls) -> WebsiteEnricher:
+        """Get the shared website enricher; shared so its page and robots.txt caches are."""
+        if cls._enricher is None:
+            cls._enricher = WebsiteEnricher(cls.get_public_http_client())
+        return cls._enricher
+    
+    @classmethod
+    def get_result_sets(cls) -> ResultSetStore:
+        """Get the shared store of result sets that searches can be paged through."""
+        if cls._result_sets is None:
+            cls._result_sets = ResultSetStore()
+        return cls._result_sets
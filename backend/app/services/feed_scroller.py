@@ -0,0 +1,132 @@
+"""
+Adaptive scrolling of the Google Maps results feed.
+Following Single Responsibility Principle - only loads listings into the feed.
+
+Scrolls until the feed holds enough listings, Maps shows its end-of-list
+marker, or the listing count stops growing. Each scroll waits on DOM
+mutations for new listings instead of sleeping for a fixed time.
+"""
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
+from typing import Optional
+import asyncio
+import os
+from app.services.deadline import time_left_s, clamp_timeout_ms
+from app.services.maps_scripts import (
+    FEED_SELECTOR, LISTING_SELECTOR, END_OF_LIST_TEXT,
+    FEED_STATE_SCRIPT, SCROLL_FEED_SCRIPT, FEED_GREW_SCRIPT
+)
+
+
+class ScrollReport:
+    """What one feed load did and why it stopped."""
+
+    def __init__(self, target: int):
+        self.target = target
+        self.iterations = 0
+        self.listings = 0
+        self.stop_reason = "no_feed"
+        self.elapsed_s = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "target": self.target,
+            "iterations": self.iterations,
+            "listings": self.listings,
+            "stop_reason": self.stop_reason,
+            "elapsed_s": round(self.elapsed_s, 3),
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"{self.listings}/{self.target} listings after {self.iterations} scrolls "
+            f"in {self.elapsed_s:.2f}s ({self.stop_reason})"
+        )
+
+
+class FeedScroller:
+    """Scrolls the results feed until it holds `target` listings or runs dry."""
+
+    def __init__(
+        self,
+        stall_timeout_ms: Optional[int] = None,
+        max_stalls: Optional[int] = None,
+        max_scrolls: Optional[int] = None,
+        time_budget_s: Optional[float] = None,
+        deadline_share: Optional[float] = None,
+    ):
+        self.stall_timeout_ms = stall_timeout_ms or int(os.getenv("FEED_STALL_TIMEOUT_MS", "2500"))
+        self.max_stalls = max_stalls or int(os.getenv("FEED_MAX_STALLS", "2"))
+        self.max_scrolls = max_scrolls or int(os.getenv("FEED_MAX_SCROLLS", "40"))
+        self.time_budget_s = time_budget_s or float(os.getenv("FEED_SCROLL_BUDGET_S", "30"))
+        # Under a search deadline, the share of the time left that scrolling may use;
+        # the rest is kept for reading listing details
+        self.deadline_share = deadline_share or float(os.getenv("FEED_SCROLL_DEADLINE_SHARE", "0.5"))
+
+    async def load(self, page: Page, target: int) -> ScrollReport:
+        """
+        Scroll until the feed holds `target` listings.
+
+        Stops early on the end-of-list marker, after `max_stalls` scrolls in
+        a row that added nothing, or when the scroll or time budget runs out.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        report = ScrollReport(target)
+        stalls = 0
+        time_budget_s, budget_reason = self.time_budget_s, "time_budget"
+        time_left = time_left_s()
+        if time_left is not None and time_left * self.deadline_share < time_budget_s:
+            time_budget_s, budget_reason = time_left * self.deadline_share, "deadline"
+
+        state = await self._state(page)
+        while state is not None:
+            report.listings = state["count"]
+            if state["count"] >= target:
+                report.stop_reason = "target"
+                break
+            if state["end"]:
+                report.stop_reason = "end_of_list"
+                break
+            if stalls >= self.max_stalls:
+                report.stop_reason = "stalled"
+                break
+            if report.iterations >= self.max_scrolls:
+                report.stop_reason = "max_scrolls"
+                break
+            if loop.time() - started >= time_budget_s:
+                report.stop_reason = budget_reason
+                break
+
+            await page.evaluate(SCROLL_FEED_SCRIPT, FEED_SELECTOR)
+            report.iterations += 1
+            await self._wait_for_growth(page, state["count"])
+
+            previous = state["count"]
+            state = await self._state(page)
+            if state is not None and state["count"] <= previous:
+                stalls += 1
+            else:
+                stalls = 0
+
+        report.elapsed_s = loop.time() - started
+        return report
+
+    async def _state(self, page: Page) -> Optional[dict]:
+        try:
+            return await page.evaluate(
+                FEED_STATE_SCRIPT, [FEED_SELECTOR, LISTING_SELECTOR, END_OF_LIST_TEXT]
+            )
+        except Exception:
+            return None
+
+    async def _wait_for_growth(self, page: Page, previous: int):
+        """Wait until new listings arrive (or the end marker shows), re-checking on every mutation."""
+        try:
+            await page.wait_for_function(
+                FEED_GREW_SCRIPT,
+                arg=[FEED_SELECTOR, LISTING_SELECTOR, END_OF_LIST_TEXT, previous],
+                polling='mutation',
+                timeout=clamp_timeout_ms(self.stall_timeout_ms)
+            )
+        except PlaywrightTimeout:
+            pass
@@ -0,0 +1,133 @@
+"""
+Geo tiling for large-area Maps searches.
+Following Single Responsibility Principle - only plans and identifies tiles and listings.
+
+A Maps results feed is capped at roughly 120 listings and only covers the
+current viewport. A wide radius is therefore split into a grid of smaller
+viewports. Each one gets its own search, centred on a grid point and zoomed
+so the viewport is about one tile wide. Tiles are ordered outward from the
+centre, so stopping early keeps the nearest results.
+"""
+from typing import NamedTuple, Optional
+import math
+import os
+import re
+
+
+# Searches split into tiles unless SearchCriteria.tiling says otherwise
+GEO_TILING = os.getenv("GEO_TILING", "off") == "on"
+# Width of one tile's viewport
+GEO_TILE_KM = float(os.getenv("GEO_TILE_KM", "4"))
+# Upper bound on tiles per search, the centre included
+GEO_MAX_TILES = int(os.getenv("GEO_MAX_TILES", "25"))
+# Tiles searched at once, each in its own tab
+GEO_TILE_CONCURRENCY = int(os.getenv("GEO_TILE_CONCURRENCY", "3"))
+
+# Width of the browser viewport the map is drawn in
+VIEWPORT_WIDTH_PX = 1920
+
+KM_PER_DEGREE_LAT = 110.574
+KM_PER_DEGREE_LNG_AT_EQUATOR = 111.320
+EARTH_RADIUS_KM = 6371.0
+
+# Maps keeps the viewport in the URL: .../@43.6532,-79.3832,13z
+_VIEWPORT_PATTERN = re.compile(r'@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?),(\d+(?:\.\d+)?)z')
+# Place URLs carry the place ID and its coordinates: ...!1s0x..:0x..!3d43.65!4d-79.38
+_PLACE_ID_PATTERN = re.compile(r'!1s(0x[0-9a-f]+:0x[0-9a-f]+)')
+_PLACE_COORDS_PATTERN = re.compile(r'!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)')
+
+
+def tiling_enabled(requested: Optional[bool]) -> bool:
+    """Whether a search is tiled, given SearchCriteria.tiling (None falls back to GEO_TILING)."""
+    return GEO_TILING if requested is None else requested
+
+
+class Tile(NamedTuple):
+    """A Maps viewport: centre and zoom level."""
+    lat: float
+    lng: float
+    zoom: float
+
+    @property
+    def viewport(self) -> str:
+        """URL form: @lat,lng,zoomz"""
+        return f"@{self.lat:.6f},{self.lng:.6f},{self.zoom:g}z"
+
+
+def parse_viewport(url: str) -> Optional[Tile]:
+    """The viewport a Maps URL is showing, if it says."""
+    match = _VIEWPORT_PATTERN.search(url)
+    if not match:
+        return None
+    return Tile(float(match.group(1)), float(match.group(2)), float(match.group(3)))
+
+
+def zoom_for_width(width_km: float, lat: float, viewport_px: int = VIEWPORT_WIDTH_PX) -> float:
+    """Web Mercator zoom at which `viewport_px` pixels span `width_km` at this latitude."""
+    meters_per_px = width_km * 1000 / viewport_px
+    zoom = math.log2(156543.03392 * math.cos(math.radians(lat)) / meters_per_px)
+    return round(min(21.0, max(3.0, zoom)), 1)
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def plan_tiles(
+    center_lat: float,
+    center_lng: float,
+    radius_km: float,
+    tile_km: float = GEO_TILE_KM,
+    max_tiles: int = GEO_MAX_TILES,
+) -> list[Tile]:
+    """
+    Grid of tiles covering the circle around the centre, nearest first.
+
+    The centre tile itself is not included; it is the plain search. A tile
+    is kept if any part of it can fall inside the radius.
+    """
+    if radius_km <= tile_km / 2 or max_tiles <= 1:
+        return []
+    zoom = zoom_for_width(tile_km, center_lat)
+    km_per_degree_lng = KM_PER_DEGREE_LNG_AT_EQUATOR * math.cos(math.radians(center_lat))
+    steps = math.ceil(radius_km / tile_km)
+    reach = radius_km + tile_km * math.sqrt(2) / 2
+
+    offsets = []
+    for row in range(-steps, steps + 1):
+        for col in range(-steps, steps + 1):
+            if row == 0 and col == 0:
+                continue
+            dx, dy = col * tile_km, row * tile_km
+            if math.hypot(dx, dy) <= reach:
+                offsets.append((dx, dy))
+    # Spiral outwards; angle breaks ties so the order is stable
+    offsets.sort(key=lambda offset: (math.hypot(*offset), math.atan2(offset[1], offset[0])))
+
+    return [
+        Tile(center_lat + dy / KM_PER_DEGREE_LAT, center_lng + dx / km_per_degree_lng, zoom)
+        for dx, dy in offsets[:max_tiles - 1]
+    ]
+
+
+def listing_key(href: Optional[str], aria_label: Optional[str]) -> Optional[str]:
+    """Identity of a feed listing across tiles: its place ID, else its place path."""
+    if href:
+        match = _PLACE_ID_PATTERN.search(href)
+        if match:
+            return match.group(1)
+        return href.split('?')[0].split('/data=')[0]
+    return aria_label
+
+
+def listing_coordinates(href: Optional[str]) -> Optional[tuple[float, float]]:
+    """(lat, lng) of a listing from its place URL, if present."""
+    match = _PLACE_COORDS_PATTERN.search(href or '')
+    if not match:
+        return None
+    return float(match.group(1)), float(match.group(2))
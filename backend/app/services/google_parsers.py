@@ -0,0 +1,232 @@
+"""
+Google search result page parsers.
+Following Single Responsibility Principle - only turns result HTML into Business objects.
+Following Liskov Substitution Principle - every parser returns identical output.
+
+Two backends are available:
+- "soup": BeautifulSoup over lxml, with targeted CSS selection
+- "lxml": lxml.html directly, avoiding BeautifulSoup's Python object tree
+"""
+from abc import ABC, abstractmethod
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+from typing import Optional, Iterator
+import re
+import os
+import logging
+from app.models import Business
+
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_PARSER = os.getenv("GOOGLE_PARSER", "lxml")
+
+PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+PHONE_LIKE_PATTERN = re.compile(r'\d{3}.*\d{4}')
+RATING_LIKE_PATTERN = re.compile(r'\d\.\d.*★')
+
+# Tags whose text BeautifulSoup's get_text() leaves out
+_NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+class ResultPageParser(ABC):
+    """Parses a Google search result page into businesses."""
+
+    name = "base"
+
+    @abstractmethod
+    def parse(self, html_content: str, max_results: int) -> list[Business]:
+        """Parse HTML to extract business information."""
+        pass
+
+    def _build_business(self, name, phone, address, rating) -> Optional[Business]:
+        try:
+            return Business(
+                name=name,
+                phone=phone,
+                email=None,  # Email typically not in search results
+                address=address,
+                website=None,
+                rating=rating
+            )
+        except Exception as e:
+            logger.debug("Skipping unparseable result", extra={"fields": {"error": str(e)}})
+            return None
+
+    def _parse_rating(self, rating_text: Optional[str]) -> Optional[float]:
+        if rating_text is None:
+            return None
+        try:
+            return float(rating_text.split()[0])
+        except (IndexError, ValueError):
+            return None
+
+    def _match_phone(self, text: str) -> Optional[str]:
+        match = PHONE_PATTERN.search(text)
+        return match.group(0) if match else None
+
+    def _looks_like_business(self, text: str) -> bool:
+        """Heuristic for the fallback format: a phone pattern or a star rating."""
+        if not 10 < len(text) < 200:  # Reasonable business name length
+            return False
+        return bool(PHONE_LIKE_PATTERN.search(text) or RATING_LIKE_PATTERN.search(text))
+
+    def _fallback_name(self, text: str) -> str:
+        return text.split('\n')[0][:100] if '\n' in text else text[:100]
+
+
+class SoupResultPageParser(ResultPageParser):
+    """BeautifulSoup parser; the reference implementation."""
+
+    name = "soup"
+
+    def parse(self, html_content: str, max_results: int) -> list[Business]:
+        if not html_content:
+            return []
+
+        soup = BeautifulSoup(html_content, 'lxml')
+        businesses = []
+
+        # Parse business listings from Google search results
+        # This targets the local business results section
+        for div in soup.select('div.VkpGBb', limit=max_results):
+            business = self._extract_business_info(div)
+            if business and business.name:
+                businesses.append(business)
+
+        # Fallback: Try alternative parsing if no results
+        if not businesses:
+            businesses = self._parse_alternative_format(soup, max_results)
+
+        return businesses[:max_results]
+
+    def _extract_business_info(self, element) -> Optional[Business]:
+        name_elem = element.find('div', class_='dbg0pd') or element.find('h3')
+        address_elem = element.find('span', class_='rllt__details')
+        rating_elem = element.find('span', class_='yi40Hd')
+
+        return self._build_business(
+            name=name_elem.get_text(strip=True) if name_elem else None,
+            phone=self._match_phone(element.get_text()),
+            address=address_elem.get_text(strip=True) if address_elem else None,
+            rating=self._parse_rating(rating_elem.get_text(strip=True) if rating_elem else None)
+        )
+
+    def _parse_alternative_format(self, soup: BeautifulSoup, max_results: int) -> list[Business]:
+        businesses = []
+
+        # Any div with a class attribute, checking more to find valid ones
+        for div in soup.select('div[class]', limit=max_results * 3):
+            text = div.get_text(strip=True)
+            if self._looks_like_business(text):
+                businesses.append(Business(
+                    name=self._fallback_name(text),
+                    phone=self._match_phone(div.get_text()),
+                    address=None
+                ))
+
+            if len(businesses) >= max_results:
+                break
+
+        return businesses
+
+
+class LxmlResultPageParser(ResultPageParser):
+    """lxml-native parser, producing the same output as SoupResultPageParser."""
+
+    name = "lxml"
+
+    _business_xpath = etree.XPath(
+        '//div[contains(concat(" ", normalize-space(@class), " "), " VkpGBb ")]'
+    )
+    _classed_div_xpath = etree.XPath('//div[@class]')
+
+    def parse(self, html_content: str, max_results: int) -> list[Business]:
+        if not html_content:
+            return []
+
+        try:
+            root = lxml_html.document_fromstring(html_content)
+        except (etree.ParserError, ValueError):
+            return []
+
+        businesses = []
+        for div in self._business_xpath(root)[:max_results]:
+            business = self._extract_business_info(div)
+            if business and business.name:
+                businesses.append(business)
+
+        # Fallback: Try alternative parsing if no results
+        if not businesses:
+            businesses = self._parse_alternative_format(root, max_results)
+
+        return businesses[:max_results]
+
+    def _extract_business_info(self, element) -> Optional[Business]:
+        name_elem = self._find(element, 'div', 'dbg0pd')
+        if name_elem is None:
+            name_elem = next(element.iterdescendants('h3'), None)
+        address_elem = self._find(element, 'span', 'rllt__details')
+        rating_elem = self._find(element, 'span', 'yi40Hd')
+
+        return self._build_business(
+            name=self._text(name_elem, strip=True) if name_elem is not None else None,
+            phone=self._match_phone(self._text(element)),
+            address=self._text(address_elem, strip=True) if address_elem is not None else None,
+            rating=self._parse_rating(
+                self._text(rating_elem, strip=True) if rating_elem is not None else None
+            )
+        )
+
+    def _parse_alternative_format(self, root, max_results: int) -> list[Business]:
+        businesses = []
+
+        for div in self._classed_div_xpath(root)[:max_results * 3]:
+            text = self._text(div, strip=True)
+            if self._looks_like_business(text):
+                businesses.append(Business(
+                    name=self._fallback_name(text),
+                    phone=self._match_phone(self._text(div)),
+                    address=None
+                ))
+
+            if len(businesses) >= max_results:
+                break
+
+        return businesses
+
+    def _find(self, element, tag: str, css_class: str):
+        """First descendant `tag` carrying `css_class`, like soup.find(tag, class_=...)."""
+        for candidate in element.iterdescendants(tag):
+            if css_class in (candidate.get('class') or '').split():
+                return candidate
+        return None
+
+    def _text(self, element, strip: bool = False) -> str:
+        """Same text as BeautifulSoup's get_text() / get_text(strip=True)."""
+        if strip:
+            return ''.join(s for s in (s.strip() for s in self._strings(element)) if s)
+        return ''.join(self._strings(element))
+
+    def _strings(self, element) -> Iterator[str]:
+        if isinstance(element.tag, str) and element.tag not in _NON_TEXT_TAGS:
+            if element.text:
+                yield element.text
+            for child in element:
+                yield from self._strings(child)
+                if child.tail:
+                    yield child.tail
+
+
+_PARSERS = {
+    SoupResultPageParser.name: SoupResultPageParser,
+    LxmlResultPageParser.name: LxmlResultPageParser,
+}
+
+
+def get_result_parser(name: str = GOOGLE_PARSER) -> ResultPageParser:
+    """Parser backend by name ("soup" or "lxml")."""
+    parser_class = _PARSERS.get(name)
+    if parser_class is None:
+        raise ValueError(f"Unknown Google parser '{name}', expected one of {sorted(_PARSERS)}")
+    return parser_class()
@@ -0,0 +1,90 @@
+"""
+Shared async HTTP client.
+Following Single Responsibility Principle - only manages pooled HTTP connections.
+
+One aiohttp session is reused for every request so keep-alive connections
+are pooled, with caps on total and per-host connections. A client for
+URLs that come from outside (business websites) can be limited to public
+addresses, so it cannot be pointed at this host or the internal network.
+"""
+from aiohttp.abc import AbstractResolver
+from typing import Optional
+import aiohttp
+import ipaddress
+import os
+import socket
+
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+HTTP_TIMEOUT_S = float(os.getenv("HTTP_TIMEOUT_S", "10"))
+HTTP_CONNECT_TIMEOUT_S = float(os.getenv("HTTP_CONNECT_TIMEOUT_S", "3"))
+
+
+def is_public_address(host: str) -> bool:
+    """Whether an IP address is globally routable (not loopback, private, link-local, ...)."""
+    try:
+        return ipaddress.ip_address(host).is_global
+    except ValueError:
+        return False
+
+
+class PublicAddressResolver(AbstractResolver):
+    """
+    DNS resolver that only returns public addresses. The check happens at
+    connect time, so a hostname that resolves differently on a second
+    lookup cannot slip past it.
+    """
+
+    def __init__(self):
+        self._resolver = aiohttp.DefaultResolver()
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> list[dict]:
+        addresses = [
+            address for address in await self._resolver.resolve(host, port, family)
+            if is_public_address(address["host"])
+        ]
+        if not addresses:
+            raise OSError(f"{host} does not resolve to a public address")
+        return addresses
+
+    async def close(self):
+        await self._resolver.close()
+
+
+class HttpClient:
+    """Lazily created, process-wide aiohttp session."""
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+        timeout_s: float = HTTP_TIMEOUT_S,
+        connect_timeout_s: float = HTTP_CONNECT_TIMEOUT_S,
+        public_only: bool = False,
+    ):
+        """public_only refuses to connect to hostnames that resolve to non-public addresses."""
+        self.max_connections = max_connections
+        self.public_only = public_only
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout_s, connect=connect_timeout_s)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared session; must be used from the app's event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=30,
+                ttl_dns_cache=300,
+                resolver=PublicAddressResolver() if self.public_only else None
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -3,7 +3,8 @@ Abstract interface for business search service.
 Following Dependency Inversion Principle - depend on abstractions.
 """
 from abc import ABC, abstractmethod
-from app.models import SearchCriteria, Business
+from typing import Optional, AsyncIterator
+from app.models import SearchCriteria, Business, CachedSearch
 
 
 class IBusinessSearchService(ABC):
@@ -20,4 +21,38 @@ class IBusinessSearchService(ABC):
         Returns:
             List of Business objects matching the criteria
         """
-        pass
\ No newline at end of file
+        pass
+    
+    async def stream_businesses(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        """
+        Yield businesses as they are found.
+        
+        Implementations that can produce results progressively should
+        override this; by default the full search result is replayed.
+        """
+        for business in await self.search_businesses(criteria):
+            yield business
+
+
+class ISearchCacheBackend(ABC):
+    """Interface for search result cache storage (in-process, disk, SQLite...)."""
+    
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CachedSearch]:
+        """Return the cached entry for key, or None."""
+        pass
+    
+    @abstractmethod
+    async def set(self, key: str, entry: CachedSearch) -> None:
+        """Store an entry, evicting older ones if over capacity."""
+        pass
+    
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        pass
+    
+    @abstractmethod
+    def stats(self) -> dict:
+        """Entry count and size information."""
+        pass
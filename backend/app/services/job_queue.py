@@ -0,0 +1,191 @@
+"""
+Background job queue for long-running searches.
+Following Single Responsibility Principle - only schedules and tracks search jobs.
+
+Jobs wait in a bounded priority queue and a fixed number of workers run
+them, so the number of concurrent browser sessions is capped no matter how
+many requests arrive. A full queue is reported to callers instead of
+letting work pile up.
+"""
+from typing import Callable, Dict, Optional
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+import os
+from app.models import SearchCriteria, SearchJob, JobStatus
+from app.services.interfaces import IBusinessSearchService
+from app.services.telemetry import request_id_var
+from app.services.deadline import search_within_budget
+from app.services.result_sets import ResultSetStore
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_JOB_WORKERS = int(os.getenv("SEARCH_JOB_WORKERS", "2"))
+SEARCH_JOB_QUEUE_SIZE = int(os.getenv("SEARCH_JOB_QUEUE_SIZE", "50"))
+SEARCH_JOB_RETENTION_S = float(os.getenv("SEARCH_JOB_RETENTION_S", "3600"))
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity."""
+
+    def __init__(self, depth: int):
+        super().__init__(f"Search queue is full ({depth} jobs waiting)")
+        self.depth = depth
+
+
+class SearchJobQueue:
+    """Bounded priority queue of search jobs with a global concurrency cap."""
+
+    def __init__(
+        self,
+        service_provider: Callable[[], IBusinessSearchService],
+        workers: int = SEARCH_JOB_WORKERS,
+        max_queued: int = SEARCH_JOB_QUEUE_SIZE,
+        retention_s: float = SEARCH_JOB_RETENTION_S,
+        result_sets: Optional[ResultSetStore] = None,
+    ):
+        """result_sets, if given, keeps each completed job's results for paged reads."""
+        self.service_provider = service_provider
+        self.result_sets = result_sets
+        self.workers = workers
+        self.max_queued = max_queued
+        self.retention_s = retention_s
+
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._jobs: Dict[str, SearchJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._workers: list[asyncio.Task] = []
+        self._sequence = itertools.count()
+        self._stopping = False
+
+    @property
+    def depth(self) -> int:
+        """Jobs waiting to start."""
+        return sum(1 for job in self._jobs.values() if job.status == JobStatus.QUEUED)
+
+    @property
+    def running(self) -> int:
+        return len(self._tasks)
+
+    async def start(self):
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info("Search job queue started", extra={"fields": {"workers": self.workers}})
+
+    async def stop(self):
+        self._stopping = True
+        for task in list(self._tasks.values()):
+            task.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, criteria: SearchCriteria, priority: int = 0) -> SearchJob:
+        """
+        Queue a search. Lower priority values run first; ties run in
+        submission order.
+
+        Raises:
+            QueueFullError: if max_queued jobs are already waiting
+        """
+        self._purge_finished()
+        depth = self.depth
+        if depth >= self.max_queued:
+            raise QueueFullError(depth)
+
+        job = SearchJob(
+            id=uuid.uuid4().hex,
+            status=JobStatus.QUEUED,
+            priority=priority,
+            criteria=criteria,
+            submitted_at=time.time()
+        )
+        self._jobs[job.id] = job
+        self._queue.put_nowait((priority, next(self._sequence), job.id))
+        logger.info("Search job queued", extra={"fields": {"job_id": job.id, "priority": priority}})
+        return job
+
+    def get(self, job_id: str) -> Optional[SearchJob]:
+        job = self._jobs.get(job_id)
+        if job is not None and job.status == JobStatus.QUEUED:
+            job.queue_position = self._position(job)
+        return job
+
+    def cancel(self, job_id: str) -> Optional[SearchJob]:
+        """Cancel a queued or running job. Finished jobs are left as they are."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+
+        if job.status == JobStatus.QUEUED:
+            job.status = JobStatus.CANCELLED
+            job.finished_at = time.time()
+        elif job.status == JobStatus.RUNNING:
+            task = self._tasks.get(job_id)
+            if task:
+                task.cancel()
+        return job
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None or job.status != JobStatus.QUEUED:
+                continue
+
+            job.status = JobStatus.RUNNING
+            job.queue_position = None
+            job.started_at = time.time()
+            # Tag everything the job logs with its ID
+            request_id_var.set(job.id)
+            task = asyncio.create_task(search_within_budget(self.service_provider(), job.criteria))
+            self._tasks[job_id] = task
+            try:
+                businesses, partial = await task
+                job.businesses = businesses
+                job.total_results = len(businesses)
+                job.partial = partial
+                if self.result_sets is not None:
+                    job.result_set_id = self.result_sets.create(
+                        f"{job.criteria.industry} near {job.criteria.location}",
+                        job.criteria, businesses, partial
+                    ).id
+                job.status = JobStatus.COMPLETED
+            except asyncio.CancelledError:
+                job.status = JobStatus.CANCELLED
+                if self._stopping:
+                    raise
+            except Exception as e:
+                job.status = JobStatus.FAILED
+                job.error = str(e)
+                logger.warning("Search job failed", extra={"fields": {"job_id": job_id, "error": job.error}})
+            finally:
+                job.finished_at = time.time()
+                self._tasks.pop(job_id, None)
+
+    def _position(self, job: SearchJob) -> int:
+        ahead = [
+            other for other in self._jobs.values()
+            if other.status == JobStatus.QUEUED
+            and (other.priority, other.submitted_at) < (job.priority, job.submitted_at)
+        ]
+        return len(ahead) + 1
+
+    def _purge_finished(self):
+        cutoff = time.time() - self.retention_s
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at and job.finished_at < cutoff:
+                del self._jobs[job_id]
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queue_depth": self.depth,
+            "max_queued": self.max_queued,
+        }
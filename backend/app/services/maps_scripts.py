@@ -0,0 +1,111 @@
+"""
+In-page scripts for reading Google Maps in a single round trip.
+Following Single Responsibility Principle - only gathers raw DOM values.
+
+Scripts return plain strings; all parsing (aria-label split, phone
+cleanup, review counts) stays in Python.
+"""
+
+LISTING_SELECTOR = 'a[href*="/maps/place/"]'
+
+# Candidate selectors per details field, in priority order
+PHONE_SELECTORS = [
+    'button[data-item-id*="phone"]',
+    'button[data-tooltip*="phone"]',
+    'a[href^="tel:"]',
+    'button[aria-label*="Phone"]'
+]
+
+WEBSITE_SELECTORS = [
+    'a[data-item-id="authority"]',
+    'a[aria-label*="Website"]',
+    'button[data-item-id*="authority"]'
+]
+
+REVIEWS_SELECTORS = [
+    'button[aria-label*="reviews"]',
+    'span[aria-label*="reviews"]'
+]
+
+# [{href, label}] for every listing link in the feed
+LISTINGS_SCRIPT = """
+(selector) => [...document.querySelectorAll(selector)].map(a => ({
+    href: a.href,
+    label: a.getAttribute('aria-label'),
+}))
+"""
+
+# First match of each selector, per field, as {href, label, text}
+DETAILS_SCRIPT = """
+(fields) => {
+    const read = (el) => el ? {
+        href: el.getAttribute('href'),
+        label: el.getAttribute('aria-label'),
+        text: el.innerText,
+    } : null;
+    const out = {};
+    for (const [field, selectors] of Object.entries(fields)) {
+        out[field] = selectors.map(s => read(document.querySelector(s)));
+    }
+    return out;
+}
+"""
+
+# True once every field has at least one matching selector
+DETAILS_COMPLETE_SCRIPT = """
+(fields) => Object.values(fields).every(
+    selectors => selectors.some(s => document.querySelector(s))
+)
+"""
+
+DETAIL_FIELDS = {
+    'phone': PHONE_SELECTORS,
+    'website': WEBSITE_SELECTORS,
+    'reviews': REVIEWS_SELECTORS,
+}
+
+FEED_SELECTOR = 'div[role="feed"]'
+
+# Shown at the bottom of the feed once Maps has no more results
+END_OF_LIST_TEXT = "You've reached the end of the list"
+
+# {count, end} for the feed, or null if the feed is gone
+FEED_STATE_SCRIPT = """
+([feedSelector, linkSelector, endText]) => {
+    const feed = document.querySelector(feedSelector);
+    if (!feed) return null;
+    return {
+        count: feed.querySelectorAll(linkSelector).length,
+        end: (feed.textContent || '').includes(endText),
+    };
+}
+"""
+
+# Scroll the feed to its bottom edge so Maps lazy-loads the next page
+SCROLL_FEED_SCRIPT = """
+(feedSelector) => {
+    const feed = document.querySelector(feedSelector);
+    if (feed) feed.scrollTop = feed.scrollHeight;
+}
+"""
+
+# True once the feed holds more than `previous` links or shows the end marker
+FEED_GREW_SCRIPT = """
+([feedSelector, linkSelector, endText, previous]) => {
+    const feed = document.querySelector(feedSelector);
+    if (!feed) return true;
+    return feed.querySelectorAll(linkSelector).length > previous
+        || (feed.textContent || '').includes(endText);
+}
+"""
+
+# Why Google is refusing to serve results ('consent', 'captcha', 'rate_limit'), or null
+THROTTLE_PAGE_SCRIPT = """
+() => {
+    if (location.hostname.startsWith('consent.')) return 'consent';
+    if (location.pathname.startsWith('/sorry/')) return 'rate_limit';
+    if (document.querySelector('#captcha-form, .g-recaptcha, iframe[src*="/recaptcha/"]')) return 'captcha';
+    if (document.querySelector('form[action*="consent.google."]')) return 'consent';
+    return null;
+}
+"""
@@ -5,21 +5,109 @@ Extracts real business data from Google Maps.
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 from app.models import SearchCriteria, Business
 from app.services.interfaces import IBusinessSearchService
+from app.services.browser_pool import BrowserPool, DEFAULT_USER_AGENT
+from app.services.response_cache import recording_session
+from app.services.wait_engine import WaitEngine
+from app.services.feed_scroller import FeedScroller, ScrollReport
+from app.services.telemetry import span, record_detail_fields
+from app.services.rate_limiter import ThrottledError, THROTTLE_URL_PATTERN
+from app.services.deadline import clamp_timeout_ms, deadline_expired, time_left_s, mark_partial, is_partial
+from app.services.geo_tiling import (
+    tiling_enabled, GEO_TILE_CONCURRENCY, plan_tiles, parse_viewport, listing_key, listing_coordinates, distance_km
+)
+from app.services.maps_scripts import (
+    LISTING_SELECTOR, LISTINGS_SCRIPT, DETAILS_SCRIPT, DETAILS_COMPLETE_SCRIPT, DETAIL_FIELDS,
+    THROTTLE_PAGE_SCRIPT
+)
+from urllib.parse import urljoin
 import re
+import os
 import asyncio
-from typing import Optional, List
+import logging
+from typing import Awaitable, Callable, Optional, List, AsyncIterator
+
+
+# Tabs used to open place pages in parallel; 1 keeps the click-through mode
+DETAIL_CONCURRENCY = int(os.getenv("DETAIL_CONCURRENCY", "1"))
+
+# Point at a local fixture server to benchmark without hitting Google
+GOOGLE_BASE_URL = os.getenv("GOOGLE_BASE_URL", "https://www.google.com")
+
+logger = logging.getLogger(__name__)
+
+# Name of the placeholder yielded when nothing was found
+NO_RESULTS_NAME = "No results found"
+
+# What one scraper instance searches: Maps with web fallback, or just one of them
+STRATEGIES = ("auto", "maps", "web")
+
+
+def no_results_business(criteria: SearchCriteria) -> Business:
+    """Placeholder shown when a search found nothing."""
+    return Business(
+        name=NO_RESULTS_NAME,
+        phone="Try different search terms or location",
+        address=f"Searched for: {criteria.industry} in {criteria.location}"
+    )
+
+
+def clean_phone(phone: str) -> str:
+    """Format a North American phone number as (XXX) XXX-XXXX; leave others as-is."""
+    if not phone:
+        return None
+    
+    digits = re.sub(r'\D', '', phone)
+    
+    if len(digits) == 10:
+        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+    elif len(digits) == 11 and digits[0] == '1':
+        return f"({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
+    
+    return phone
 
 
 class PlaywrightScraperService(IBusinessSearchService):
     """Scrapes Google Maps for business information."""
     
-    def __init__(self):
-        self.user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    def __init__(
+        self,
+        browser_pool: Optional[BrowserPool] = None,
+        base_url: Optional[str] = None,
+        listing_resolver: Optional[Callable[[dict, SearchCriteria], Awaitable[Optional[Business]]]] = None,
+        strategy: str = "auto",
+    ):
+        """
+        listing_resolver, if given, returns an already-known Business for a
+        parsed feed listing ({name, rating, address}); its details panel is
+        then not opened.
+        
+        strategy "maps" or "web" runs only that search, without fallback or
+        placeholder, for use under HedgedStrategyRunner.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown scraper strategy: {strategy}")
+        self.user_agent = DEFAULT_USER_AGENT
+        self.browser_pool = browser_pool
+        self.base_url = (base_url or GOOGLE_BASE_URL).rstrip('/')
+        self.listing_resolver = listing_resolver
+        self.strategy = strategy
+        self.wait_engine = WaitEngine()
+        self.feed_scroller = FeedScroller()
     
     async def search_businesses(self, criteria: SearchCriteria) -> list[Business]:
         """Main search method."""
-        query = f"{criteria.industry} in {criteria.location}"
+        return [business async for business in self.stream_businesses(criteria)]
+    
+    async def stream_businesses(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        """Yield each business as soon as it has been extracted."""
+        if self.browser_pool and self.browser_pool.started:
+            async with self.browser_pool.context(recording_session(self.strategy, criteria)) as context:
+                page = await context.new_page()
+                async for business in self._search_with_page(page, criteria):
+                    yield business
+            return
         
+        # No shared pool (e.g. used from a script): launch a one-off browser
         async with async_playwright() as p:
             browser = await p.chromium.launch(
                 headless=True,
@@ -31,298 +119,571 @@ class PlaywrightScraperService(IBusinessSearchService):
                     user_agent=self.user_agent,
                     viewport={'width': 1920, 'height': 1080}
                 )
-                
-                print(f"\n🔍 Searching: {query}")
-                
-                # Search Google Maps
-                businesses = await self._scrape_google_maps(page, query, criteria.max_results)
-                
-                if not businesses:
-                    print("⚠️ No results from Maps, trying regular Google...")
-                    businesses = await self._scrape_google_web(page, query, criteria.max_results)
-                
-                if not businesses:
-                    return [Business(
-                        name="No results found",
-                        phone="Try different search terms or location",
-                        address=f"Searched for: {query}"
-                    )]
-                
-                return businesses[:criteria.max_results]
+                async for business in self._search_with_page(page, criteria):
+                    yield business
                 
             finally:
                 await browser.close()
     
-    async def _scrape_google_maps(self, page, query: str, max_results: int) -> List[Business]:
+    async def _search_with_page(self, page, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        """Run the Maps search, falling back to web search, on a ready page."""
+        query = f"{criteria.industry} in {criteria.location}"
+        
+        with span(
+            "search", logging.INFO, query=query, max_results=criteria.max_results, strategy=self.strategy
+        ) as search:
+            found = 0
+            if self.strategy != "web":
+                # Search Google Maps
+                detail_concurrency = criteria.detail_concurrency or DETAIL_CONCURRENCY
+                resolve_listing = None
+                if self.listing_resolver is not None:
+                    resolve_listing = lambda listing: self.listing_resolver(listing, criteria)
+                if tiling_enabled(criteria.tiling):
+                    source = self._iter_tiled(page, criteria, query, detail_concurrency, resolve_listing)
+                else:
+                    source = self._iter_google_maps(
+                        page, query, criteria.max_results, detail_concurrency, resolve_listing
+                    )
+                async for business in source:
+                    found += 1
+                    yield business
+            
+            if not found and deadline_expired():
+                mark_partial()
+            elif not found and self.strategy != "maps":
+                if self.strategy == "auto":
+                    logger.info("No results from Maps, falling back to web search", extra={"fields": {"query": query}})
+                for business in await self._scrape_google_web(page, query, criteria.max_results):
+                    found += 1
+                    yield business
+            
+            search.set(results=found, partial=is_partial())
+            if not found:
+                search.outcome = "empty"
+        
+        # Out of time is not the same as nothing found
+        if not found and not is_partial() and self.strategy == "auto":
+            yield no_results_business(criteria)
+    
+    async def _scrape_google_maps(self, page, query: str, max_results: int, detail_concurrency: int = 1) -> List[Business]:
         """Scrape Google Maps - the most reliable method."""
-        businesses = []
+        return [
+            business async for business in
+            self._iter_google_maps(page, query, max_results, detail_concurrency)
+        ]
+    
+    async def _iter_google_maps(
+        self,
+        page,
+        query: str,
+        max_results: int,
+        detail_concurrency: int = 1,
+        resolve_listing: Optional[Callable[[dict], Awaitable[Optional[Business]]]] = None,
+        url: Optional[str] = None,
+        claim: Optional[Callable[[dict], bool]] = None,
+    ) -> AsyncIterator[Business]:
+        """
+        Scrape Google Maps, yielding businesses in feed order as they are extracted.
         
+        url overrides the search URL (e.g. to pin the viewport). claim, if
+        given, is asked about each feed listing ({label, href}) and only
+        listings it accepts are extracted.
+        """
         try:
             # Navigate to Google Maps
-            url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}"
-            print(f"📍 Loading: {url}")
+            url = url or f"{self.base_url}/maps/search/{query.replace(' ', '+')}"
             
-            await page.goto(url, wait_until='domcontentloaded', timeout=20000)
-            await asyncio.sleep(3)  # Let it fully load
+            with span("goto", url=url):
+                await page.goto(url, wait_until='domcontentloaded', timeout=clamp_timeout_ms(20000))
+            await self._raise_if_throttled(page, check_page=False)
             
             # Wait for the results feed
             try:
-                await page.wait_for_selector('div[role="feed"]', timeout=10000)
-                print("✓ Results loaded")
-            except:
-                print("✗ Results feed not found")
-                return []
+                with span("feed_wait"):
+                    await page.wait_for_selector('div[role="feed"]', timeout=clamp_timeout_ms(10000))
+            except PlaywrightTimeout:
+                # No feed because Google is blocking us, rather than no results?
+                await self._raise_if_throttled(page)
+                logger.info("Results feed not found", extra={"fields": {"url": url}})
+                return
             
-            # Scroll to load more results
-            await self._scroll_feed(page, max_results)
+            # Scroll until the feed holds max_results listings or runs out
+            with span("scroll") as scroll:
+                report = await self._scroll_feed(page, max_results)
+                scroll.set(**report.to_dict())
             
-            # Get all business cards/links
-            # These are the actual clickable business listings
-            business_links = await page.query_selector_all('a[href*="/maps/place/"]')
+            # Read every listing's aria-label and href in one round trip
+            listings = await page.evaluate(LISTINGS_SCRIPT, LISTING_SELECTOR)
+            selected = [
+                idx for idx, raw in enumerate(listings) if claim is None or claim(raw)
+            ][:max_results]
             
-            print(f"✓ Found {len(business_links)} business listings")
+            if detail_concurrency > 1:
+                async for business in self._iter_businesses_parallel(
+                    page, [listings[idx] for idx in selected], detail_concurrency, resolve_listing
+                ):
+                    yield business
+                return
+            
+            # These are the actual clickable business listings
+            business_links = await page.query_selector_all(LISTING_SELECTOR)
             
             # Extract each business
-            for idx, link in enumerate(business_links[:max_results]):
+            extracted = 0
+            for idx in selected:
+                if idx >= len(business_links):
+                    break
+                if deadline_expired():
+                    mark_partial()
+                    break
+                link, raw = business_links[idx], listings[idx]
                 try:
-                    business = await self._extract_business_from_maps(page, link, idx + 1)
+                    # Still-fresh businesses come from the store without a click
+                    stored = await self._resolve_stored(raw['label'], resolve_listing)
+                    business = stored or await self._extract_business_from_maps(page, link, raw['label'], idx + 1)
                     if business:
-                        businesses.append(business)
+                        extracted += 1
+                        yield business
                         
                         # Don't extract too many to avoid rate limiting
-                        if len(businesses) >= max_results:
+                        if extracted >= max_results:
                             break
                     
                     # Small delay to avoid detection
-                    await asyncio.sleep(0.3)
+                    if not stored:
+                        await asyncio.sleep(0.3)
                     
                 except Exception as e:
-                    print(f"  ✗ [{idx + 1}] Error: {e}")
+                    logger.warning("Listing failed", extra={"fields": {"index": idx + 1, "error": str(e)}})
                     continue
             
+        except ThrottledError:
+            raise
         except Exception as e:
-            print(f"Maps scraping failed: {e}")
-        
-        return businesses
+            logger.warning("Maps scraping failed", extra={"fields": {"query": query, "error": str(e)}})
     
-    async def _extract_business_from_maps(self, page, link_element, index: int) -> Optional[Business]:
-        """Extract business info by clicking the Maps listing."""
-        try:
-            # Get the aria-label which contains: "BusinessName · Rating · Category · Address"
-            aria_label = await link_element.get_attribute('aria-label')
-            
-            if not aria_label or len(aria_label) < 5:
-                return None
-            
-            # Parse the aria-label
-            parts = [p.strip() for p in aria_label.split('·')]
-            
-            name = parts[0] if len(parts) > 0 else None
+    async def _iter_tiled(
+        self,
+        page,
+        criteria: SearchCriteria,
+        query: str,
+        detail_concurrency: int,
+        resolve_listing: Optional[Callable[[dict], Awaitable[Optional[Business]]]],
+    ) -> AsyncIterator[Business]:
+        """
+        Search the location's own viewport, then a grid of tiles across
+        radius_km in parallel tabs, yielding each business once.
+        
+        Listings are deduplicated before their details are read, and no more
+        tiles are searched once max_results businesses have been found.
+        """
+        max_results = criteria.max_results
+        radius_km = criteria.radius_km or 0
+        seen_listings = set()
+        seen_businesses = set()
+        center = None
+        
+        def claim(raw: dict) -> bool:
+            key = listing_key(raw.get('href'), raw.get('label'))
+            if not key or key in seen_listings:
+                return False
+            coordinates = listing_coordinates(raw.get('href'))
+            if center and coordinates and distance_km(center.lat, center.lng, *coordinates) > radius_km:
+                return False
+            seen_listings.add(key)
+            return True
+        
+        def is_new(business: Business) -> bool:
+            key = (business.name.casefold(), business.phone or business.address)
+            if key in seen_businesses:
+                return False
+            seen_businesses.add(key)
+            return True
+        
+        # The plain search also tells us where Maps placed the location
+        found = 0
+        async for business in self._iter_google_maps(
+            page, query, max_results, detail_concurrency, resolve_listing, claim=claim
+        ):
+            if is_new(business):
+                found += 1
+                yield business
+        if found >= max_results:
+            return
+        if deadline_expired():
+            mark_partial()
+            return
+        
+        center = parse_viewport(page.url)
+        if center is None:
+            logger.info("No viewport in Maps URL, not tiling", extra={"fields": {"url": page.url}})
+            return
+        tiles = plan_tiles(center.lat, center.lng, radius_km)
+        if not tiles:
+            return
+        
+        with span("tiles", logging.INFO, tiles=len(tiles), radius_km=radius_km) as tiles_span:
+            pending = iter(tiles)
+            found_queue = asyncio.Queue()
+            # Set once no more tiles are wanted, so workers do not start another
+            stop = asyncio.Event()
             
-            # Skip if it's not a real business name
-            if not name or len(name) < 3:
-                return None
+            async def worker():
+                try:
+                    tab = await page.context.new_page()
+                except Exception as e:
+                    logger.warning("Could not open tile tab", extra={"fields": {"error": str(e)}})
+                    found_queue.put_nowait(None)
+                    return
+                try:
+                    for tile in pending:
+                        if stop.is_set() or deadline_expired():
+                            break
+                        url = f"{self.base_url}/maps/search/{criteria.industry.replace(' ', '+')}/{tile.viewport}"
+                        async for business in self._iter_google_maps(
+                            tab, criteria.industry, max_results, detail_concurrency, resolve_listing,
+                            url=url, claim=claim
+                        ):
+                            found_queue.put_nowait(business)
+                except ThrottledError as e:
+                    found_queue.put_nowait(e)
+                finally:
+                    await tab.close()
+                    found_queue.put_nowait(None)
             
-            # Extract rating from aria-label
-            rating = None
-            if len(parts) > 1:
-                rating_match = re.search(r'(\d+\.?\d*)', parts[1])
-                if rating_match:
+            workers = [asyncio.create_task(worker()) for _ in range(min(GEO_TILE_CONCURRENCY, len(tiles)))]
+            try:
+                running = len(workers)
+                while running and found < max_results:
                     try:
-                        rating = float(rating_match.group(1))
-                    except:
-                        pass
-            
-            # Extract address (usually last part)
-            address = None
-            for part in reversed(parts):
-                if re.search(r'\d+|Toronto|Street|Avenue|Road|Drive|Boulevard|ON', part, re.IGNORECASE):
-                    address = part
+                        item = await asyncio.wait_for(found_queue.get(), time_left_s())
+                    except asyncio.TimeoutError:
+                        mark_partial()
+                        break
+                    if item is None:
+                        running -= 1
+                    elif isinstance(item, ThrottledError):
+                        raise item
+                    elif is_new(item):
+                        found += 1
+                        if found >= max_results:
+                            stop.set()
+                        yield item
+            finally:
+                # Enough results (or the caller left): stop the remaining tiles
+                stop.set()
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+            tiles_span.set(results=found, listings=len(seen_listings))
+    
+    async def _raise_if_throttled(self, page, check_page: bool = True):
+        """Raise ThrottledError if the page is a consent, CAPTCHA or rate-limit interstitial."""
+        if THROTTLE_URL_PATTERN.search(page.url):
+            raise ThrottledError(f"redirected to {page.url.split('?')[0]}")
+        if not check_page:
+            return
+        try:
+            reason = await page.evaluate(THROTTLE_PAGE_SCRIPT)
+        except Exception:
+            return
+        if reason:
+            raise ThrottledError(reason)
+    
+    async def _iter_businesses_parallel(
+        self,
+        page,
+        raw_listings: List[dict],
+        concurrency: int,
+        resolve_listing: Optional[Callable[[dict], Awaitable[Optional[Business]]]] = None,
+    ) -> AsyncIterator[Business]:
+        """
+        Open each listing's place page in a bounded set of tabs.
+        
+        Hrefs are collected once from the feed, then `concurrency` tabs in the
+        same context work through them. Businesses are yielded in feed order
+        as soon as every earlier listing is done.
+        """
+        listings = [
+            (urljoin(page.url, raw['href']), raw['label'])
+            for raw in raw_listings if raw.get('href')
+        ]
+        
+        loop = asyncio.get_running_loop()
+        results = [loop.create_future() for _ in listings]
+        pending = asyncio.Queue()
+        for idx, (_, aria_label) in enumerate(listings):
+            # Only open tabs for listings the store cannot answer
+            stored = await self._resolve_stored(aria_label, resolve_listing)
+            if stored:
+                results[idx].set_result(stored)
+            else:
+                pending.put_nowait(idx)
+        
+        async def worker():
+            tab = await page.context.new_page()
+            try:
+                while not pending.empty() and not deadline_expired():
+                    idx = pending.get_nowait()
+                    href, aria_label = listings[idx]
+                    results[idx].set_result(await self._extract_business_from_place_page(
+                        tab, href, aria_label, idx + 1
+                    ))
+            finally:
+                await tab.close()
+        
+        workers = min(concurrency, pending.qsize())
+        logger.info("Extracting details in parallel tabs", extra={"fields": {"tabs": workers, "listings": pending.qsize()}})
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            for result in results:
+                # Wait for this listing, unless every worker has exited
+                # (e.g. no tab could be opened)
+                while not result.done() and not all(task.done() for task in tasks):
+                    await asyncio.wait(
+                        [result, *tasks], timeout=time_left_s(), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if deadline_expired():
+                        break
+                if not result.done():
+                    if deadline_expired():
+                        mark_partial()
                     break
-            
-            # Click to get more details (phone, website)
-            await link_element.click()
-            await asyncio.sleep(1.5)  # Wait for details panel to load
-            
-            # Extract phone number
-            phone = await self._get_phone_from_details(page)
-            
-            # Extract website
-            website = await self._get_website_from_details(page)
-            
-            # Extract reviews count
-            reviews_count = await self._get_reviews_count(page)
-            
-            # Create business object
-            business = Business(
-                name=name,
-                phone=phone,
-                address=address,
-                website=website,
-                rating=rating,
-                reviews_count=reviews_count
-            )
-            
-            print(f"  ✓ [{index}] {name}")
-            print(f"      Phone: {phone or 'N/A'}")
-            print(f"      Rating: {rating or 'N/A'} ({reviews_count or 0} reviews)")
-            
-            return business
-            
+                business = result.result()
+                if business:
+                    yield business
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _resolve_stored(
+        self,
+        aria_label: Optional[str],
+        resolve_listing: Optional[Callable[[dict], Awaitable[Optional[Business]]]],
+    ) -> Optional[Business]:
+        """Known business for a listing whose details need no re-scrape, if any."""
+        if resolve_listing is None:
+            return None
+        listing = self._parse_listing_label(aria_label)
+        if not listing:
+            return None
+        try:
+            return await resolve_listing(listing)
         except Exception as e:
-            print(f"  ✗ [{index}] Extraction failed: {e}")
+            logger.warning("Listing lookup failed", extra={"fields": {"error": str(e)}})
             return None
     
-    async def _get_phone_from_details(self, page) -> Optional[str]:
-        """Extract phone from the details panel."""
-        try:
-            # Multiple possible selectors for phone
-            phone_selectors = [
-                'button[data-item-id*="phone"]',
-                'button[data-tooltip*="phone"]',
-                'a[href^="tel:"]',
-                'button[aria-label*="Phone"]'
-            ]
-            
-            for selector in phone_selectors:
+    def _parse_listing_label(self, aria_label: Optional[str]) -> Optional[dict]:
+        """Parse a feed aria-label: "BusinessName · Rating · Category · Address"."""
+        if not aria_label or len(aria_label) < 5:
+            return None
+        
+        # Parse the aria-label
+        parts = [p.strip() for p in aria_label.split('·')]
+        
+        name = parts[0] if len(parts) > 0 else None
+        
+        # Skip if it's not a real business name
+        if not name or len(name) < 3:
+            return None
+        
+        # Extract rating from aria-label
+        rating = None
+        if len(parts) > 1:
+            rating_match = re.search(r'(\d+\.?\d*)', parts[1])
+            if rating_match:
                 try:
-                    phone_elem = await page.wait_for_selector(selector, timeout=2000)
-                    if phone_elem:
-                        # Try getting from href first (tel: links)
-                        href = await phone_elem.get_attribute('href')
-                        if href and href.startswith('tel:'):
-                            phone = href.replace('tel:', '').strip()
-                            return self._clean_phone(phone)
-                        
-                        # Otherwise get text
-                        text = await phone_elem.inner_text()
-                        phone_match = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
-                        if phone_match:
-                            return self._clean_phone(phone_match.group(0))
+                    rating = float(rating_match.group(1))
                 except:
-                    continue
-        except:
-            pass
+                    pass
         
-        return None
+        # Extract address (usually last part)
+        address = None
+        for part in reversed(parts):
+            if re.search(r'\d+|Toronto|Street|Avenue|Road|Drive|Boulevard|ON', part, re.IGNORECASE):
+                address = part
+                break
+        
+        return {'name': name, 'rating': rating, 'address': address}
     
-    async def _get_website_from_details(self, page) -> Optional[str]:
-        """Extract website from details panel."""
-        try:
-            website_selectors = [
-                'a[data-item-id="authority"]',
-                'a[aria-label*="Website"]',
-                'button[data-item-id*="authority"]'
-            ]
+    async def _extract_business_from_maps(self, page, link_element, aria_label: Optional[str], index: int) -> Optional[Business]:
+        """Extract business info by clicking the Maps listing."""
+        with span("extract_business", index=index, mode="click") as extract:
+            try:
+                # The aria-label contains: "BusinessName · Rating · Category · Address"
+                listing = self._parse_listing_label(aria_label)
+                if not listing:
+                    extract.outcome = "empty"
+                    return None
+                
+                # Click to get more details (phone, website)
+                await link_element.click()
+                
+                business = await self._read_details_panel(page, listing, index)
+                extract.set(name=business.name)
+                return business
+                
+            except Exception as e:
+                extract.fail(e)
+                return None
+    
+    async def _extract_business_from_place_page(self, tab, href: str, aria_label: Optional[str], index: int) -> Optional[Business]:
+        """Extract business info by opening the listing's place URL in its own tab."""
+        with span("extract_business", index=index, mode="tab") as extract:
+            try:
+                listing = self._parse_listing_label(aria_label)
+                if not listing:
+                    extract.outcome = "empty"
+                    return None
+                
+                with span("goto", url=href):
+                    await tab.goto(href, wait_until='domcontentloaded', timeout=clamp_timeout_ms(20000))
+                
+                business = await self._read_details_panel(tab, listing, index)
+                extract.set(name=business.name)
+                return business
+                
+            except Exception as e:
+                extract.fail(e)
+                return None
+    
+    async def _read_details_panel(self, page, listing: dict, index: int) -> Business:
+        """Read phone, website and reviews from an open details panel."""
+        # Make sure we are not reading the previously opened panel, then let
+        # all fields race the same "panel settled" signal instead of sleeping
+        with span("detail_wait", index=index) as wait:
+            await self.wait_engine.wait_for_panel(page, listing['name'])
+            settled = self.wait_engine.settle(page, label=listing['name'])
+            try:
+                complete = await self.wait_engine.wait_until(
+                    page, DETAILS_COMPLETE_SCRIPT, DETAIL_FIELDS, settled
+                )
+            finally:
+                settled.cancel()
+            wait.set(complete=complete)
+        
+        # Read every field's candidates in one round trip, parse in Python
+        with span("detail_read", index=index):
+            details = await page.evaluate(DETAILS_SCRIPT, DETAIL_FIELDS)
+        phone = self._parse_phone(details['phone'])
+        website = self._parse_website(details['website'])
+        reviews_count = self._parse_reviews_count(details['reviews'])
+        record_detail_fields({
+            'phone': phone is not None,
+            'website': website is not None,
+            'reviews': reviews_count is not None,
+        })
+        
+        # Create business object
+        business = Business(
+            name=listing['name'],
+            phone=phone,
+            address=listing['address'],
+            website=website,
+            rating=listing['rating'],
+            reviews_count=reviews_count
+        )
+        
+        return business
+    
+    def _parse_phone(self, candidates: List[Optional[dict]]) -> Optional[str]:
+        """Pick the phone from the details panel candidates."""
+        for elem in candidates:
+            if not elem:
+                continue
             
-            for selector in website_selectors:
-                try:
-                    website_elem = await page.wait_for_selector(selector, timeout=2000)
-                    if website_elem:
-                        href = await website_elem.get_attribute('href')
-                        if href and 'http' in href and 'google.com/maps' not in href:
-                            return href
-                except:
-                    continue
-        except:
-            pass
+            # Try getting from href first (tel: links)
+            href = elem.get('href')
+            if href and href.startswith('tel:'):
+                phone = href.replace('tel:', '').strip()
+                return self._clean_phone(phone)
+            
+            # Otherwise get text
+            phone_match = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', elem.get('text') or '')
+            if phone_match:
+                return self._clean_phone(phone_match.group(0))
         
         return None
     
-    async def _get_reviews_count(self, page) -> Optional[int]:
-        """Extract number of reviews."""
-        try:
-            # Look for text like "(123 reviews)" or "123 reviews"
-            reviews_selectors = [
-                'button[aria-label*="reviews"]',
-                'span[aria-label*="reviews"]'
-            ]
+    def _parse_website(self, candidates: List[Optional[dict]]) -> Optional[str]:
+        """Pick the website from the details panel candidates."""
+        for elem in candidates:
+            href = elem.get('href') if elem else None
+            if href and 'http' in href and 'google.com/maps' not in href:
+                return href
+        
+        return None
+    
+    def _parse_reviews_count(self, candidates: List[Optional[dict]]) -> Optional[int]:
+        """Parse the number of reviews from text like "(123 reviews)"."""
+        for elem in candidates:
+            if not elem:
+                continue
             
-            for selector in reviews_selectors:
-                try:
-                    elem = await page.wait_for_selector(selector, timeout=2000)
-                    if elem:
-                        text = await elem.get_attribute('aria-label')
-                        if not text:
-                            text = await elem.inner_text()
-                        
-                        reviews_match = re.search(r'([\d,]+)\s*reviews?', text, re.IGNORECASE)
-                        if reviews_match:
-                            return int(reviews_match.group(1).replace(',', ''))
-                except:
-                    continue
-        except:
-            pass
+            text = elem.get('label') or elem.get('text') or ''
+            reviews_match = re.search(r'([\d,]+)\s*reviews?', text, re.IGNORECASE)
+            if reviews_match:
+                return int(reviews_match.group(1).replace(',', ''))
         
         return None
     
-    async def _scroll_feed(self, page, target_results: int):
-        """Scroll the results feed to load more businesses."""
+    async def _scroll_feed(self, page, target_results: int) -> ScrollReport:
+        """Scroll the results feed until it holds target_results listings or runs out."""
         try:
-            feed = await page.query_selector('div[role="feed"]')
-            if feed:
-                # Scroll 3-5 times depending on how many results we want
-                scroll_times = min(5, (target_results // 5) + 1)
-                
-                for i in range(scroll_times):
-                    await feed.evaluate('el => el.scrollBy(0, 1000)')
-                    await asyncio.sleep(1)
-        except:
-            pass
+            return await self.feed_scroller.load(page, target_results)
+        except Exception as e:
+            logger.warning("Feed scrolling failed", extra={"fields": {"error": str(e)}})
+            return ScrollReport(target_results)
     
     async def _scrape_google_web(self, page, query: str, max_results: int) -> List[Business]:
         """Fallback: scrape regular Google search."""
         businesses = []
         
-        try:
-            url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            await page.goto(url, timeout=15000)
-            await asyncio.sleep(2)
-            
-            # Get all text content
-            body_text = await page.inner_text('body')
-            
-            # Split by lines and look for business-like entries
-            lines = body_text.split('\n')
-            
-            for line in lines:
-                # Must have a phone number to be considered a business
-                phone_match = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', line)
+        with span("web_fallback", logging.INFO, query=query) as fallback:
+            try:
+                url = f"{self.base_url}/search?q={query.replace(' ', '+')}"
+                await page.goto(url, timeout=clamp_timeout_ms(15000))
+                await self.wait_engine.wait_for_settled(page, 'body')
+                await self._raise_if_throttled(page)
                 
-                if phone_match and 10 < len(line) < 200:
-                    name = line.split('·')[0].split('(')[0].strip()[:100]
-                    phone = self._clean_phone(phone_match.group(0))
-                    
-                    rating_match = re.search(r'(\d+\.?\d*)\s*★', line)
-                    rating = float(rating_match.group(1)) if rating_match else None
+                # Get all text content
+                body_text = await page.inner_text('body')
+                
+                # Split by lines and look for business-like entries
+                lines = body_text.split('\n')
+                
+                for line in lines:
+                    # Must have a phone number to be considered a business
+                    phone_match = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', line)
                     
-                    if name and phone:
-                        businesses.append(Business(
-                            name=name,
-                            phone=phone,
-                            rating=rating
-                        ))
+                    if phone_match and 10 < len(line) < 200:
+                        name = line.split('·')[0].split('(')[0].strip()[:100]
+                        phone = self._clean_phone(phone_match.group(0))
                         
-                        if len(businesses) >= max_results:
-                            break
-            
-            print(f"✓ Extracted {len(businesses)} businesses from web search")
-            
-        except Exception as e:
-            print(f"Web search failed: {e}")
+                        rating_match = re.search(r'(\d+\.?\d*)\s*★', line)
+                        rating = float(rating_match.group(1)) if rating_match else None
+                        
+                        if name and phone:
+                            businesses.append(Business(
+                                name=name,
+                                phone=phone,
+                                rating=rating
+                            ))
+                            
+                            if len(businesses) >= max_results:
+                                break
+                
+                fallback.set(results=len(businesses))
+                
+            except ThrottledError:
+                raise
+            except Exception as e:
+                fallback.fail(e)
         
         return businesses
     
     def _clean_phone(self, phone: str) -> str:
         """Format phone number."""
-        if not phone:
-            return None
-        
-        digits = re.sub(r'\D', '', phone)
-        
-        if len(digits) == 10:
-            return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-        elif len(digits) == 11 and digits[0] == '1':
-            return f"({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
-        
-        return phone
+        return clean_phone(phone)
@@ -0,0 +1,222 @@
+"""
+Per-host rate limiting and throttling backoff for scrapes.
+Following Single Responsibility Principle - only paces requests to Google.
+
+Every scrape takes a token from its host's bucket first. When Google starts
+pushing back (consent or CAPTCHA pages, or a run of empty results) the host
+is paused with exponential backoff, and the pause applies to every search
+waiting on it.
+"""
+from typing import AsyncIterator, Dict, Optional
+import asyncio
+import logging
+import os
+import random
+import re
+import time
+from app.models import SearchCriteria, Business
+from app.services.interfaces import IBusinessSearchService
+from app.services.deadline import time_left_s, mark_partial, is_partial
+
+
+GOOGLE_RATE_PER_MIN = float(os.getenv("GOOGLE_RATE_PER_MIN", "30"))
+GOOGLE_RATE_BURST = int(os.getenv("GOOGLE_RATE_BURST", "5"))
+THROTTLE_BACKOFF_S = float(os.getenv("THROTTLE_BACKOFF_S", "30"))
+THROTTLE_BACKOFF_MAX_S = float(os.getenv("THROTTLE_BACKOFF_MAX_S", "600"))
+# Consecutive empty searches on a host before treating it as throttled
+THROTTLE_EMPTY_STREAK = int(os.getenv("THROTTLE_EMPTY_STREAK", "3"))
+
+# Where Google sends clients it wants to slow down or verify
+THROTTLE_URL_PATTERN = re.compile(r'consent\.google\.|/sorry/|/recaptcha/')
+
+logger = logging.getLogger(__name__)
+
+
+class ThrottledError(Exception):
+    """Raised when Google answered with a consent, CAPTCHA or rate-limit page."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Throttled by Google ({reason})")
+        self.reason = reason
+
+
+class TokenBucket:
+    """Classic token bucket: `rate_per_s` refill, up to `capacity` tokens."""
+
+    def __init__(self, rate_per_s: float, capacity: int):
+        self.rate_per_s = rate_per_s
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_s)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate_per_s
+
+    def take(self):
+        self.tokens -= 1
+
+
+class _HostState:
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.lock = asyncio.Lock()
+        self.blocked_until = 0.0
+        self.strikes = 0
+        self.empty_streak = 0
+        self.granted = 0
+        self.throttled = 0
+
+
+class HostRateLimiter:
+    """Token bucket plus throttling backoff, per host."""
+
+    def __init__(
+        self,
+        rate_per_min: float = GOOGLE_RATE_PER_MIN,
+        burst: int = GOOGLE_RATE_BURST,
+        backoff_s: float = THROTTLE_BACKOFF_S,
+        backoff_max_s: float = THROTTLE_BACKOFF_MAX_S,
+        empty_streak: int = THROTTLE_EMPTY_STREAK,
+    ):
+        self.rate_per_min = rate_per_min
+        self.burst = burst
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.empty_streak = empty_streak
+        self._hosts: Dict[str, _HostState] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_min > 0
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(TokenBucket(self.rate_per_min / 60, max(1, self.burst)))
+            self._hosts[host] = state
+        return state
+
+    async def acquire(self, host: str):
+        """
+        Wait for the host's backoff to expire and for a token, in arrival order.
+        With the rate set to 0 only the backoff applies.
+        """
+        state = self._state(host)
+        async with state.lock:
+            while True:
+                now = time.monotonic()
+                token_wait = state.bucket.delay(now) if self.enabled else 0.0
+                wait = max(state.blocked_until - now, token_wait)
+                if wait <= 0:
+                    state.bucket.take()
+                    state.granted += 1
+                    return
+                await asyncio.sleep(wait)
+
+    def penalize(self, host: str, reason: str):
+        """Pause the host, doubling the pause on each strike in a row."""
+        state = self._state(host)
+        state.strikes += 1
+        state.throttled += 1
+        backoff = min(self.backoff_max_s, self.backoff_s * 2 ** (state.strikes - 1))
+        # Jitter so waiting searches do not all resume in the same instant
+        backoff *= random.uniform(0.8, 1.2)
+        state.blocked_until = max(state.blocked_until, time.monotonic() + backoff)
+        logger.warning(
+            "Host throttled, backing off",
+            extra={"fields": {"host": host, "reason": reason, "strikes": state.strikes, "backoff_s": round(backoff, 1)}}
+        )
+
+    def record_result(self, host: str, empty: bool):
+        """A scrape finished; a long enough run of empty results counts as a strike."""
+        state = self._state(host)
+        if not empty:
+            state.strikes = 0
+            state.empty_streak = 0
+            return
+        state.empty_streak += 1
+        if self.empty_streak and state.empty_streak >= self.empty_streak:
+            state.empty_streak = 0
+            self.penalize(host, f"{self.empty_streak} empty results in a row")
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "rate_per_min": self.rate_per_min,
+            "burst": self.burst,
+            "hosts": {
+                host: {
+                    "tokens": round(min(state.bucket.capacity, state.bucket.tokens), 2),
+                    "granted": state.granted,
+                    "throttled": state.throttled,
+                    "strikes": state.strikes,
+                    "blocked_for_s": round(max(0.0, state.blocked_until - now), 1),
+                }
+                for host, state in self._hosts.items()
+            },
+        }
+
+
+def is_empty_result(businesses: list[Business], placeholder_name: Optional[str] = None) -> bool:
+    return not businesses or (
+        placeholder_name is not None and len(businesses) == 1 and businesses[0].name == placeholder_name
+    )
+
+
+class RateLimitedSearchService(IBusinessSearchService):
+    """Decorates a scraper so each scrape waits for a token and feeds throttling backoff."""
+
+    def __init__(
+        self,
+        inner: IBusinessSearchService,
+        limiter: HostRateLimiter,
+        host: str,
+        placeholder_name: Optional[str] = None,
+    ):
+        self.inner = inner
+        self.limiter = limiter
+        self.host = host
+        self.placeholder_name = placeholder_name
+
+    async def _acquire(self) -> bool:
+        """Wait for a token; False if the search's deadline passed first."""
+        try:
+            await asyncio.wait_for(self.limiter.acquire(self.host), time_left_s())
+            return True
+        except asyncio.TimeoutError:
+            mark_partial()
+            return False
+
+    def _record(self, businesses: list[Business]):
+        # A search that ran out of time says nothing about throttling
+        if not is_partial():
+            self.limiter.record_result(self.host, is_empty_result(businesses, self.placeholder_name))
+
+    async def search_businesses(self, criteria: SearchCriteria) -> list[Business]:
+        if not await self._acquire():
+            return []
+        try:
+            businesses = await self.inner.search_businesses(criteria)
+        except ThrottledError as e:
+            self.limiter.penalize(self.host, e.reason)
+            raise
+        self._record(businesses)
+        return businesses
+
+    async def stream_businesses(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        if not await self._acquire():
+            return
+        businesses = []
+        try:
+            async for business in self.inner.stream_businesses(criteria):
+                businesses.append(business)
+                yield business
+        except ThrottledError as e:
+            self.limiter.penalize(self.host, e.reason)
+            raise
+        self._record(businesses)
@@ -0,0 +1,159 @@
+"""
+Request routing for Playwright browser contexts.
+Following Single Responsibility Principle - only decides which requests a page may make.
+
+Reading aria-labels and detail buttons needs none of the map tiles, images,
+fonts or analytics that Maps loads, so a routing policy aborts those before
+they hit the network and counts what was saved. Requests that get
+through can be answered by a ResponseCache instead of the network.
+"""
+from typing import Iterable, Optional
+import re
+import os
+from app.services.response_cache import ResponseCache
+
+
+ROUTING_POLICY = os.getenv("ROUTING_POLICY", "lean")
+
+# Rough transfer sizes used to estimate bytes saved by aborted requests
+ESTIMATED_BYTES = {
+    'image': 25_000,
+    'media': 250_000,
+    'font': 45_000,
+    'stylesheet': 30_000,
+    'script': 60_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+    'ping': 500,
+}
+DEFAULT_ESTIMATED_BYTES = 2_000
+
+MAP_TILE_PATTERNS = [
+    r'/maps/vt[/?]',
+    r'/kh/v=',
+    r'khms\d*\.google',
+    r'streetviewpixels',
+    r'/maps/preview/pwa/',
+]
+
+TELEMETRY_PATTERNS = [
+    r'/gen_204',
+    r'/log\?',
+    r'/maps/preview/log',
+    r'google-analytics\.com',
+    r'googletagmanager\.com',
+    r'doubleclick\.net',
+    r'/csp/report',
+]
+
+# Never block these: consent and CAPTCHA pages must render to be detected
+ALWAYS_ALLOWED_PATTERNS = [
+    r'consent\.google\.com',
+    r'/recaptcha/',
+    r'/sorry/',
+]
+
+
+class RoutingPolicy:
+    """Which resource types and URL patterns to abort, with an allow-list override."""
+
+    def __init__(
+        self,
+        name: str,
+        blocked_resource_types: Iterable[str] = (),
+        blocked_url_patterns: Iterable[str] = (),
+        allowed_url_patterns: Iterable[str] = (),
+    ):
+        self.name = name
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self._blocked = self._compile(blocked_url_patterns)
+        self._allowed = self._compile(allowed_url_patterns)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.blocked_resource_types or self._blocked)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if self._allowed and self._allowed.search(url):
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        return bool(self._blocked and self._blocked.search(url))
+
+    def _compile(self, patterns: Iterable[str]) -> Optional[re.Pattern]:
+        patterns = list(patterns)
+        return re.compile('|'.join(f'(?:{p})' for p in patterns)) if patterns else None
+
+
+POLICIES = {
+    "off": RoutingPolicy("off"),
+    "lean": RoutingPolicy(
+        "lean",
+        blocked_resource_types={'image', 'media', 'font'},
+        blocked_url_patterns=MAP_TILE_PATTERNS + TELEMETRY_PATTERNS,
+        allowed_url_patterns=ALWAYS_ALLOWED_PATTERNS,
+    ),
+    # Also drops stylesheets; the feed may stop lazy-loading on some layouts
+    "strict": RoutingPolicy(
+        "strict",
+        blocked_resource_types={'image', 'media', 'font', 'stylesheet', 'manifest', 'texttrack', 'eventsource'},
+        blocked_url_patterns=MAP_TILE_PATTERNS + TELEMETRY_PATTERNS,
+        allowed_url_patterns=ALWAYS_ALLOWED_PATTERNS,
+    ),
+}
+
+
+def get_routing_policy(name: str = ROUTING_POLICY) -> RoutingPolicy:
+    """Routing policy by name ("off", "lean" or "strict")."""
+    policy = POLICIES.get(name)
+    if policy is None:
+        raise ValueError(f"Unknown routing policy '{name}', expected one of {sorted(POLICIES)}")
+    return policy
+
+
+class RequestRouter:
+    """Applies a RoutingPolicy to one browser context and counts what it saved."""
+
+    def __init__(self, policy: RoutingPolicy, response_cache: Optional[ResponseCache] = None):
+        self.policy = policy
+        self.response_cache = response_cache if response_cache and response_cache.enabled else None
+        self.reset()
+
+    async def attach(self, context):
+        """Route every request of the context through this router."""
+        if self.policy.enabled or self.response_cache:
+            await context.route("**/*", self._handle)
+
+    def reset(self, session: Optional[str] = None):
+        """Start counting for a new search; `session` names its recording."""
+        self.allowed_requests = 0
+        self.blocked_requests = 0
+        self.blocked_by_type: dict[str, int] = {}
+        self.estimated_bytes_saved = 0
+        self.cache_outcomes: dict[str, int] = {}
+        self.session = self.response_cache.session(session) if self.response_cache else None
+
+    def snapshot(self) -> dict:
+        return {
+            "policy": self.policy.name,
+            "allowed_requests": self.allowed_requests,
+            "blocked_requests": self.blocked_requests,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "cache_outcomes": dict(self.cache_outcomes),
+        }
+
+    async def _handle(self, route, request):
+        resource_type = request.resource_type
+        if self.policy.should_block(request.url, resource_type):
+            self.blocked_requests += 1
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+            self.estimated_bytes_saved += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+            await route.abort('blockedbyclient')
+        elif self.response_cache:
+            self.allowed_requests += 1
+            outcome = await self.response_cache.handle(route, request, self.session)
+            self.cache_outcomes[outcome] = self.cache_outcomes.get(outcome, 0) + 1
+        else:
+            self.allowed_requests += 1
+            await route.continue_()
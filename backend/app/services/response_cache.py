@@ -0,0 +1,392 @@
+"""
+Disk-backed response cache and record/replay for browser contexts.
+Following Single Responsibility Principle - only stores and serves HTTP responses the browser asks for.
+
+Sits under the request router of every pooled context. Response bodies are
+stored once by content hash, so identical JS bundles or XHR payloads served
+under different URLs take up space once. A SQLite index maps requests to
+bodies. Modes (RESPONSE_CACHE_MODE):
+
+- "cache": serve fresh copies of cacheable resources from disk. Freshness is
+  a TTL per resource class (static assets, XHR, documents), not the
+  response's own cache headers. The cache is capped at
+  RESPONSE_CACHE_MAX_BYTES; the least recently used bodies go first.
+- "record": fetch everything from the network and save each search's
+  traffic as a recording, keyed by the search and request order.
+- "replay": answer every request from the search's recording and fail
+  anything that was not recorded, so runs are deterministic and offline.
+"""
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from app.models import SearchCriteria
+from app.services.search_cache import search_cache_key
+
+
+# off | cache | record | replay
+RESPONSE_CACHE_MODE = os.getenv("RESPONSE_CACHE_MODE", "off")
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", "response_cache")
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# Freshness per resource class in cache mode; 0 never caches the class
+RESPONSE_CACHE_TTLS = {
+    "static": float(os.getenv("RESPONSE_CACHE_TTL_STATIC_S", str(7 * 24 * 3600))),
+    "xhr": float(os.getenv("RESPONSE_CACHE_TTL_XHR_S", "600")),
+    "document": float(os.getenv("RESPONSE_CACHE_TTL_DOCUMENT_S", "0")),
+}
+# Recording to save to or replay from; each search is a session within it
+RESPONSE_CACHE_RECORDING = os.getenv("RESPONSE_CACHE_RECORDING", "default")
+
+MODES = ("off", "cache", "record", "replay")
+
+_RESOURCE_CLASSES = {
+    "script": "static",
+    "stylesheet": "static",
+    "font": "static",
+    "image": "static",
+    "media": "static",
+    "manifest": "static",
+    "xhr": "xhr",
+    "fetch": "xhr",
+    "document": "document",
+}
+
+# Query parameters that change on every load without changing the response
+_VOLATILE_PARAMS = {"zx", "ei", "psi", "_", "rlz"}
+# Recomputed or meaningless once the body is stored decoded
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+# Consent, CAPTCHA and rate-limit pages must never be served from the cache
+_UNCACHEABLE_URL = re.compile(r'consent\.google\.|/sorry/|/recaptcha/')
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(method: str, url: str, post_data: Optional[bytes] = None) -> str:
+    """Identity of a request: method, URL without volatile parameters, and body."""
+    parts = urlsplit(url)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in _VOLATILE_PARAMS])
+    digest = hashlib.sha256(f"{method} {urlunsplit(parts._replace(query=query, fragment=''))}".encode())
+    if post_data:
+        digest.update(b"\0" + post_data)
+    return digest.hexdigest()
+
+
+def resource_class(resource_type: str) -> str:
+    return _RESOURCE_CLASSES.get(resource_type, "other")
+
+
+def recording_session(strategy: str, criteria: SearchCriteria) -> str:
+    """The session a search's traffic is recorded under."""
+    return f"{strategy}|{search_cache_key(criteria)}|{criteria.max_results}"
+
+
+class RecordingSession:
+    """One search's place in a recording: how often each request has been seen so far."""
+
+    def __init__(self, recording: str, session: str):
+        self.recording = recording
+        self.session = session
+        self.cleared = False
+        self._seen: Dict[str, int] = {}
+        self.lock = asyncio.Lock()
+
+    def next_sequence(self, key: str) -> int:
+        """0 for the first time a request is made in this search, 1 for the second..."""
+        sequence = self._seen.get(key, 0)
+        self._seen[key] = sequence + 1
+        return sequence
+
+
+class _StoredResponse:
+    def __init__(self, status: int, headers: dict, body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class ResponseCache:
+    """Content-addressed response bodies on disk, indexed in SQLite."""
+
+    def __init__(
+        self,
+        directory: str = RESPONSE_CACHE_DIR,
+        mode: str = RESPONSE_CACHE_MODE,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        ttls: Optional[Dict[str, float]] = None,
+        recording: str = RESPONSE_CACHE_RECORDING,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown response cache mode '{mode}', expected one of {list(MODES)}")
+        self.directory = directory
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.ttls = ttls if ttls is not None else dict(RESPONSE_CACHE_TTLS)
+        self.recording = recording
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.replayed = 0
+        self.replay_misses = 0
+        self.bytes_served = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.join(directory, "blobs"), exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        self._lock = asyncio.Lock()
+        # WAL lets worker processes share the cache
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            " sha TEXT PRIMARY KEY, size INTEGER NOT NULL, last_used REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_blobs_last_used ON blobs (last_used);"
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, url TEXT NOT NULL, resource_class TEXT NOT NULL,"
+            " status INTEGER NOT NULL, headers TEXT NOT NULL, sha TEXT NOT NULL, expires_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_entries_sha ON entries (sha);"
+            "CREATE TABLE IF NOT EXISTS recordings ("
+            " recording TEXT NOT NULL, session TEXT NOT NULL, key TEXT NOT NULL, sequence INTEGER NOT NULL,"
+            " url TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL, sha TEXT NOT NULL,"
+            " PRIMARY KEY (recording, session, key, sequence));"
+            "CREATE INDEX IF NOT EXISTS idx_recordings_sha ON recordings (sha);"
+        )
+        self._conn.commit()
+        self._cache_bytes = self._unpinned_bytes()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def session(self, session: Optional[str]) -> Optional[RecordingSession]:
+        """Bookkeeping for one search in record and replay modes."""
+        if self.mode not in ("record", "replay"):
+            return None
+        return RecordingSession(self.recording, session or "default")
+
+    async def handle(self, route, request, session: Optional[RecordingSession]) -> str:
+        """Answer a routed request from disk or the network; returns what happened."""
+        if self.mode == "cache":
+            return await self._handle_cache(route, request)
+        if self.mode == "record":
+            return await self._handle_record(route, request, session)
+        if self.mode == "replay":
+            return await self._handle_replay(route, request, session)
+        await route.continue_()
+        return "passed"
+
+    async def _handle_cache(self, route, request) -> str:
+        ttl = self.ttls.get(resource_class(request.resource_type), 0)
+        if request.method != "GET" or ttl <= 0 or _UNCACHEABLE_URL.search(request.url):
+            await route.continue_()
+            return "passed"
+
+        key = request_key(request.method, request.url)
+        async with self._lock:
+            stored = await asyncio.to_thread(self._lookup, key)
+        if stored is not None:
+            self.hits += 1
+            self.bytes_served += len(stored.body)
+            await route.fulfill(status=stored.status, headers=stored.headers, body=stored.body)
+            return "hit"
+
+        self.misses += 1
+        response = await self._fetch(route)
+        if response is None:
+            return "failed"
+        status, headers, body = response
+        if status == 200:
+            async with self._lock:
+                await asyncio.to_thread(
+                    self._store, key, request.url, resource_class(request.resource_type), status, headers, body, ttl
+                )
+            self.stored += 1
+        return "stored"
+
+    async def _handle_record(self, route, request, session: Optional[RecordingSession]) -> str:
+        response = await self._fetch(route)
+        if response is None or session is None:
+            return "failed"
+        status, headers, body = response
+        key = request_key(request.method, request.url, request.post_data_buffer)
+        sequence = session.next_sequence(key)
+        async with session.lock:
+            # Recording a session again replaces what it had
+            if not session.cleared:
+                async with self._lock:
+                    await asyncio.to_thread(self._clear_session, session)
+                session.cleared = True
+        async with self._lock:
+            await asyncio.to_thread(self._record, session, key, sequence, request.url, status, headers, body)
+        self.stored += 1
+        return "recorded"
+
+    async def _handle_replay(self, route, request, session: Optional[RecordingSession]) -> str:
+        key = request_key(request.method, request.url, request.post_data_buffer)
+        stored = None
+        if session is not None:
+            sequence = session.next_sequence(key)
+            async with self._lock:
+                stored = await asyncio.to_thread(self._replay, session, key, sequence)
+        if stored is None:
+            self.replay_misses += 1
+            await route.abort('internetdisconnected')
+            return "replay_miss"
+        self.replayed += 1
+        self.bytes_served += len(stored.body)
+        await route.fulfill(status=stored.status, headers=stored.headers, body=stored.body)
+        return "replayed"
+
+    async def _fetch(self, route) -> Optional[tuple[int, dict, bytes]]:
+        """Fetch from the network and answer the page; None if the fetch failed."""
+        try:
+            # Redirects go back to the browser, which requests the target through the router
+            response = await route.fetch(max_redirects=0)
+            body = await response.body()
+        except Exception:
+            await route.abort('failed')
+            return None
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS}
+        await route.fulfill(status=response.status, headers=headers, body=body)
+        return response.status, headers, body
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.directory, "blobs", sha[:2], sha)
+
+    def _read_blob(self, sha: str) -> Optional[bytes]:
+        try:
+            with open(self._blob_path(sha), "rb") as blob:
+                return blob.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_blob(self, body: bytes) -> str:
+        """Store a body under its hash (once); returns the hash."""
+        sha = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(sha)
+        exists = self._conn.execute("SELECT 1 FROM blobs WHERE sha = ?", (sha,)).fetchone()
+        if not exists or not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so another process never reads half a body
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as blob:
+                blob.write(body)
+            os.replace(temporary, path)
+            if not exists:
+                self._cache_bytes += len(body)
+        self._conn.execute(
+            "INSERT INTO blobs (sha, size, last_used) VALUES (?, ?, ?)"
+            " ON CONFLICT (sha) DO UPDATE SET last_used = excluded.last_used",
+            (sha, len(body), time.time())
+        )
+        return sha
+
+    def _lookup(self, key: str) -> Optional[_StoredResponse]:
+        row = self._conn.execute(
+            "SELECT status, headers, sha FROM entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        body = self._read_blob(row[2])
+        if body is None:
+            return None
+        self._conn.execute("UPDATE blobs SET last_used = ? WHERE sha = ?", (time.time(), row[2]))
+        self._conn.commit()
+        return _StoredResponse(row[0], json.loads(row[1]), body)
+
+    def _store(self, key: str, url: str, klass: str, status: int, headers: dict, body: bytes, ttl: float):
+        if len(body) > self.max_bytes:
+            return
+        with self._conn:
+            sha = self._write_blob(body)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, resource_class, status, headers, sha, expires_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, klass, status, json.dumps(headers), sha, time.time() + ttl)
+            )
+        if self._cache_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used bodies, and the entries pointing at them, until under the cap."""
+        # Other processes write too; start from the real total
+        self._cache_bytes = self._unpinned_bytes()
+        with self._conn:
+            while self._cache_bytes > self.max_bytes:
+                oldest = self._conn.execute(
+                    "SELECT sha, size FROM blobs WHERE sha NOT IN (SELECT sha FROM recordings)"
+                    " ORDER BY last_used LIMIT 1"
+                ).fetchone()
+                if oldest is None:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE sha = ?", (oldest[0],))
+                self._conn.execute("DELETE FROM blobs WHERE sha = ?", (oldest[0],))
+                try:
+                    os.remove(self._blob_path(oldest[0]))
+                except FileNotFoundError:
+                    pass
+                self._cache_bytes -= oldest[1]
+                self.evictions += 1
+
+    def _unpinned_bytes(self) -> int:
+        """Size of the bodies the cache owns; recorded ones are kept whatever the cap."""
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs WHERE sha NOT IN (SELECT sha FROM recordings)"
+        ).fetchone()[0]
+
+    def _clear_session(self, session: RecordingSession):
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM recordings WHERE recording = ? AND session = ?", (session.recording, session.session)
+            )
+
+    def _record(
+        self, session: RecordingSession, key: str, sequence: int, url: str, status: int, headers: dict, body: bytes
+    ):
+        with self._conn:
+            sha = self._write_blob(body)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recordings"
+                " (recording, session, key, sequence, url, status, headers, sha) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (session.recording, session.session, key, sequence, url, status, json.dumps(headers), sha)
+            )
+
+    def _replay(self, session: RecordingSession, key: str, sequence: int) -> Optional[_StoredResponse]:
+        # Asked more often than during recording: keep answering with the last response
+        row = self._conn.execute(
+            "SELECT status, headers, sha FROM recordings"
+            " WHERE recording = ? AND session = ? AND key = ? AND sequence <= ?"
+            " ORDER BY sequence DESC LIMIT 1",
+            (session.recording, session.session, key, sequence)
+        ).fetchone()
+        if row is None:
+            return None
+        body = self._read_blob(row[2])
+        return _StoredResponse(row[0], json.loads(row[1]), body) if body is not None else None
+
+    def stats(self) -> dict:
+        entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        sessions = self._conn.execute(
+            "SELECT COUNT(DISTINCT session) FROM recordings WHERE recording = ?", (self.recording,)
+        ).fetchone()[0]
+        return {
+            "mode": self.mode,
+            "directory": self.directory,
+            "entries": entries,
+            "bytes": self._cache_bytes,
+            "max_bytes": self.max_bytes,
+            "ttls": self.ttls,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stored": self.stored,
+            "evictions": self.evictions,
+            "bytes_served": self.bytes_served,
+            "recording": self.recording,
+            "recorded_sessions": sessions,
+            "replayed": self.replayed,
+            "replay_misses": self.replay_misses,
+        }
@@ -0,0 +1,187 @@
+"""
+Server-side result sets of finished searches.
+Following Single Responsibility Principle - only keeps search results for paged, sorted and filtered reads.
+
+Each search's businesses are kept under a result-set ID for a while, so a
+client can read them a page at a time in any order or filter without the
+whole list being sent again, and without a new scrape. Sorted and filtered
+views are computed once per combination and reused by later pages.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional
+import base64
+import json
+import os
+import time
+import uuid
+from app.models import (
+    Business, SearchCriteria, ResultSetQuery, ResultSetSort, SortOrder, ResultPage, ResultSetRow
+)
+
+
+RESULT_SET_TTL_S = float(os.getenv("RESULT_SET_TTL_S", "3600"))
+RESULT_SET_MAX = int(os.getenv("RESULT_SET_MAX", "1000"))
+
+
+class InvalidCursorError(ValueError):
+    """Raised for a cursor that is malformed or belongs to a different view."""
+
+
+class ResultSet:
+    """The businesses of one search, in the order the search returned them."""
+
+    def __init__(self, query: str, criteria: Optional[SearchCriteria] = None):
+        self.id = uuid.uuid4().hex
+        self.query = query
+        self.criteria = criteria
+        self.businesses: list[Business] = []
+        self.complete = False
+        self.partial = False
+        self.created_at = time.time()
+        self._views: Dict[tuple, list[int]] = {}
+
+    def add(self, business: Business) -> int:
+        self.businesses.append(business)
+        self._views.clear()
+        return len(self.businesses) - 1
+
+    def update(self, index: int, business: Business):
+        """Replace a business, e.g. once its website has been enriched."""
+        self.businesses[index] = business
+        self._views.clear()
+
+    def finish(self, partial: bool = False):
+        self.complete = True
+        self.partial = partial
+
+    def view(self, query: ResultSetQuery) -> list[int]:
+        """Indexes of the businesses matching the query's filters, in its sort order."""
+        key = _view_key(query)
+        if key not in self._views:
+            self._views[key] = self._build_view(query)
+        return self._views[key]
+
+    def _build_view(self, query: ResultSetQuery) -> list[int]:
+        matching = [index for index, business in enumerate(self.businesses) if _matches(business, query)]
+        if query.sort == ResultSetSort.RANK:
+            return matching[::-1] if query.order == SortOrder.DESC else matching
+
+        def value(index: int):
+            business_value = getattr(self.businesses[index], query.sort.value)
+            return business_value.casefold() if isinstance(business_value, str) else business_value
+
+        # Businesses without the value go last either way; ties keep the search's order
+        known = [index for index in matching if value(index) is not None]
+        unknown = [index for index in matching if value(index) is None]
+        known.sort(key=value, reverse=query.order == SortOrder.DESC)
+        return known + unknown
+
+
+def _matches(business: Business, query: ResultSetQuery) -> bool:
+    if query.min_rating is not None and (business.rating or 0) < query.min_rating:
+        return False
+    if query.min_reviews is not None and (business.reviews_count or 0) < query.min_reviews:
+        return False
+    for wanted, present in (
+        (query.has_phone, business.phone),
+        (query.has_website, business.website),
+        (query.has_email, business.email),
+    ):
+        if wanted is not None and wanted != bool(present):
+            return False
+    return True
+
+
+def _view_key(query: ResultSetQuery) -> tuple:
+    return (
+        query.sort.value, query.order.value, query.min_rating, query.min_reviews,
+        query.has_phone, query.has_website, query.has_email
+    )
+
+
+def _encode_cursor(query: ResultSetQuery, offset: int) -> str:
+    payload = json.dumps({"view": list(_view_key(query)), "offset": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(query: ResultSetQuery, cursor: str) -> int:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        view, offset = payload["view"], int(payload["offset"])
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Malformed cursor")
+    if view != list(_view_key(query)) or offset < 0:
+        raise InvalidCursorError("Cursor belongs to a different sort or filter")
+    return offset
+
+
+class ResultSetStore:
+    """In-memory result sets, expiring RESULT_SET_TTL_S after their last read."""
+
+    def __init__(self, ttl_s: float = RESULT_SET_TTL_S, max_sets: int = RESULT_SET_MAX):
+        self.ttl_s = ttl_s
+        self.max_sets = max_sets
+        self._sets: OrderedDict[str, tuple[float, ResultSet]] = OrderedDict()
+
+    def create(
+        self,
+        query: str,
+        criteria: Optional[SearchCriteria] = None,
+        businesses: Optional[list[Business]] = None,
+        partial: Optional[bool] = None,
+    ) -> ResultSet:
+        """
+        A new result set; with `partial` given it is created complete,
+        otherwise businesses are added as the search streams them.
+        """
+        result_set = ResultSet(query, criteria)
+        for business in businesses or []:
+            result_set.add(business)
+        if partial is not None:
+            result_set.finish(partial)
+        self._sets[result_set.id] = (time.monotonic(), result_set)
+        # Least recently read go first
+        while len(self._sets) > self.max_sets:
+            self._sets.popitem(last=False)
+        return result_set
+
+    def get(self, result_set_id: str) -> Optional[ResultSet]:
+        entry = self._sets.get(result_set_id)
+        if entry is None:
+            return None
+        touched_at, result_set = entry
+        now = time.monotonic()
+        if now - touched_at > self.ttl_s:
+            del self._sets[result_set_id]
+            return None
+        self._sets[result_set_id] = (now, result_set)
+        self._sets.move_to_end(result_set_id)
+        return result_set
+
+    def page(self, result_set: ResultSet, query: ResultSetQuery) -> ResultPage:
+        """
+        One page of a view of the result set.
+
+        Raises:
+            InvalidCursorError: if query.cursor is not one this view handed out
+        """
+        view = result_set.view(query)
+        offset = _decode_cursor(query, query.cursor) if query.cursor else 0
+        end = offset + query.limit
+        return ResultPage(
+            result_set_id=result_set.id,
+            query=result_set.query,
+            total_results=len(result_set.businesses),
+            matching_results=len(view),
+            rows=[ResultSetRow(index=index, business=result_set.businesses[index]) for index in view[offset:end]],
+            next_cursor=_encode_cursor(query, end) if end < len(view) else None,
+            complete=result_set.complete,
+            partial=result_set.partial
+        )
+
+    def stats(self) -> dict:
+        return {
+            "result_sets": len(self._sets),
+            "businesses": sum(len(result_set.businesses) for _, result_set in self._sets.values()),
+            "ttl_s": self.ttl_s,
+        }
@@ -0,0 +1,263 @@
+"""
+Search result cache.
+Following Single Responsibility Principle - only remembers recent search results.
+Following Open/Closed Principle - storage is pluggable via ISearchCacheBackend.
+"""
+from collections import OrderedDict
+from typing import Optional, AsyncIterator
+import asyncio
+import logging
+import sqlite3
+import time
+import os
+from app.models import SearchCriteria, Business, CachedSearch
+from app.services.interfaces import IBusinessSearchService, ISearchCacheBackend
+from app.services.deadline import is_partial
+from app.services.geo_tiling import tiling_enabled
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_TTL_S = float(os.getenv("SEARCH_CACHE_TTL_S", "900"))
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def _fold(text: str) -> str:
+    """Case- and whitespace-fold a free-text criteria field."""
+    return ' '.join(text.split()).casefold()
+
+
+def search_cache_key(criteria: SearchCriteria) -> str:
+    """Cache key for criteria; max_results is left out so supersets can be shared."""
+    key = f"{_fold(criteria.industry)}|{_fold(criteria.location)}|{criteria.radius_km}"
+    # A tiled search covers the whole radius, so its results differ; resolve
+    # the GEO_TILING default the same way the scraper does
+    return f"{key}|tiled" if tiling_enabled(criteria.tiling) else key
+
+
+class InMemorySearchCacheBackend(ISearchCacheBackend):
+    """In-process LRU, bounded by the serialized size of its entries."""
+
+    def __init__(self, max_bytes: int = SEARCH_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple[CachedSearch, int]]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[CachedSearch]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        self._entries.move_to_end(key)
+        return item[0]
+
+    async def set(self, key: str, entry: CachedSearch) -> None:
+        size = len(entry.model_dump_json())
+        if size > self.max_bytes:
+            return
+        await self.delete(key)
+        self._entries[key] = (entry, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._bytes -= item[1]
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class SqliteSearchCacheBackend(ISearchCacheBackend):
+    """On-disk LRU in a SQLite file, shared across restarts and processes."""
+
+    def __init__(self, path: str, max_bytes: int = SEARCH_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = asyncio.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            " key TEXT PRIMARY KEY, payload TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_access ON search_cache (last_access)"
+        )
+        self._conn.commit()
+
+    async def get(self, key: str) -> Optional[CachedSearch]:
+        async with self._lock:
+            return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, entry: CachedSearch) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._set, key, entry.model_dump_json())
+
+    async def delete(self, key: str) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._delete, key)
+
+    def _get(self, key: str) -> Optional[CachedSearch]:
+        row = self._conn.execute(
+            "SELECT payload FROM search_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute(
+            "UPDATE search_cache SET last_access = ? WHERE key = ?", (time.time(), key)
+        )
+        self._conn.commit()
+        return CachedSearch.model_validate_json(row[0])
+
+    def _set(self, key: str, payload: str):
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO search_cache (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, payload, size, time.time())
+        )
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM search_cache").fetchone()[0]
+        while total > self.max_bytes:
+            oldest = self._conn.execute(
+                "SELECT key, size FROM search_cache ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            self._conn.execute("DELETE FROM search_cache WHERE key = ?", (oldest[0],))
+            total -= oldest[1]
+            self.evictions += 1
+        self._conn.commit()
+
+    def _delete(self, key: str):
+        self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+        self._conn.commit()
+
+    def stats(self) -> dict:
+        entries, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache"
+        ).fetchone()
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class SearchCache:
+    """TTL policy, superset lookups and hit/miss counters over a backend."""
+
+    def __init__(self, backend: ISearchCacheBackend, ttl_s: float = SEARCH_CACHE_TTL_S):
+        self.backend = backend
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_s > 0
+
+    async def lookup(self, criteria: SearchCriteria) -> Optional[list[Business]]:
+        """
+        Return cached businesses for criteria, or None on a miss.
+
+        An entry stored for a larger max_results also answers smaller
+        requests; so does one that returned fewer results than it asked for,
+        since that was everything available. criteria.max_age_s, when given,
+        caps how old an entry may be (0 never uses the cache).
+        """
+        key = search_cache_key(criteria)
+        entry = await self.backend.get(key)
+
+        age_s = time.time() - entry.stored_at if entry is not None else 0.0
+        if entry is not None and age_s > self.ttl_s:
+            await self.backend.delete(key)
+            self.expired += 1
+            entry = None
+
+        if entry is not None and (criteria.max_age_s is None or age_s <= criteria.max_age_s):
+            exhausted = len(entry.businesses) < entry.max_results
+            if entry.max_results >= criteria.max_results or exhausted:
+                self.hits += 1
+                return entry.businesses[:criteria.max_results]
+
+        self.misses += 1
+        return None
+
+    async def store(self, criteria: SearchCriteria, businesses: list[Business]):
+        """Remember a fresh result, unless a bigger one is already cached."""
+        key = search_cache_key(criteria)
+        current = await self.backend.get(key)
+        if current is not None and current.max_results > criteria.max_results \
+                and time.time() - current.stored_at <= self.ttl_s:
+            return
+        await self.backend.set(key, CachedSearch(
+            businesses=businesses,
+            max_results=criteria.max_results,
+            stored_at=time.time()
+        ))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            **self.backend.stats(),
+        }
+
+
+class CachedSearchService(IBusinessSearchService):
+    """Decorates a search service with the shared result cache."""
+
+    def __init__(self, inner: IBusinessSearchService, cache: SearchCache):
+        self.inner = inner
+        self.cache = cache
+
+    async def search_businesses(self, criteria: SearchCriteria) -> list[Business]:
+        if not self.cache.enabled:
+            return await self.inner.search_businesses(criteria)
+
+        cached = await self.cache.lookup(criteria)
+        if cached is not None:
+            logger.info("Cache hit", extra={"fields": {"key": search_cache_key(criteria)}})
+            return cached
+
+        businesses = await self.inner.search_businesses(criteria)
+        # A search cut short by its deadline would pass for a complete one
+        if not is_partial():
+            await self.cache.store(criteria, businesses)
+        return businesses
+    
+    async def stream_businesses(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        if self.cache.enabled:
+            cached = await self.cache.lookup(criteria)
+            if cached is not None:
+                for business in cached:
+                    yield business
+                return
+        
+        businesses = []
+        async for business in self.inner.stream_businesses(criteria):
+            businesses.append(business)
+            yield business
+        
+        # Only reached when the stream ran to completion
+        if self.cache.enabled and not is_partial():
+            await self.cache.store(criteria, businesses)
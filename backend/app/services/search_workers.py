@@ -0,0 +1,347 @@
+"""
+Multi-process search workers.
+Following Single Responsibility Principle - only shards searches across worker processes.
+Following Liskov Substitution Principle - ProcessSearchService is a drop-in IBusinessSearchService.
+
+Each worker is a child Python process with its own event loop and its own
+browser (or HTTP client). The parent talks to it over stdin/stdout using
+newline-delimited JSON:
+
+    parent -> worker   {"op": "search", "id", "criteria", "request_id"}
+                       {"op": "cancel", "id"}
+                       {"op": "ping", "id"}
+    worker -> parent   {"type": "ready"}, once its browser is up
+                       {"id", "type": "business", "business"}
+                       {"id", "type": "done", "partial"} | {"id", "type": "error", "detail"}
+                       {"id", "type": "throttled", "reason"}
+                       {"id", "type": "pong", "stats"}
+
+Searches go to the worker with the fewest in flight. Workers are pinged
+periodically and killed if they stop answering, and crashed workers are
+restarted with backoff.
+
+The worker side lives in app.services.worker_process.
+"""
+from prometheus_client import Counter, Gauge
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from app.models import SearchCriteria, Business
+from app.services.interfaces import IBusinessSearchService
+from app.services.rate_limiter import ThrottledError
+from app.services.deadline import mark_partial, time_left_s
+from app.services.telemetry import request_id_var
+
+
+SEARCH_WORKER_PROCESSES = int(os.getenv("SEARCH_WORKER_PROCESSES", "0"))
+SEARCH_WORKER_HEALTH_INTERVAL_S = float(os.getenv("SEARCH_WORKER_HEALTH_INTERVAL_S", "10"))
+SEARCH_WORKER_HEALTH_TIMEOUT_S = float(os.getenv("SEARCH_WORKER_HEALTH_TIMEOUT_S", "15"))
+SEARCH_WORKER_START_TIMEOUT_S = float(os.getenv("SEARCH_WORKER_START_TIMEOUT_S", "60"))
+
+# Longest single protocol line (one business or one stats payload)
+MAX_LINE_BYTES = 4 * 1024 * 1024
+
+WORKER_IN_FLIGHT = Gauge(
+    "search_worker_in_flight",
+    "Searches in flight per worker process",
+    ["worker"]
+)
+WORKER_RESTARTS = Counter(
+    "search_worker_restarts_total",
+    "Worker processes restarted after exiting or failing a health check",
+    ["worker"]
+)
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised to searches that were running on a worker when it died."""
+
+
+class _WorkerProcess:
+    """One child process and the searches routed to it."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.reader_task: Optional[asyncio.Task] = None
+        self.ready = asyncio.Event()
+        self.pending: Dict[str, asyncio.Queue] = {}
+        self.started_at = 0.0
+        self.restarts = 0
+        self.consecutive_crashes = 0
+        self.last_pong = 0.0
+        self.last_stats: dict = {}
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    @property
+    def available(self) -> bool:
+        """Started up and not exited; only these get searches and pings."""
+        return self.alive and self.ready.is_set()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.pending)
+
+    def send(self, message: dict):
+        self.process.stdin.write((json.dumps(message) + "\n").encode())
+
+
+class SearchWorkerPool:
+    """Starts, routes to, health-checks and restarts search worker processes."""
+
+    def __init__(
+        self,
+        processes: int = SEARCH_WORKER_PROCESSES,
+        health_interval_s: float = SEARCH_WORKER_HEALTH_INTERVAL_S,
+        health_timeout_s: float = SEARCH_WORKER_HEALTH_TIMEOUT_S,
+        start_timeout_s: float = SEARCH_WORKER_START_TIMEOUT_S,
+    ):
+        self.processes = processes
+        self.health_interval_s = health_interval_s
+        self.health_timeout_s = health_timeout_s
+        self.start_timeout_s = start_timeout_s
+        self._workers: List[_WorkerProcess] = [_WorkerProcess(i) for i in range(processes)]
+        self._health_task: Optional[asyncio.Task] = None
+        self._restart_tasks: set = set()
+        self._stopping = False
+
+    async def start(self):
+        """Spawn every worker and wait until they are ready (or failed to start)."""
+        self._stopping = False
+        await asyncio.gather(*(self._spawn(worker) for worker in self._workers))
+        self._health_task = asyncio.create_task(self._health_loop())
+        ready = sum(1 for worker in self._workers if worker.available)
+        logger.info("Search workers started", extra={"fields": {"processes": self.processes, "ready": ready}})
+
+    async def stop(self):
+        self._stopping = True
+        for task in [self._health_task, *self._restart_tasks]:
+            if task:
+                task.cancel()
+        await asyncio.gather(*(self._terminate(worker) for worker in self._workers))
+        logger.info("Search workers stopped")
+
+    async def stream(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        """
+        Run a search on the least-loaded worker, yielding businesses as
+        the worker finds them.
+
+        If the worker dies before yielding anything the search is retried
+        once on another worker.
+        """
+        for attempt in range(2):
+            worker = self._least_loaded()
+            yielded = False
+            try:
+                async for business in self._run_on(worker, criteria):
+                    yielded = True
+                    yield business
+                return
+            except WorkerCrashedError:
+                if yielded or attempt == 1:
+                    raise
+                logger.warning("Retrying search after worker crash", extra={"fields": {"worker": worker.index}})
+
+    async def _run_on(self, worker: _WorkerProcess, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        search_id = uuid.uuid4().hex
+        frames: asyncio.Queue = asyncio.Queue()
+        worker.pending[search_id] = frames
+        WORKER_IN_FLIGHT.labels(worker.index).set(worker.in_flight)
+        finished = False
+        # The worker gets what is left of the budget, not the whole of it again
+        time_left = time_left_s()
+        if time_left is not None:
+            criteria = criteria.model_copy(update={"time_budget_s": max(0.001, time_left)})
+        try:
+            worker.send({
+                "op": "search",
+                "id": search_id,
+                "criteria": criteria.model_dump(),
+                "request_id": request_id_var.get(),
+            })
+            while True:
+                frame = await frames.get()
+                if frame["type"] == "business":
+                    yield Business(**frame["business"])
+                elif frame["type"] == "done":
+                    finished = True
+                    if frame.get("partial"):
+                        mark_partial()
+                    return
+                elif frame["type"] == "crashed":
+                    finished = True
+                    raise WorkerCrashedError(f"Search worker {worker.index} crashed")
+                elif frame["type"] == "throttled":
+                    finished = True
+                    raise ThrottledError(frame.get("reason") or "worker")
+                else:
+                    finished = True
+                    raise RuntimeError(frame.get("detail") or "Search failed in worker")
+        finally:
+            worker.pending.pop(search_id, None)
+            WORKER_IN_FLIGHT.labels(worker.index).set(worker.in_flight)
+            # Caller went away (cancelled, disconnected): stop the worker's search too
+            if not finished and worker.alive:
+                try:
+                    worker.send({"op": "cancel", "id": search_id})
+                except Exception:
+                    pass
+
+    def _least_loaded(self) -> _WorkerProcess:
+        available = [worker for worker in self._workers if worker.available]
+        if not available:
+            raise RuntimeError("No search workers are running")
+        return min(available, key=lambda worker: (worker.in_flight, worker.index))
+
+    async def _spawn(self, worker: _WorkerProcess):
+        """Start the worker's process and wait for its ready frame."""
+        env = dict(os.environ, SEARCH_WORKER_PROCESSES="0")
+        worker.ready = asyncio.Event()
+        worker.process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "app.services.worker_process",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env=env,
+            limit=MAX_LINE_BYTES
+        )
+        worker.started_at = time.monotonic()
+        worker.reader_task = asyncio.create_task(self._read(worker))
+
+        # A worker that exits during startup is restarted by its reader
+        exited = asyncio.create_task(worker.process.wait())
+        ready = asyncio.create_task(worker.ready.wait())
+        try:
+            await asyncio.wait({exited, ready}, timeout=self.start_timeout_s, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            exited.cancel()
+            ready.cancel()
+        if worker.alive and not worker.ready.is_set():
+            logger.warning("Search worker did not start in time, killing", extra={"fields": {"worker": worker.index}})
+            worker.process.kill()
+
+    async def _read(self, worker: _WorkerProcess):
+        """Route the worker's frames to waiting searches until it exits."""
+        process = worker.process
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    frame = json.loads(line)
+                except ValueError:
+                    logger.warning("Bad frame from search worker", extra={"fields": {"worker": worker.index}})
+                    continue
+                if frame.get("type") == "ready":
+                    worker.last_pong = time.monotonic()
+                    worker.ready.set()
+                elif frame.get("type") == "pong":
+                    worker.last_pong = time.monotonic()
+                    worker.last_stats = frame.get("stats", {})
+                queue = worker.pending.get(frame.get("id"))
+                if queue is not None:
+                    queue.put_nowait(frame)
+        finally:
+            await process.wait()
+            for queue in list(worker.pending.values()):
+                queue.put_nowait({"type": "crashed"})
+            if not self._stopping:
+                self._schedule_restart(worker, process.returncode)
+
+    def _schedule_restart(self, worker: _WorkerProcess, returncode: Optional[int]):
+        # Back off if the worker keeps dying shortly after starting
+        if time.monotonic() - worker.started_at > 60:
+            worker.consecutive_crashes = 0
+        worker.consecutive_crashes += 1
+        delay = min(30.0, 0.5 * 2 ** (worker.consecutive_crashes - 1))
+        logger.warning(
+            "Search worker exited, restarting",
+            extra={"fields": {"worker": worker.index, "returncode": returncode, "restart_in_s": delay}}
+        )
+        task = asyncio.create_task(self._restart(worker, delay))
+        self._restart_tasks.add(task)
+        task.add_done_callback(self._restart_tasks.discard)
+
+    async def _restart(self, worker: _WorkerProcess, delay: float):
+        await asyncio.sleep(delay)
+        if self._stopping:
+            return
+        worker.restarts += 1
+        WORKER_RESTARTS.labels(worker.index).inc()
+        try:
+            await self._spawn(worker)
+        except Exception as e:
+            logger.error("Search worker failed to start", extra={"fields": {"worker": worker.index, "error": str(e)}})
+            self._schedule_restart(worker, None)
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval_s)
+            now = time.monotonic()
+            for worker in self._workers:
+                if not worker.available:
+                    continue
+                if now - worker.last_pong > self.health_timeout_s:
+                    logger.warning("Search worker unresponsive, killing", extra={"fields": {"worker": worker.index}})
+                    worker.process.kill()
+                    continue
+                try:
+                    worker.send({"op": "ping", "id": uuid.uuid4().hex})
+                except Exception:
+                    pass
+
+    async def _terminate(self, worker: _WorkerProcess):
+        if not worker.alive:
+            return
+        # Closing stdin asks the worker to shut its browser down and exit
+        worker.process.stdin.close()
+        try:
+            await asyncio.wait_for(worker.process.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            worker.process.kill()
+            await worker.process.wait()
+        if worker.reader_task:
+            await asyncio.gather(worker.reader_task, return_exceptions=True)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "processes": self.processes,
+            "workers": [
+                {
+                    "index": worker.index,
+                    "pid": worker.process.pid if worker.process else None,
+                    "alive": worker.alive,
+                    "ready": worker.ready.is_set(),
+                    "in_flight": worker.in_flight,
+                    "restarts": worker.restarts,
+                    "last_pong_s": round(now - worker.last_pong, 1) if worker.available else None,
+                    "stats": worker.last_stats,
+                }
+                for worker in self._workers
+            ],
+        }
+
+
+class ProcessSearchService(IBusinessSearchService):
+    """Runs searches on a SearchWorkerPool instead of in this process."""
+
+    def __init__(self, workers: SearchWorkerPool):
+        self.workers = workers
+
+    async def search_businesses(self, criteria: SearchCriteria) -> list[Business]:
+        return [business async for business in self.workers.stream(criteria)]
+
+    async def stream_businesses(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        async for business in self.workers.stream(criteria):
+            yield business
@@ -0,0 +1,124 @@
+"""
+Single-flight coalescing of identical searches.
+Following Single Responsibility Principle - only de-duplicates in-flight work.
+
+Concurrent requests for the same criteria (or for fewer results than a
+search already running) await one shared scrape instead of each starting
+their own browser session.
+"""
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+import asyncio
+from app.models import SearchCriteria, Business
+from app.services.interfaces import IBusinessSearchService
+from app.services.search_cache import search_cache_key
+
+
+class _Flight:
+    """One shared scrape and the number of callers waiting on it."""
+
+    def __init__(self, max_results: int, task: asyncio.Task):
+        self.max_results = max_results
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Registry of in-flight searches, shared by every request."""
+
+    def __init__(self):
+        self._flights: Dict[str, List[_Flight]] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(
+        self,
+        key: str,
+        max_results: int,
+        search: Callable[[], Awaitable[list[Business]]],
+    ) -> list[Business]:
+        """
+        Join a running search for key that covers max_results, or start one.
+
+        Cancelling a caller only cancels the shared task once no other
+        caller is waiting on it.
+        """
+        flight = self._find(key, max_results)
+        if flight is None:
+            flight = _Flight(max_results, asyncio.create_task(search()))
+            self._flights.setdefault(key, []).append(flight)
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        return await self._wait(flight, max_results)
+
+    def join(self, key: str, max_results: int) -> Optional[Awaitable[list[Business]]]:
+        """Awaitable for a running search covering max_results, if there is one."""
+        flight = self._find(key, max_results)
+        if flight is None:
+            return None
+        self.coalesced += 1
+        return self._wait(flight, max_results)
+
+    async def _wait(self, flight: _Flight, max_results: int) -> list[Business]:
+        flight.waiters += 1
+        try:
+            businesses = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+        return businesses[:max_results]
+
+    def _find(self, key: str, max_results: int):
+        for flight in self._flights.get(key, []):
+            if flight.max_results >= max_results and not flight.task.done():
+                return flight
+        return None
+
+    def _forget(self, key: str, flight: _Flight):
+        flights = self._flights.get(key, [])
+        if flight in flights:
+            flights.remove(flight)
+        if not flights:
+            self._flights.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": sum(len(flights) for flights in self._flights.values()),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+
+class CoalescingSearchService(IBusinessSearchService):
+    """Decorates a search service so identical concurrent searches share one scrape."""
+
+    def __init__(self, inner: IBusinessSearchService, single_flight: SingleFlight):
+        self.inner = inner
+        self.single_flight = single_flight
+
+    async def search_businesses(self, criteria: SearchCriteria) -> list[Business]:
+        # A budgeted search may come back partial, so it neither shares nor is shared
+        if criteria.time_budget_s:
+            return await self.inner.search_businesses(criteria)
+        return await self.single_flight.run(
+            search_cache_key(criteria),
+            criteria.max_results,
+            lambda: self.inner.search_businesses(criteria)
+        )
+    
+    async def stream_businesses(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        # Piggyback on a running search if there is one, otherwise stream directly
+        shared = None
+        if not criteria.time_budget_s:
+            shared = self.single_flight.join(search_cache_key(criteria), criteria.max_results)
+        if shared is not None:
+            for business in await shared:
+                yield business
+            return
+        
+        async for business in self.inner.stream_businesses(criteria):
+            yield business
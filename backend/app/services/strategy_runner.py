@@ -0,0 +1,316 @@
+"""
+Hedged execution of search strategies.
+Following Single Responsibility Principle - only decides when to start which strategy.
+Following Open/Closed Principle - strategies are any IBusinessSearchService registered by name.
+
+Strategies are tried in order (by default Maps, then web search). Rather
+than waiting for one to fail before starting the next, the runner can
+start the next one as a hedge after a delay, or right away. The first
+strategy to produce a business wins; the others are cancelled. By default
+it does not: strategies run one after another (HEDGE_MODE=sequential).
+
+With HEDGE_MODE=adaptive, how long to wait is learned per query pattern (the industry). Each
+strategy's recent success rate and time to first result are tracked as
+EWMAs. When the first strategy nearly always finds something, no hedge is
+started. When it rarely does, the next one starts in parallel. Otherwise
+the hedge starts once the first strategy is HEDGE_DELAY_FACTOR times later
+than it usually is to produce a business (HEDGE_DELAY_S until that is
+known). A strategy that lost a race was cancelled, so all it tells us is
+that it had not produced anything yet; that raises its time to first
+result, which delays the next hedge and gives it a better chance to finish.
+Every HEDGE_PROBE_EVERY-th hedged or parallel decision runs the first
+strategy alone, so its success rate is sampled while warming up and
+noticed when it recovers.
+"""
+from prometheus_client import Counter
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+from app.models import SearchCriteria, Business
+from app.services.interfaces import IBusinessSearchService
+from app.services.rate_limiter import ThrottledError
+from app.services.deadline import deadline_expired, is_partial, mark_partial
+
+
+# adaptive | hedge | parallel | sequential (or off, see ServiceFactory). Hedging can
+# hold two browser contexts and make two Google requests per search, which one
+# rate-limiter token does not account for, so it is opt-in
+HEDGE_MODE = os.getenv("HEDGE_MODE", "sequential")
+# Hedge delay before the first strategy's time to first result is known
+HEDGE_DELAY_S = float(os.getenv("HEDGE_DELAY_S", "6"))
+# Otherwise hedge this many times later than it usually produces a business, up to the max
+HEDGE_DELAY_FACTOR = float(os.getenv("HEDGE_DELAY_FACTOR", "1.5"))
+HEDGE_MAX_DELAY_S = float(os.getenv("HEDGE_MAX_DELAY_S", "60"))
+# Outcomes per pattern before the adaptive mode trusts its success rates
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "5"))
+# Adaptive: skip the hedge at or above this success rate, run in parallel at or below the other
+HEDGE_SKIP_RATE = float(os.getenv("HEDGE_SKIP_RATE", "0.9"))
+HEDGE_PARALLEL_RATE = float(os.getenv("HEDGE_PARALLEL_RATE", "0.3"))
+HEDGE_EWMA_ALPHA = float(os.getenv("HEDGE_EWMA_ALPHA", "0.2"))
+HEDGE_PROBE_EVERY = int(os.getenv("HEDGE_PROBE_EVERY", "10"))
+
+HEDGE_DECISIONS = Counter(
+    "search_hedge_decisions_total",
+    "How the strategy runner scheduled fallback strategies",
+    ["mode"]
+)
+STRATEGY_WINS = Counter(
+    "search_strategy_wins_total",
+    "Searches answered by each strategy",
+    ["strategy"]
+)
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def query_pattern(criteria: SearchCriteria) -> str:
+    """What success rates are tracked by: the folded industry."""
+    return ' '.join(criteria.industry.split()).casefold()
+
+
+class _StrategyStats:
+    """EWMA success rate and time to first result of one strategy on one pattern."""
+
+    def __init__(self):
+        self.samples = 0
+        self.success_rate = 0.0
+        self.first_result_s: Optional[float] = None
+        self.unfinished = 0
+        self.probe_decisions = 0
+
+    def record(self, success: bool, first_result_s: Optional[float], alpha: float):
+        self.samples += 1
+        value = 1.0 if success else 0.0
+        self.success_rate = value if self.samples == 1 else alpha * value + (1 - alpha) * self.success_rate
+        if first_result_s is not None:
+            self.first_result_s = first_result_s if self.first_result_s is None \
+                else alpha * first_result_s + (1 - alpha) * self.first_result_s
+
+    def record_unfinished(self, waited_s: float):
+        """
+        Cancelled without producing a business within waited_s: a lower bound
+        on its time to first result, not a failure.
+        """
+        self.unfinished += 1
+        self.first_result_s = max(self.first_result_s or 0.0, waited_s)
+
+    def to_dict(self) -> dict:
+        return {
+            "samples": self.samples,
+            "success_rate": round(self.success_rate, 3),
+            "first_result_s": round(self.first_result_s, 2) if self.first_result_s is not None else None,
+            "unfinished": self.unfinished,
+        }
+
+
+class HedgedStrategyRunner(IBusinessSearchService):
+    """Runs search strategies in order, hedging slow or failing ones."""
+
+    def __init__(
+        self,
+        strategies: List[Tuple[str, IBusinessSearchService]],
+        mode: str = HEDGE_MODE,
+        delay_s: float = HEDGE_DELAY_S,
+        delay_factor: float = HEDGE_DELAY_FACTOR,
+        max_delay_s: float = HEDGE_MAX_DELAY_S,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        skip_rate: float = HEDGE_SKIP_RATE,
+        parallel_rate: float = HEDGE_PARALLEL_RATE,
+        alpha: float = HEDGE_EWMA_ALPHA,
+        probe_every: int = HEDGE_PROBE_EVERY,
+        no_results: Optional[Callable[[SearchCriteria], Business]] = None,
+    ):
+        """
+        strategies: (name, service) pairs, in order of preference.
+        no_results, if given, builds the business yielded when every
+        strategy came back empty.
+        """
+        if not strategies:
+            raise ValueError("At least one search strategy is required")
+        self.strategies = strategies
+        self.mode = mode
+        self.delay_s = delay_s
+        self.delay_factor = delay_factor
+        self.max_delay_s = max_delay_s
+        self.min_samples = min_samples
+        self.skip_rate = skip_rate
+        self.parallel_rate = parallel_rate
+        self.alpha = alpha
+        self.probe_every = probe_every
+        self.no_results = no_results
+        self._stats: Dict[Tuple[str, str], _StrategyStats] = {}
+
+    def _stats_for(self, pattern: str, strategy: str) -> _StrategyStats:
+        key = (pattern, strategy)
+        if key not in self._stats:
+            self._stats[key] = _StrategyStats()
+        return self._stats[key]
+
+    def plan(self, criteria: SearchCriteria) -> str:
+        """Scheduling for this search: 'sequential', 'hedge' or 'parallel'."""
+        if self.mode != "adaptive":
+            return self.mode
+        primary = self._stats_for(query_pattern(criteria), self.strategies[0][0])
+        if primary.samples < self.min_samples:
+            mode = "hedge"
+        elif primary.success_rate >= self.skip_rate:
+            return "sequential"
+        elif primary.success_rate <= self.parallel_rate:
+            mode = "parallel"
+        else:
+            return "hedge"
+        # Probe: a first strategy that keeps losing races is never sampled
+        primary.probe_decisions += 1
+        if self.probe_every and primary.probe_decisions % self.probe_every == 0:
+            return "sequential"
+        return mode
+
+    def hedge_delay(self, criteria: SearchCriteria) -> float:
+        """Seconds to give the running strategies before starting the next one."""
+        primary = self._stats_for(query_pattern(criteria), self.strategies[0][0])
+        if primary.first_result_s is None:
+            return self.delay_s
+        return min(self.max_delay_s, self.delay_factor * primary.first_result_s)
+
+    async def search_businesses(self, criteria: SearchCriteria) -> list[Business]:
+        return [business async for business in self.stream_businesses(criteria)]
+
+    async def stream_businesses(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        """
+        Yield the winning strategy's businesses.
+
+        The next strategy starts when every running one has come back
+        empty, and also (per the plan) after a delay or immediately.
+        """
+        pattern = query_pattern(criteria)
+        mode = self.plan(criteria)
+        HEDGE_DECISIONS.labels(mode).inc()
+        delay_s = self.hedge_delay(criteria)
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        frames: asyncio.Queue = asyncio.Queue()
+        tasks: Dict[int, asyncio.Task] = {}
+        task_started: Dict[int, float] = {}
+        first_result: Dict[int, float] = {}
+        errors: List[Exception] = []
+        winner: Optional[int] = None
+        finished = 0
+        hedging = mode == "hedge"
+
+        async def run(index: int):
+            try:
+                async for business in self.strategies[index][1].stream_businesses(criteria):
+                    frames.put_nowait((index, business))
+                frames.put_nowait((index, _DONE))
+            except Exception as e:
+                frames.put_nowait((index, e))
+
+        def start_next():
+            index = len(tasks)
+            task_started[index] = loop.time()
+            tasks[index] = asyncio.create_task(run(index))
+            if index:
+                logger.info(
+                    "Starting fallback strategy",
+                    extra={"fields": {"strategy": self.strategies[index][0], "mode": mode, "pattern": pattern}}
+                )
+
+        start_next()
+        if mode == "parallel":
+            while len(tasks) < len(self.strategies):
+                start_next()
+
+        try:
+            while True:
+                timeout = None
+                if hedging and winner is None and len(tasks) < len(self.strategies):
+                    timeout = max(0.0, started_at + delay_s * len(tasks) - loop.time())
+                try:
+                    index, item = await asyncio.wait_for(frames.get(), timeout)
+                except asyncio.TimeoutError:
+                    # Hedge: the running strategies are taking too long
+                    if deadline_expired():
+                        # Too late for another strategy; let the running ones finish
+                        hedging = False
+                    else:
+                        start_next()
+                    continue
+
+                if winner is not None and index != winner:
+                    continue
+
+                if isinstance(item, Business):
+                    if winner is None:
+                        winner = index
+                        now = loop.time()
+                        first_result[index] = now - task_started[index]
+                        STRATEGY_WINS.labels(self.strategies[index][0]).inc()
+                        # The others lost: stop them and free their browsers
+                        for other, task in tasks.items():
+                            if other != index and not task.done():
+                                task.cancel()
+                                self._stats_for(pattern, self.strategies[other][0]).record_unfinished(
+                                    now - task_started[other]
+                                )
+                    yield item
+                    continue
+
+                # This strategy finished: empty, failed, or done after winning
+                finished += 1
+                self._record(pattern, index, item, first_result.get(index))
+                if winner is not None:
+                    if isinstance(item, Exception):
+                        raise item
+                    return
+                if isinstance(item, Exception):
+                    errors.append(item)
+                    logger.warning(
+                        "Search strategy failed",
+                        extra={"fields": {"strategy": self.strategies[index][0], "error": str(item)}}
+                    )
+                if finished == len(tasks):
+                    if len(tasks) < len(self.strategies):
+                        # Out of time: a fallback would run past the search's budget
+                        if deadline_expired():
+                            mark_partial()
+                            break
+                        start_next()
+                        continue
+                    break
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        # Every strategy came back empty or failed
+        throttled = [e for e in errors if isinstance(e, ThrottledError)]
+        if throttled:
+            raise throttled[0]
+        if errors and len(errors) == len(self.strategies):
+            raise errors[-1]
+        # A search cut short found nothing yet, which is not the same as no results
+        if self.no_results is not None and not is_partial():
+            yield self.no_results(criteria)
+
+    def _record(self, pattern: str, index: int, outcome, first_result_s: Optional[float]):
+        # Cancelled losers only count towards time to first result (see
+        # record_unfinished); searches cut short by their deadline not at all.
+        if is_partial():
+            return
+        success = first_result_s is not None and not isinstance(outcome, Exception)
+        self._stats_for(pattern, self.strategies[index][0]).record(success, first_result_s, self.alpha)
+
+    def stats(self) -> dict:
+        patterns: Dict[str, dict] = {}
+        for (pattern, strategy), stats in self._stats.items():
+            patterns.setdefault(pattern, {})[strategy] = stats.to_dict()
+        return {
+            "mode": self.mode,
+            "delay_s": self.delay_s,
+            "delay_factor": self.delay_factor,
+            "strategies": [name for name, _ in self.strategies],
+            "patterns": patterns,
+        }
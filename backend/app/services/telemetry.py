@@ -0,0 +1,154 @@
+"""
+Stage timing, Prometheus metrics and structured logging.
+Following Single Responsibility Principle - only records what the scraper did and how long it took.
+
+Each scraper stage runs inside a span. A span feeds a latency histogram,
+an outcome counter and an in-flight gauge, and logs one line tagged with
+the current request ID.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from prometheus_client import Counter, Gauge, Histogram
+from typing import Iterator, Optional
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+# Set per HTTP request by the middleware in app.main, and per background job
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+
+STAGE_SECONDS = Histogram(
+    "scraper_stage_seconds",
+    "Time spent in each scraper stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+STAGE_TOTAL = Counter(
+    "scraper_stage_total",
+    "Scraper stages run, by outcome",
+    ["stage", "outcome"]
+)
+STAGE_IN_FLIGHT = Gauge(
+    "scraper_stage_in_flight",
+    "Scraper stages currently running",
+    ["stage"]
+)
+DETAIL_FIELDS_TOTAL = Counter(
+    "scraper_detail_fields_total",
+    "Details-panel field lookups, by whether the field was found",
+    ["field", "outcome"]
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed stage; callers may attach fields or mark it empty/failed."""
+
+    def __init__(self, stage: str, fields: dict):
+        self.stage = stage
+        self.fields = fields
+        self.outcome = "success"
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def fail(self, error: BaseException):
+        """Mark the stage failed when the caller handles the exception itself."""
+        self.outcome = "error"
+        self.fields["error"] = str(error) or type(error).__name__
+
+
+@contextmanager
+def span(stage: str, level: int = logging.DEBUG, **fields) -> Iterator[Span]:
+    """
+    Time a scraper stage.
+
+    Exceptions propagate and are recorded as "error" ("cancelled" for
+    cancellation). Failures are always logged at WARNING.
+    """
+    current = Span(stage, fields)
+    STAGE_IN_FLIGHT.labels(stage).inc()
+    started = time.perf_counter()
+    try:
+        yield current
+    except (asyncio.CancelledError, GeneratorExit):
+        current.outcome = "cancelled"
+        raise
+    except Exception as e:
+        current.fail(e)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_IN_FLIGHT.labels(stage).dec()
+        STAGE_SECONDS.labels(stage).observe(elapsed)
+        STAGE_TOTAL.labels(stage, current.outcome).inc()
+        logger.log(
+            logging.WARNING if current.outcome == "error" else level,
+            "stage %s %s", stage, current.outcome,
+            extra={"fields": {
+                "stage": stage,
+                "outcome": current.outcome,
+                "duration_ms": round(elapsed * 1000, 1),
+                **current.fields,
+            }}
+        )
+
+
+def record_detail_fields(found: dict):
+    """Count which details-panel fields were found, e.g. {"phone": True}."""
+    for field, present in found.items():
+        DETAIL_FIELDS_TOTAL.labels(field, "found" if present else "missing").inc()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the request ID and any `fields` extra."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": request_id_var.get(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(f"{k}={v}" for k, v in getattr(record, "fields", {}).items())
+        line = (
+            f"{self.formatTime(record)} {record.levelname:<7} "
+            f"[{request_id_var.get() or '-'}] {record.getMessage()}"
+        )
+        if fields:
+            line += f" {fields}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT):
+    """Send the app's logs to stderr as JSON ("json") or plain text ("text")."""
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+
+    app_logger = logging.getLogger("app")
+    app_logger.handlers = [handler]
+    app_logger.setLevel(level.upper())
+    app_logger.propagate = False
@@ -0,0 +1,140 @@
+"""
+Event-driven page waits for the Playwright scraper.
+Following Single Responsibility Principle - only decides when the page is ready.
+
+Instead of fixed sleeps and one wait_for_selector per candidate selector,
+all candidates are checked at once by an in-page predicate raced against a
+"panel settled" signal, so a lookup finishes as soon as the panel is ready.
+"""
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
+from typing import Optional, List
+import asyncio
+import os
+from app.services.deadline import clamp_timeout_ms
+
+
+# True once a `root` element exists whose aria-label contains `label`
+ROOT_PRESENT_SCRIPT = """
+([rootSelector, label]) => [...document.querySelectorAll(rootSelector)].some(
+    el => !label || (el.getAttribute('aria-label') || '').includes(label)
+)
+"""
+
+# Resolves once `root` exists and the DOM under it has been quiet for quietMs
+SETTLED_SCRIPT = """
+([rootSelector, label, quietMs, maxMs]) => new Promise(resolve => {
+    const findRoot = () => {
+        for (const el of document.querySelectorAll(rootSelector)) {
+            if (!label || (el.getAttribute('aria-label') || '').includes(label)) return el;
+        }
+        return null;
+    };
+    let quiet = null;
+    let cap = null;
+    const observer = new MutationObserver(() => arm());
+    const finish = (ok) => {
+        observer.disconnect();
+        clearTimeout(quiet);
+        clearTimeout(cap);
+        resolve(ok);
+    };
+    const arm = () => {
+        clearTimeout(quiet);
+        quiet = setTimeout(() => { if (findRoot()) finish(true); }, quietMs);
+    };
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+    cap = setTimeout(() => finish(!!findRoot()), maxMs);
+    arm();
+})
+"""
+
+
+class WaitEngine:
+    """Races selector waits against a DOM-settled signal."""
+
+    def __init__(
+        self,
+        quiet_ms: Optional[int] = None,
+        settle_timeout_ms: Optional[int] = None,
+        field_timeout_ms: Optional[int] = None,
+    ):
+        self.quiet_ms = quiet_ms or int(os.getenv("WAIT_QUIET_MS", "300"))
+        self.settle_timeout_ms = settle_timeout_ms or int(os.getenv("WAIT_SETTLE_TIMEOUT_MS", "5000"))
+        self.field_timeout_ms = field_timeout_ms or int(os.getenv("WAIT_FIELD_TIMEOUT_MS", "2000"))
+
+    async def wait_for_settled(
+        self,
+        page: Page,
+        root_selector: str = 'div[role="main"]',
+        label: Optional[str] = None,
+        timeout_ms: Optional[int] = None,
+    ) -> bool:
+        """
+        Wait until `root_selector` (optionally with an aria-label containing
+        `label`) exists and the DOM has stopped changing.
+
+        Returns False if the root never showed up within the timeout.
+        """
+        timeout_ms = clamp_timeout_ms(timeout_ms or self.settle_timeout_ms)
+        try:
+            return await page.evaluate(
+                SETTLED_SCRIPT, [root_selector, label, self.quiet_ms, timeout_ms]
+            )
+        except Exception:
+            return False
+
+    async def wait_for_panel(
+        self,
+        page: Page,
+        label: Optional[str],
+        root_selector: str = 'div[role="main"]',
+        timeout_ms: Optional[int] = None,
+    ) -> bool:
+        """Wait for the details panel for `label` to be attached (not settled)."""
+        try:
+            await page.wait_for_function(
+                ROOT_PRESENT_SCRIPT,
+                arg=[root_selector, label],
+                timeout=clamp_timeout_ms(timeout_ms or self.settle_timeout_ms)
+            )
+            return True
+        except Exception:
+            return False
+
+    def settle(self, page: Page, root_selector: str = 'div[role="main"]', label: Optional[str] = None) -> asyncio.Task:
+        """Start a settled wait in the background, to race field lookups against."""
+        return asyncio.create_task(self.wait_for_settled(page, root_selector, label))
+
+    async def wait_until(
+        self,
+        page: Page,
+        predicate_script: str,
+        arg=None,
+        settled: Optional[asyncio.Task] = None,
+        timeout_ms: Optional[int] = None,
+    ) -> bool:
+        """
+        Wait for an in-page predicate, giving up early once `settled`
+        resolves first.
+
+        Returns True if the predicate became truthy.
+        """
+        if settled is not None and settled.done():
+            return bool(await page.evaluate(predicate_script, arg))
+
+        waiter = asyncio.create_task(
+            page.wait_for_function(
+                predicate_script, arg=arg, timeout=clamp_timeout_ms(timeout_ms or self.field_timeout_ms)
+            )
+        )
+        racers = {waiter} if settled is None else {waiter, settled}
+        await asyncio.wait(racers, return_when=asyncio.FIRST_COMPLETED)
+        if not waiter.done():
+            waiter.cancel()
+            return False
+
+        try:
+            waiter.result()
+            return True
+        except (PlaywrightTimeout, Exception):
+            return False
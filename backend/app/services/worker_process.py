@@ -0,0 +1,101 @@
+"""
+Search worker process entry point.
+Following Single Responsibility Principle - only runs searches handed over by SearchWorkerPool.
+
+Reads commands from stdin and writes result frames to stdout, one JSON
+object per line (see app.services.search_workers for the protocol). The
+worker exits, closing its browser, when stdin is closed.
+
+Run by hand with: python -m app.services.worker_process
+"""
+from typing import Dict, Optional
+import asyncio
+import json
+import os
+import sys
+from app.models import SearchCriteria
+from app.services.factory import ServiceFactory
+from app.services.rate_limiter import ThrottledError
+from app.services.deadline import deadline_scope
+from app.services.strategy_runner import HedgedStrategyRunner
+from app.services.search_workers import MAX_LINE_BYTES
+from app.services.telemetry import configure_logging, request_id_var
+
+
+async def serve():
+    """Worker process: run searches from stdin, write frames to stdout."""
+    # Keep the protocol on its own fd; anything else printed goes to stderr
+    protocol_fd = os.dup(sys.stdout.fileno())
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    configure_logging()
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=MAX_LINE_BYTES)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    # Frames are small and the parent reads continuously, so plain writes are fine
+    out = os.fdopen(protocol_fd, "wb", buffering=0)
+
+    def emit(frame: dict):
+        out.write((json.dumps(frame) + "\n").encode())
+
+    scraper = ServiceFactory.get_local_scraper()
+    # Only the Playwright scraper needs a browser
+    browser_pool = ServiceFactory.get_browser_pool() if ServiceFactory.uses_browser() else None
+    if browser_pool is not None:
+        await browser_pool.start()
+    emit({"type": "ready"})
+    searches: Dict[str, asyncio.Task] = {}
+
+    async def run_search(search_id: str, criteria: SearchCriteria, request_id: Optional[str]):
+        request_id_var.set(request_id)
+        try:
+            # The parent enforces the hard cutoff; here the scraper just stops on time
+            with deadline_scope(criteria.time_budget_s) as deadline:
+                async for business in scraper.stream_businesses(criteria):
+                    emit({"id": search_id, "type": "business", "business": business.model_dump()})
+            emit({"id": search_id, "type": "done", "partial": bool(deadline and deadline.partial)})
+        except asyncio.CancelledError:
+            pass
+        except ThrottledError as e:
+            emit({"id": search_id, "type": "throttled", "reason": e.reason})
+        except Exception as e:
+            emit({"id": search_id, "type": "error", "detail": str(e)})
+        finally:
+            searches.pop(search_id, None)
+
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if message["op"] == "search":
+                criteria = SearchCriteria(**message["criteria"])
+                searches[message["id"]] = asyncio.create_task(
+                    run_search(message["id"], criteria, message.get("request_id"))
+                )
+            elif message["op"] == "cancel":
+                task = searches.get(message["id"])
+                if task:
+                    task.cancel()
+            elif message["op"] == "ping":
+                emit({
+                    "id": message["id"],
+                    "type": "pong",
+                    "stats": {
+                        "searches": len(searches),
+                        "browser_pool": browser_pool.stats() if browser_pool else None,
+                        "strategies": scraper.stats() if isinstance(scraper, HedgedStrategyRunner) else None,
+                    },
+                })
+    finally:
+        for task in list(searches.values()):
+            task.cancel()
+        await asyncio.gather(*searches.values(), return_exceptions=True)
+        if browser_pool is not None:
+            await browser_pool.stop()
+        await ServiceFactory.get_http_client().close()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
@@ -0,0 +1,223 @@
+"""
+Throughput and accuracy benchmark for business deduplication.
+
+Generates a synthetic corpus of businesses in which a share of rows are
+rewritten duplicates of others: phones in other formats or with their
+country code, addresses with street types spelled out or the country
+appended, names with legal suffixes, accents or apostrophes dropped, and
+fields missing. Chains (the same name at many addresses) are mixed in.
+The corpus is deduplicated with DedupIndex, and the benchmark reports
+rows/sec for key normalization and matching, comparisons per row,
+pairwise precision/recall against the known duplicates, and peak RSS. An
+all-pairs comparison over a sample estimates what O(n²) matching would
+cost at the full size.
+
+Usage (from backend/):
+    python -m benchmarks.bench_dedup [--rows 200000] [--duplicate-rate 0.3]
+        [--all-pairs-sample 2000] [--seed 7] [--json out.json]
+"""
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+import argparse
+import json
+import platform
+import random
+import resource
+import time
+from app.models import Business
+from app.services.dedup import DedupIndex, normalize_phone, canonical_name, canonical_address
+
+
+WORDS = [
+    "golden", "maple", "river", "urban", "blue", "silver", "royal", "harbour", "green", "north",
+    "corner", "happy", "little", "grand", "summit", "coastal", "prime", "bright", "cedar", "oak",
+]
+KINDS = [
+    "pizza", "dental", "plumbing", "bakery", "cafe", "florist", "fitness", "law office", "auto repair",
+    "salon", "bistro", "pharmacy", "books", "yoga studio", "pet clinic",
+]
+CHAINS = ["Starbucks", "Tim Hortons", "Subway", "McDonald's", "Shoppers Drug Mart"]
+STREETS = ["Main", "King", "Queen", "Bay", "Yonge", "Dundas", "Bloor", "College", "Spadina", "Church"]
+STREET_TYPES = [("St", "Street"), ("Ave", "Avenue"), ("Rd", "Road"), ("Blvd", "Boulevard"), ("Dr", "Drive")]
+CITIES = [("Toronto", "ON", "US"), ("Seattle", "WA", "US"), ("London", "", "GB"), ("Berlin", "", "DE")]
+CALLING_CODES = {"US": "1", "GB": "44", "DE": "49"}
+
+
+def _phone(rng: random.Random, country: str) -> tuple[str, str]:
+    """(national format, international format) of a random number."""
+    if country == "US":
+        digits = f"{rng.randint(200, 999)}{rng.randint(200, 999)}{rng.randint(0, 9999):04d}"
+        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}", f"+1 {digits[:3]}-{digits[3:6]}-{digits[6:]}"
+    digits = f"{rng.randint(20, 99)}{rng.randint(1000, 9999)}{rng.randint(1000, 9999)}"
+    return f"0{digits[:2]} {digits[2:6]} {digits[6:]}", f"+{CALLING_CODES[country]} {digits[:2]} {digits[2:6]} {digits[6:]}"
+
+
+def _original(rng: random.Random, chain: bool) -> dict:
+    city, province, country = rng.choice(CITIES)
+    short, long = rng.choice(STREET_TYPES)
+    name = rng.choice(CHAINS) if chain else \
+        f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {rng.choice(KINDS).title()}"
+    national, international = _phone(rng, country)
+    number = rng.randint(1, 9999)
+    street = f"{rng.choice(STREETS)} {rng.choice([short, long])}"
+    return {
+        "name": name,
+        "phone": national if rng.random() < 0.7 else international,
+        "phones": (national, international),
+        "address": f"{number} {street}, {city}{' ' + province if province else ''}",
+        "street": (number, street.split()[0], short, long, city, province),
+        "country": country,
+        "website": f"https://{name.lower().replace(' ', '').replace(chr(39), '')}{rng.randint(1, 99)}.example",
+    }
+
+
+def _variant(rng: random.Random, original: dict) -> Business:
+    """A rewritten duplicate of an original business."""
+    name = original["name"]
+    roll = rng.random()
+    if roll < 0.2:
+        name = f"{name} Inc."
+    elif roll < 0.3:
+        name = f"The {name}"
+    elif roll < 0.4:
+        name = name.replace("'", "").upper()
+    elif roll < 0.5:
+        name = name.replace("e", "é", 1)
+
+    number, street, short, long, city, province = original["street"]
+    address = f"{number} {street} {rng.choice([short, long])}, {city}"
+    if rng.random() < 0.3:
+        address += {"US": ", USA", "GB": ", United Kingdom", "DE": ", Germany"}[original["country"]]
+    if rng.random() < 0.15:
+        address = None
+
+    phone = rng.choice(original["phones"])
+    if rng.random() < 0.15:
+        phone = None
+    return Business(name=name, phone=phone, address=address, website=original["website"])
+
+
+def build_corpus(rows: int, duplicate_rate: float, seed: int) -> tuple[list[Business], list[int], list[str]]:
+    """Businesses, the original each one belongs to, and each one's region."""
+    rng = random.Random(seed)
+    originals_count = max(1, int(rows * (1 - duplicate_rate)))
+    originals = [_original(rng, chain=rng.random() < 0.02) for _ in range(originals_count)]
+    businesses, truth, regions = [], [], []
+    for index, original in enumerate(originals):
+        businesses.append(Business(
+            name=original["name"], phone=original["phone"], address=original["address"], website=original["website"]
+        ))
+        truth.append(index)
+        regions.append(original["country"])
+    while len(businesses) < rows:
+        index = rng.randrange(originals_count)
+        businesses.append(_variant(rng, originals[index]))
+        truth.append(index)
+        regions.append(originals[index]["country"])
+    order = list(range(rows))
+    rng.shuffle(order)
+    return [businesses[i] for i in order], [truth[i] for i in order], [regions[i] for i in order]
+
+
+def _pairs(sizes) -> int:
+    return sum(size * (size - 1) // 2 for size in sizes)
+
+
+def pairwise_scores(predicted: list[int], truth: list[int]) -> dict:
+    """Precision and recall over pairs of rows put in the same group."""
+    predicted_pairs = _pairs(Counter(predicted).values())
+    true_pairs = _pairs(Counter(truth).values())
+    correct_pairs = _pairs(Counter(zip(predicted, truth)).values())
+    return {
+        "precision": round(correct_pairs / predicted_pairs, 4) if predicted_pairs else 1.0,
+        "recall": round(correct_pairs / true_pairs, 4) if true_pairs else 1.0,
+    }
+
+
+def all_pairs_estimate(keys: list[tuple], rows: int, sample: int) -> Optional[dict]:
+    """Time every pair of the first `sample` rows, scaled to `rows` rows."""
+    if sample < 2:
+        return None
+    index = DedupIndex()
+    sample_keys = keys[:sample]
+    for phone, name, address in sample_keys:
+        index.add_keys(phone, name, address)
+    started = time.perf_counter()
+    for a in range(len(sample_keys)):
+        for b in range(a):
+            index._match(a, b)
+    elapsed = time.perf_counter() - started
+    per_pair = elapsed / _pairs([len(sample_keys)])
+    return {
+        "sample": len(sample_keys),
+        "per_pair_us": round(per_pair * 1e6, 3),
+        "estimated_s": round(per_pair * _pairs([rows]), 1),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--rows", type=int, default=200_000)
+    arg_parser.add_argument("--duplicate-rate", type=float, default=0.3, help="Share of rows that duplicate another")
+    arg_parser.add_argument("--all-pairs-sample", type=int, default=2000, help="Rows to time all-pairs matching on")
+    arg_parser.add_argument("--seed", type=int, default=7)
+    arg_parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = arg_parser.parse_args()
+
+    businesses, truth, regions = build_corpus(args.rows, args.duplicate_rate, args.seed)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    keys = [
+        (normalize_phone(business.phone, region), canonical_name(business.name), canonical_address(business.address))
+        for business, region in zip(businesses, regions)
+    ]
+    normalized = time.perf_counter()
+    index = DedupIndex()
+    roots = [index.add_keys(phone, name, address) for phone, name, address in keys]
+    matched = time.perf_counter()
+    predicted = [index.find(root) for root in roots]
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if platform.system() == "Darwin" else 1024
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    normalize_s, match_s = normalized - started, matched - normalized
+    results = {
+        "rows": args.rows,
+        "duplicate_rate": args.duplicate_rate,
+        "seed": args.seed,
+        "normalize_s": round(normalize_s, 3),
+        "match_s": round(match_s, 3),
+        "rows_per_sec": round(args.rows / (normalize_s + match_s), 1),
+        "comparisons_per_row": round(index.comparisons / args.rows, 2),
+        **index.stats(),
+        "true_distinct_businesses": len(set(truth)),
+        **pairwise_scores(predicted, truth),
+        "peak_rss_mb": round(peak_rss / 2**20, 1),
+        "rss_growth_mb": round((peak_rss - rss_before * scale) / 2**20, 1),
+        "all_pairs": all_pairs_estimate(keys, args.rows, args.all_pairs_sample),
+    }
+
+    print(
+        f"{args.rows} rows: normalize {results['normalize_s']} s, match {results['match_s']} s "
+        f"({results['rows_per_sec']} rows/s, {results['comparisons_per_row']} comparisons/row)"
+    )
+    print(
+        f"{results['distinct_businesses']} businesses found, {results['true_distinct_businesses']} expected; "
+        f"pairwise precision {results['precision']}, recall {results['recall']}; "
+        f"{results['full_blocks']} full blocks; peak RSS {results['peak_rss_mb']} MB"
+    )
+    if results["all_pairs"]:
+        print(
+            f"all-pairs: {results['all_pairs']['per_pair_us']} us/pair, "
+            f"~{results['all_pairs']['estimated_s']} s for {args.rows} rows"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Parse-throughput benchmark for GoogleScraperService result parsers.
+
+Runs every parser backend over the saved result pages in
+benchmarks/corpus/google_search, checks they all return identical
+businesses, and reports pages/sec per page and backend.
+
+Usage (from backend/):
+    python -m benchmarks.bench_google_parse [--iterations 20] [--json out.json]
+"""
+from pathlib import Path
+import argparse
+import json
+import statistics
+import time
+from app.services.google_parsers import get_result_parser, _PARSERS
+
+
+CORPUS_DIR = Path(__file__).parent / "corpus" / "google_search"
+
+
+def bench_page(parser, html_content: str, max_results: int, iterations: int) -> dict:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        parser.parse(html_content, max_results)
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "median_ms": round(median * 1000, 3),
+        "pages_per_sec": round(1 / median, 1) if median else None,
+        "mb_per_sec": round(len(html_content.encode()) / median / 1e6, 2) if median else None,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--corpus", type=Path, default=CORPUS_DIR)
+    arg_parser.add_argument("--iterations", type=int, default=20)
+    arg_parser.add_argument("--max-results", type=int, default=20)
+    arg_parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = arg_parser.parse_args()
+
+    parsers = [get_result_parser(name) for name in sorted(_PARSERS)]
+    pages = sorted(args.corpus.glob("*.html"))
+    if not pages:
+        raise SystemExit(f"No .html pages in {args.corpus}")
+
+    results = {"iterations": args.iterations, "max_results": args.max_results, "pages": {}}
+    mismatches = 0
+
+    for page in pages:
+        html_content = page.read_text(encoding="utf-8")
+        outputs = {
+            parser.name: [b.model_dump() for b in parser.parse(html_content, args.max_results)]
+            for parser in parsers
+        }
+        identical = all(output == outputs["soup"] for output in outputs.values())
+        mismatches += not identical
+
+        page_result = {
+            "bytes": len(html_content.encode()),
+            "businesses": len(outputs["soup"]),
+            "identical_output": identical,
+        }
+        for parser in parsers:
+            page_result[parser.name] = bench_page(parser, html_content, args.max_results, args.iterations)
+        results["pages"][page.name] = page_result
+
+        speeds = "  ".join(
+            f"{parser.name}: {page_result[parser.name]['median_ms']:8.2f} ms "
+            f"({page_result[parser.name]['pages_per_sec']} pages/s)"
+            for parser in parsers
+        )
+        flag = "" if identical else "  OUTPUT MISMATCH"
+        print(f"{page.name:32} {page_result['bytes'] / 1024:7.0f} KiB  {speeds}{flag}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.json}")
+
+    if mismatches:
+        raise SystemExit(f"{mismatches} page(s) produced different output across parsers")
+
+
+if __name__ == "__main__":
+    main()
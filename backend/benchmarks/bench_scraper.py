@@ -0,0 +1,301 @@
+"""
+Offline end-to-end scraper benchmark.
+
+Starts the local fixture server, points a scraper backend at it, and runs
+batches of searches at several concurrency levels. For each level it
+reports searches/sec, p50/p95 search latency, per-business extraction
+time and peak RSS (this process plus child processes such as Chromium).
+
+Searches go straight to the scraper, bypassing the cache and single-flight
+layers, so every search does the full amount of work.
+
+With --response-cache record, the browser's traffic for every search is
+saved; --response-cache replay then serves it from disk without starting
+the fixture server, so profiling runs are reproducible and offline. Both
+need the same --port, since the URLs are part of the recording.
+
+Usage (from backend/):
+    python -m benchmarks.bench_scraper [--backend playwright|http]
+        [--concurrency 1,2,4] [--searches 8] [--max-results 20]
+        [--detail-concurrency 1] [--tiling --radius-km 10 --feed-size 20]
+        [--response-cache off|cache|record|replay] [--response-cache-dir DIR] [--port 8765]
+        [--json out.json] [--baseline old.json]
+"""
+from pathlib import Path
+from prometheus_client import REGISTRY
+from typing import Optional
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import time
+from app.models import SearchCriteria
+from app.services.telemetry import configure_logging
+from benchmarks.fixture_server import FixtureServer
+
+
+INDUSTRIES = ["dentists", "plumbers", "restaurants", "gyms", "bakeries", "florists", "lawyers", "cafes"]
+
+
+class RssSampler:
+    """Samples resident memory of this process and its children, keeping the peak."""
+
+    def __init__(self, interval_s: float = 0.1):
+        self.interval_s = interval_s
+        self.peak_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.peak_bytes = self._current()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> int:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self.peak_bytes = max(self.peak_bytes, self._current())
+        return self.peak_bytes
+
+    async def _run(self):
+        while True:
+            self.peak_bytes = max(self.peak_bytes, self._current())
+            await asyncio.sleep(self.interval_s)
+
+    def _current(self) -> int:
+        if not Path("/proc/self/status").exists():
+            # No procfs (e.g. macOS): peak of this process only, in bytes
+            scale = 1 if platform.system() == "Darwin" else 1024
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        return sum(self._rss(pid) for pid in self._process_tree(os.getpid()))
+
+    def _process_tree(self, root: int) -> list[int]:
+        pids, stack = [], [root]
+        while stack:
+            pid = stack.pop()
+            pids.append(pid)
+            for children in Path(f"/proc/{pid}/task").glob("*/children"):
+                try:
+                    stack.extend(int(child) for child in children.read_text().split())
+                except OSError:
+                    pass
+        return pids
+
+    def _rss(self, pid: int) -> int:
+        try:
+            for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0
+
+
+def _stage_totals(stage: str) -> tuple[float, float]:
+    """(seconds, count) recorded so far for a telemetry stage."""
+    labels = {"stage": stage}
+    total = REGISTRY.get_sample_value("scraper_stage_seconds_sum", labels) or 0.0
+    count = REGISTRY.get_sample_value("scraper_stage_seconds_count", labels) or 0.0
+    return total, count
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_level(
+    service,
+    concurrency: int,
+    searches: int,
+    max_results: int,
+    detail_concurrency: Optional[int],
+    tiling: bool = False,
+    radius_km: int = 10,
+) -> dict:
+    """Run `searches` searches with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    businesses = 0
+    errors = 0
+
+    async def one(i: int):
+        nonlocal businesses, errors
+        criteria = SearchCriteria(
+            industry=INDUSTRIES[i % len(INDUSTRIES)],
+            location=f"Toronto {i}",
+            max_results=max_results,
+            detail_concurrency=detail_concurrency,
+            tiling=tiling,
+            radius_km=radius_km
+        )
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                found = await service.search_businesses(criteria)
+                businesses += len(found)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    extract_before = _stage_totals("extract_business")
+    sampler = RssSampler()
+    sampler.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(searches)))
+    wall = time.perf_counter() - started
+    peak_rss = await sampler.stop()
+    extract_after = _stage_totals("extract_business")
+
+    extract_seconds = extract_after[0] - extract_before[0]
+    extract_count = extract_after[1] - extract_before[1]
+    if extract_count:
+        # Playwright: time spent reading each listing's details
+        per_business = extract_seconds / extract_count
+    else:
+        # HTTP backend has no per-listing stage; spread search time over results
+        per_business = sum(latencies) / businesses if businesses else 0.0
+
+    return {
+        "concurrency": concurrency,
+        "searches": searches,
+        "errors": errors,
+        "businesses": businesses,
+        "wall_s": round(wall, 3),
+        "searches_per_sec": round(searches / wall, 3) if wall else None,
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+        "per_business_ms": round(per_business * 1000, 1),
+        "peak_rss_mb": round(peak_rss / 2**20, 1),
+    }
+
+
+async def build_service(backend: str, base_url: str, concurrency: int, response_cache=None):
+    """The raw scraper for `backend`, plus a cleanup coroutine."""
+    if backend == "http":
+        from app.services.google_scraper import GoogleScraperService
+        from app.services.http_client import HttpClient
+
+        http_client = HttpClient()
+        return GoogleScraperService(http_client=http_client, base_url=base_url), http_client.close
+
+    from app.services.browser_pool import BrowserPool
+    from app.services.playwright_scraper import PlaywrightScraperService
+
+    browser_pool = BrowserPool(max_contexts=concurrency, response_cache=response_cache)
+    await browser_pool.start()
+    return PlaywrightScraperService(browser_pool=browser_pool, base_url=base_url), browser_pool.stop
+
+
+async def run(args) -> dict:
+    response_cache = None
+    if args.response_cache != "off":
+        from app.services.response_cache import ResponseCache
+
+        response_cache = ResponseCache(args.response_cache_dir, mode=args.response_cache)
+    port = args.port
+    if port == 0 and args.response_cache in ("record", "replay"):
+        port = 8765
+    server = FixtureServer(port=port, latency_ms=args.latency_ms, feed_size=args.feed_size)
+    if args.response_cache == "replay":
+        # Everything comes from the recording
+        base_url = server.base_url
+    else:
+        base_url = await server.start()
+    results = {
+        "backend": args.backend,
+        "max_results": args.max_results,
+        "detail_concurrency": args.detail_concurrency,
+        "tiling": args.tiling,
+        "radius_km": args.radius_km,
+        "feed_size": args.feed_size,
+        "latency_ms": args.latency_ms,
+        "response_cache": args.response_cache,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "levels": [],
+    }
+    try:
+        for concurrency in args.concurrency:
+            service, cleanup = await build_service(args.backend, base_url, concurrency, response_cache)
+            try:
+                if args.warmup:
+                    await run_level(
+                        service, 1, 1, args.max_results, args.detail_concurrency, args.tiling, args.radius_km
+                    )
+                level = await run_level(
+                    service, concurrency, args.searches, args.max_results, args.detail_concurrency,
+                    args.tiling, args.radius_km
+                )
+            finally:
+                await cleanup()
+            results["levels"].append(level)
+            print(
+                f"c={concurrency:<3} {level['searches_per_sec']:>7} searches/s  "
+                f"p50 {level['p50_ms']:>8} ms  p95 {level['p95_ms']:>8} ms  "
+                f"{level['per_business_ms']:>7} ms/business  "
+                f"peak RSS {level['peak_rss_mb']:>7} MB  "
+                f"({level['businesses']} businesses, {level['errors']} errors)"
+            )
+    finally:
+        await server.stop()
+    if response_cache is not None:
+        results["response_cache_stats"] = response_cache.stats()
+    return results
+
+
+def compare(results: dict, baseline: dict):
+    """Print per-level changes against a previous run."""
+    previous = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    for level in results["levels"]:
+        old = previous.get(level["concurrency"])
+        if old is None:
+            continue
+        changes = []
+        for key in ("searches_per_sec", "p50_ms", "p95_ms", "per_business_ms", "peak_rss_mb"):
+            if old.get(key):
+                changes.append(f"{key} {(level[key] - old[key]) / old[key] * 100:+.1f}%")
+        print(f"c={level['concurrency']:<3} vs baseline: " + "  ".join(changes))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--backend", choices=["playwright", "http"], default="playwright")
+    arg_parser.add_argument(
+        "--concurrency", type=lambda s: [int(c) for c in s.split(",")], default=[1, 2, 4]
+    )
+    arg_parser.add_argument("--searches", type=int, default=8, help="Searches per concurrency level")
+    arg_parser.add_argument("--max-results", type=int, default=20)
+    arg_parser.add_argument("--detail-concurrency", type=int, default=None)
+    arg_parser.add_argument("--latency-ms", type=int, default=20, help="Simulated server latency")
+    arg_parser.add_argument("--tiling", action="store_true", help="Split each search into geo tiles (Playwright)")
+    arg_parser.add_argument("--radius-km", type=int, default=10)
+    arg_parser.add_argument("--feed-size", type=int, default=None, help="Listings per Maps viewport (default: all)")
+    arg_parser.add_argument(
+        "--response-cache", choices=["off", "cache", "record", "replay"], default="off",
+        help="Serve browser traffic through the disk response cache (Playwright)"
+    )
+    arg_parser.add_argument("--response-cache-dir", default="bench_response_cache")
+    arg_parser.add_argument(
+        "--port", type=int, default=0, help="Fixture server port (default: ephemeral, 8765 to record or replay)"
+    )
+    arg_parser.add_argument("--no-warmup", dest="warmup", action="store_false")
+    arg_parser.add_argument("--json", type=Path, help="Write results to this file")
+    arg_parser.add_argument("--baseline", type=Path, help="Compare against a previous --json output")
+    args = arg_parser.parse_args()
+
+    configure_logging(level="WARNING")
+    results = asyncio.run(run(args))
+
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text()))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
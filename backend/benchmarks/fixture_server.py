@@ -0,0 +1,164 @@
+"""
+Local stand-in for Google Maps and Google web search.
+
+Serves recorded pages so the scrapers can be benchmarked offline:
+- /maps/search/<query>[/@lat,lng,zoomz]: results feed that lazy-loads
+  listings on scroll and opens a details panel in place when a listing is
+  clicked; with feed_size set, each viewport shows its own window of
+  listings so geo tiles overlap without being identical
+- /maps/place/<slug>: a listing's place page (used by parallel tabs)
+- /search?q=...: one of the saved result pages in corpus/google_search
+
+Point the scrapers at it with GOOGLE_BASE_URL or their base_url argument.
+
+Usage (from backend/):
+    python -m benchmarks.fixture_server [--port 8765] [--latency-ms 20]
+"""
+from aiohttp import web
+from pathlib import Path
+from typing import Optional
+import argparse
+import asyncio
+import json
+import zlib
+
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+MAPS_TEMPLATE = CORPUS_DIR / "maps" / "maps.html"
+MAPS_LISTINGS = CORPUS_DIR / "maps" / "listings.json"
+SEARCH_PAGES_DIR = CORPUS_DIR / "google_search"
+
+
+class FixtureServer:
+    """aiohttp app serving the recorded Maps and web-search fixtures."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: int = 20,
+        batch_size: int = 7,
+        batch_delay_ms: int = 150,
+        panel_delay_ms: int = 80,
+        feed_size: Optional[int] = None,
+        center: str = "@43.653200,-79.383200,12z",
+    ):
+        self.host = host
+        self.port = port
+        self.latency_s = latency_ms / 1000
+        self.batch_size = batch_size
+        self.batch_delay_ms = batch_delay_ms
+        self.panel_delay_ms = panel_delay_ms
+        self.feed_size = feed_size
+        self.center = center
+
+        self.template = MAPS_TEMPLATE.read_text(encoding="utf-8")
+        self.listings = json.loads(MAPS_LISTINGS.read_text(encoding="utf-8"))
+        self.listings_by_slug = {listing["slug"]: listing for listing in self.listings}
+        self.search_pages = [
+            page.read_text(encoding="utf-8") for page in sorted(SEARCH_PAGES_DIR.glob("*.html"))
+        ]
+        self.requests_served = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._simulate_latency])
+        app.router.add_get("/maps/search/{query}", self.maps_search)
+        app.router.add_get("/maps/search/{query}/{viewport}", self.maps_search)
+        app.router.add_get("/maps/place/{slug}", self.maps_place)
+        app.router.add_get("/search", self.web_search)
+        return app
+
+    async def start(self) -> str:
+        """Start serving; returns the base URL."""
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Resolve the port when an ephemeral one (0) was requested
+        self.port = self._runner.addresses[0][1]
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _simulate_latency(self, request: web.Request, handler):
+        self.requests_served += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return await handler(request)
+
+    async def maps_search(self, request: web.Request) -> web.Response:
+        viewport = request.match_info.get("viewport", self.center)
+        return self._render_maps({
+            "mode": "feed",
+            "query": request.match_info["query"].replace("+", " "),
+            "viewport": viewport,
+            "listings": self._feed_listings(viewport),
+        })
+
+    def _feed_listings(self, viewport: str) -> list[dict]:
+        if not self.feed_size:
+            return self.listings
+        # Same viewport, same window, so runs are repeatable
+        start = zlib.crc32(viewport.encode()) % len(self.listings)
+        rotated = self.listings[start:] + self.listings[:start]
+        return rotated[:self.feed_size]
+
+    async def maps_place(self, request: web.Request) -> web.Response:
+        listing = self.listings_by_slug.get(request.match_info["slug"])
+        if listing is None:
+            raise web.HTTPNotFound()
+        return self._render_maps({"mode": "place", "listing": listing})
+
+    async def web_search(self, request: web.Request) -> web.Response:
+        # Same query, same page, so runs are repeatable
+        query = request.query.get("q", "")
+        page = self.search_pages[zlib.crc32(query.encode()) % len(self.search_pages)]
+        return web.Response(text=page, content_type="text/html")
+
+    def _render_maps(self, data: dict) -> web.Response:
+        data.update(
+            batchSize=self.batch_size,
+            batchDelayMs=self.batch_delay_ms,
+            panelDelayMs=self.panel_delay_ms,
+        )
+        payload = json.dumps(data).replace("</", "<\\/")
+        html = self.template.replace("/*FIXTURE_DATA*/null", payload)
+        return web.Response(text=html, content_type="text/html")
+
+
+async def _serve(args):
+    server = FixtureServer(
+        host=args.host, port=args.port, latency_ms=args.latency_ms, feed_size=args.feed_size
+    )
+    base_url = await server.start()
+    print(f"Serving fixtures at {base_url} (GOOGLE_BASE_URL={base_url})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--latency-ms", type=int, default=20)
+    arg_parser.add_argument("--feed-size", type=int, default=None, help="Listings per viewport (default: all)")
+    args = arg_parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Shared fixtures.
+
+Async tests are marked with @pytest.mark.anyio; anyio (a FastAPI
+dependency) ships the pytest plugin, and they run on asyncio only.
+"""
+from typing import AsyncIterator, Optional
+import pytest
+from app.models import SearchCriteria, Business
+from app.services.interfaces import IBusinessSearchService
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeSearchService(IBusinessSearchService):
+    """Returns canned businesses and counts how often it was asked."""
+
+    def __init__(self, businesses: Optional[list[Business]] = None):
+        self.businesses = businesses or []
+        self.calls = 0
+
+    async def search_businesses(self, criteria: SearchCriteria) -> list[Business]:
+        self.calls += 1
+        return self.businesses[:criteria.max_results]
+
+    async def stream_businesses(self, criteria: SearchCriteria) -> AsyncIterator[Business]:
+        self.calls += 1
+        for business in self.businesses[:criteria.max_results]:
+            yield business
+
+
+@pytest.fixture
+def fake_service():
+    """The FakeSearchService class, to build with whatever businesses a test needs."""
+    return FakeSearchService
+
+
+@pytest.fixture
+def make_businesses():
+    """make_businesses(n): n distinct businesses named 'Business 0'..."""
+    return lambda count: [Business(name=f"Business {i}") for i in range(count)]
@@ -0,0 +1,98 @@
+import sqlite3
+import pytest
+from app.models import SearchCriteria, Business
+from app.services import geo_tiling
+from app.services.business_store import BusinessStore, StoreBackedSearchService, run_key
+
+
+pytestmark = pytest.mark.anyio
+
+
+def criteria(**overrides) -> SearchCriteria:
+    return SearchCriteria(**{"industry": "Pizza", "location": "Toronto", "max_results": 3, **overrides})
+
+
+@pytest.fixture
+def store(tmp_path) -> BusinessStore:
+    return BusinessStore(str(tmp_path / "store.sqlite3"), default_max_age_s=3600)
+
+
+def names(businesses) -> list[str]:
+    return [b.name for b in businesses]
+
+
+async def test_repeat_search_is_answered_from_the_store(store):
+    await store.record(criteria(), [Business(name="A", phone="416 555 0100"), Business(name="B")])
+    assert names(await store.fresh_search(criteria())) == ["A", "B"]
+    assert names(await store.fresh_search(criteria(industry=" pizza", location="TORONTO"))) == ["A", "B"]
+
+
+async def test_radius_and_tiling_are_separate_runs(store):
+    await store.record(criteria(radius_km=5, tiling=False), [Business(name="near")])
+    assert await store.fresh_search(criteria(radius_km=50, tiling=False)) is None
+    assert await store.fresh_search(criteria(radius_km=5, tiling=True)) is None
+    await store.record(criteria(radius_km=50, tiling=True), [Business(name="far")])
+    assert names(await store.fresh_search(criteria(radius_km=5, tiling=False))) == ["near"]
+    assert names(await store.fresh_search(criteria(radius_km=50, tiling=True))) == ["far"]
+
+
+async def test_unset_tiling_follows_geo_tiling(store, monkeypatch):
+    monkeypatch.setattr(geo_tiling, "GEO_TILING", True)
+    assert run_key(criteria()) == run_key(criteria(tiling=True))
+    await store.record(criteria(), [Business(name="tiled")])
+    assert names(await store.fresh_search(criteria(tiling=True))) == ["tiled"]
+    assert await store.fresh_search(criteria(tiling=False)) is None
+
+
+async def test_max_age_s_zero_always_scrapes(store):
+    await store.record(criteria(), [Business(name="A")])
+    assert await store.fresh_search(criteria(max_age_s=0)) is None
+
+
+async def test_smaller_run_does_not_answer_larger_request_unless_exhausted(store):
+    await store.record(criteria(max_results=2), [Business(name="A"), Business(name="B")])
+    assert await store.fresh_search(criteria(max_results=5)) is None
+    await store.record(criteria(max_results=2), [Business(name="A")])
+    assert names(await store.fresh_search(criteria(max_results=5))) == ["A"]
+
+
+async def test_same_phone_and_name_is_one_row(store):
+    await store.record(criteria(), [Business(name="A", phone="(416) 555-0100")])
+    await store.record(criteria(location="Ottawa"), [Business(name="A", phone="416-555-0100", website="https://a.example")])
+    assert store.stats()["businesses"] == 1
+    assert (await store.fresh_search(criteria()))[0].website == "https://a.example"
+
+
+async def test_runs_without_radius_are_dropped_on_startup(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE search_runs (industry TEXT NOT NULL, location TEXT NOT NULL, max_results INTEGER NOT NULL,"
+        " result_count INTEGER NOT NULL, stored_count INTEGER NOT NULL, run_at REAL NOT NULL,"
+        " PRIMARY KEY (industry, location));"
+        "CREATE TABLE business_searches (industry TEXT NOT NULL, location TEXT NOT NULL,"
+        " business_id INTEGER NOT NULL, rank INTEGER NOT NULL, run_at REAL NOT NULL,"
+        " PRIMARY KEY (industry, location, business_id));"
+        "INSERT INTO search_runs VALUES ('pizza', 'toronto', 3, 1, 1, 0);"
+    )
+    conn.commit()
+    conn.close()
+    store = BusinessStore(path, default_max_age_s=3600)
+    assert store.stats()["searches"] == 0
+    await store.record(criteria(), [Business(name="A")])
+    assert names(await store.fresh_search(criteria())) == ["A"]
+
+
+async def test_store_backed_service_records_and_serves(store, fake_service):
+    inner = fake_service([Business(name="A"), Business(name="B")])
+    service = StoreBackedSearchService(inner, store)
+    assert names(await service.search_businesses(criteria())) == ["A", "B"]
+    assert names([b async for b in service.stream_businesses(criteria())]) == ["A", "B"]
+    assert inner.calls == 1
+
+
+async def test_export_reads_the_latest_run(store):
+    await store.record(criteria(radius_km=5), [Business(name="near")])
+    await store.record(criteria(radius_km=50), [Business(name="far"), Business(name="farther")])
+    pages = [names(page) async for page in store.iter_businesses("pizza", "toronto", batch_size=1)]
+    assert pages == [["far"], ["farther"]]
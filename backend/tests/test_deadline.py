@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from app.models import SearchCriteria, Business
+from app.services import deadline as deadline_module
+from app.services.deadline import (
+    deadline_scope, deadline_expired, time_left_s, clamp_timeout_ms, mark_partial, is_partial,
+    stream_within_budget, search_within_budget
+)
+
+
+CRITERIA = SearchCriteria(industry="pizza", location="toronto")
+
+
+class SlowService:
+    """Yields a business every `interval_s`, ignoring any deadline."""
+
+    def __init__(self, count: int, interval_s: float):
+        self.count = count
+        self.interval_s = interval_s
+        self.cancelled = False
+
+    async def search_businesses(self, criteria):
+        return [b async for b in self.stream_businesses(criteria)]
+
+    async def stream_businesses(self, criteria):
+        try:
+            for i in range(self.count):
+                await asyncio.sleep(self.interval_s)
+                yield Business(name=f"Business {i}")
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+class TestScope:
+    def test_no_budget_leaves_no_deadline(self):
+        with deadline_scope(None) as deadline:
+            assert deadline is None
+            assert time_left_s() is None
+            assert not deadline_expired()
+            assert clamp_timeout_ms(5000) == 5000
+            mark_partial()
+            assert not is_partial()
+
+    def test_budget_applies_inside_the_block_only(self):
+        with deadline_scope(10) as deadline:
+            assert 9 < time_left_s() <= 10
+            assert clamp_timeout_ms(60_000) <= 10_000
+            assert clamp_timeout_ms(500) == 500
+            mark_partial()
+            assert is_partial() and deadline.partial
+        assert time_left_s() is None
+
+    def test_expired_deadline_clamps_to_one_ms(self):
+        with deadline_scope(0.001):
+            deadline_module.deadline_var.get().at -= 1
+            assert deadline_expired()
+            # 0 would mean no timeout to Playwright
+            assert clamp_timeout_ms(5000) == 1
+
+
+@pytest.mark.anyio
+class TestStreamWithinBudget:
+    async def test_without_deadline_streams_everything(self):
+        items = [b async for b in stream_within_budget(SlowService(3, 0), CRITERIA)]
+        assert len(items) == 3
+
+    async def test_cuts_off_after_the_grace_period(self, monkeypatch):
+        monkeypatch.setattr(deadline_module, "DEADLINE_GRACE_S", 0.1)
+        service = SlowService(100, 0.05)
+        with deadline_scope(0.1) as deadline:
+            items = [b async for b in stream_within_budget(service, CRITERIA)]
+        # Roughly budget + grace worth of businesses, then the scraper is cancelled
+        assert 0 < len(items) < 10
+        assert deadline.partial
+        assert service.cancelled
+
+    async def test_finishing_in_time_is_not_partial(self, monkeypatch):
+        monkeypatch.setattr(deadline_module, "DEADLINE_GRACE_S", 0.1)
+        with deadline_scope(5) as deadline:
+            items = [b async for b in stream_within_budget(SlowService(3, 0.01), CRITERIA)]
+        assert len(items) == 3
+        assert not deadline.partial
+
+    async def test_errors_from_the_search_propagate(self):
+        class Failing:
+            async def stream_businesses(self, criteria):
+                raise RuntimeError("boom")
+                yield
+
+        with deadline_scope(5):
+            with pytest.raises(RuntimeError, match="boom"):
+                [b async for b in stream_within_budget(Failing(), CRITERIA)]
+
+    async def test_closing_the_stream_cancels_the_search(self):
+        service = SlowService(100, 0.01)
+        with deadline_scope(5):
+            stream = stream_within_budget(service, CRITERIA)
+            await stream.__anext__()
+            await stream.aclose()
+        await asyncio.sleep(0)
+        assert service.cancelled
+
+
+@pytest.mark.anyio
+async def test_search_within_budget_reports_partial(monkeypatch):
+    monkeypatch.setattr(deadline_module, "DEADLINE_GRACE_S", 0.05)
+    budgeted = CRITERIA.model_copy(update={"time_budget_s": 0.05})
+    businesses, partial = await search_within_budget(SlowService(100, 0.02), budgeted)
+    assert partial and businesses
+    businesses, partial = await search_within_budget(SlowService(2, 0), CRITERIA)
+    assert (len(businesses), partial) == (2, False)
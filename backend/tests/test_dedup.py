@@ -0,0 +1,160 @@
+import pytest
+from app.models import Business
+from app.services.dedup import (
+    DedupIndex, normalize_phone, format_phone, canonical_address, canonical_name, name_similarity,
+    merge_businesses, dedupe_businesses
+)
+
+
+@pytest.mark.parametrize("phone, region, expected", [
+    ("(416) 555-0123", "US", "+14165550123"),
+    ("1-416-555-0123", "US", "+14165550123"),
+    ("+1 416 555 0123", "GB", "+14165550123"),
+    ("416.555.0123 ext. 12", "US", "+14165550123"),
+    ("416-555-0123 x5", "CA", "+14165550123"),
+    ("011 44 20 7946 0958", "US", "+442079460958"),
+    ("020 7946 0958", "GB", "+442079460958"),
+    ("0044 20 7946 0958", "DE", "+442079460958"),
+    ("030 123456", "DE", "+4930123456"),
+    ("06 1234 5678", "IT", "+390612345678"),
+    ("555-0123", "US", None),
+    ("12345", "GB", None),
+    ("+1234567890123456", "US", None),
+    ("", "US", None),
+    (None, "US", None),
+])
+def test_normalize_phone(phone, region, expected):
+    assert normalize_phone(phone, region) == expected
+
+
+def test_unknown_region_reads_as_north_american():
+    assert normalize_phone("416 555 0123", "XX") == "+14165550123"
+
+
+def test_format_phone():
+    assert format_phone("+14165550123") == "(416) 555-0123"
+    assert format_phone("+442079460958") == "+442079460958"
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("123 Main Street, Toronto", "123 main st toronto"),
+    ("123 Main St., Toronto, Canada", "123 main st toronto"),
+    ("5 Saint-Laurent Boulevard Suite #200", "5 st laurent blvd unit 200"),
+    ("10 Rue de l'Église, Montréal", "10 rue de l eglise montreal"),
+    ("1 Bay Street, USA", "1 bay st"),
+    ("USA", "usa"),
+    (None, ""),
+])
+def test_canonical_address(address, expected):
+    assert canonical_address(address) == expected
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("The Pizza Place Inc.", "pizza place"),
+    ("Joe's Café & Bar LLC", "joes cafe and bar"),
+    ("Company", "company"),
+    ("The", "the"),
+    (None, ""),
+])
+def test_canonical_name(name, expected):
+    assert canonical_name(name) == expected
+
+
+def test_name_similarity():
+    assert name_similarity("pizza place", "pizza place") == 1.0
+    assert name_similarity("pizza place", "pizza palace") > 0.5
+    assert name_similarity("pizza place", "dental clinic") < 0.1
+
+
+class TestDedupIndex:
+    def test_same_phone_and_similar_name_match(self):
+        index = DedupIndex()
+        assert index.add(Business(name="Joe's Pizza", phone="(416) 555-0123")) == 0
+        assert index.add(Business(name="Joes Pizza Inc", phone="+1 416-555-0123")) == 0
+
+    def test_same_phone_different_business_does_not_match(self):
+        index = DedupIndex()
+        index.add(Business(name="Joe's Pizza", phone="416 555 0123"))
+        assert index.add(Business(name="Acme Dental", phone="416 555 0123")) == 1
+
+    def test_same_name_and_address_match(self):
+        index = DedupIndex()
+        index.add(Business(name="Maple Bakery", address="12 King Street West, Toronto"))
+        assert index.add(Business(name="The Maple Bakery", address="12 King St W, Toronto, Canada")) == 0
+
+    def test_chain_branches_at_different_addresses_stay_apart(self):
+        index = DedupIndex()
+        index.add(Business(name="Starbucks", address="1 Bay St, Toronto"))
+        assert index.add(Business(name="Starbucks", address="200 Bay St, Toronto")) == 1
+
+    def test_different_phones_never_match(self):
+        index = DedupIndex()
+        index.add(Business(name="Maple Bakery", phone="416 555 0123", address="12 King St"))
+        assert index.add(Business(name="Maple Bakery", phone="416 555 9999", address="12 King St")) == 1
+
+    def test_bare_name_joins_its_only_group(self):
+        index = DedupIndex()
+        index.add(Business(name="Maple Bakery", address="12 King St"))
+        assert index.add(Business(name="Maple Bakery")) == 0
+
+    def test_bare_name_does_not_bridge_two_branches(self):
+        index = DedupIndex()
+        index.add(Business(name="Starbucks", address="1 Bay St"))
+        index.add(Business(name="Starbucks", address="200 Bay St"))
+        index.add(Business(name="Starbucks"))
+        assert index.groups() == []
+
+    def test_union_find_is_transitive(self):
+        index = DedupIndex()
+        # a and c share nothing directly; b links them by phone and by address
+        index.add(Business(name="Maple Bakery", phone="416 555 0123"))
+        index.add(Business(name="Maple Bakery", phone="416 555 0123", address="12 King St"))
+        index.add(Business(name="Maple Bakery Ltd", address="12 King Street"))
+        assert index.groups() == [[0, 1, 2]]
+        assert index.stats()["distinct_businesses"] == 1
+
+    def test_groups_keep_the_first_business_as_root(self):
+        index = DedupIndex()
+        index.add(Business(name="Other", phone="416 555 9999"))
+        index.add(Business(name="Maple Bakery", phone="416 555 0123"))
+        index.add(Business(name="Maple Bakery", phone="416 555 0123"))
+        assert index.groups() == [[1, 2]]
+        assert index.find(2) == 1
+
+    def test_blocking_avoids_comparing_everything(self):
+        index = DedupIndex()
+        for i in range(200):
+            index.add(Business(name=f"Shop number {i}", phone=f"416 555 {i:04d}", address=f"{i + 1} Main St"))
+        assert index.comparisons < 200 * 5
+        assert index.groups() == []
+
+    def test_full_blocks_stop_growing(self):
+        index = DedupIndex(max_block=4)
+        for i in range(10):
+            index.add(Business(name="Starbucks", address=f"{i + 1} Bay St"))
+        assert index.full_blocks == 1
+        assert len(index._blocks["nstarbucks"]) == 4
+
+
+def test_merge_fills_gaps_and_takes_the_most_reviewed_rating():
+    merged = merge_businesses([
+        Business(name="Maple Bakery", phone="1", rating=3.0, reviews_count=2, social_links={"x": "a"}),
+        Business(name="Maple Bakery Ltd", website="https://maple.example", rating=4.6, reviews_count=120,
+                 social_links={"x": "b", "instagram": "c"}),
+    ])
+    assert merged.name == "Maple Bakery"
+    assert merged.phone == "1"
+    assert merged.website == "https://maple.example"
+    assert (merged.rating, merged.reviews_count) == (4.6, 120)
+    assert merged.social_links == {"x": "a", "instagram": "c"}
+
+
+def test_dedupe_businesses_merges_in_order_and_normalizes_phones():
+    result = dedupe_businesses([
+        Business(name="Maple Bakery", phone="+1 416 555 0123"),
+        Business(name="Acme Dental", phone="416-555-9999"),
+        Business(name="Maple Bakery Inc.", phone="4165550123", address="12 King St"),
+    ])
+    assert [b.name for b in result] == ["Maple Bakery", "Acme Dental"]
+    assert result[0].phone == "(416) 555-0123"
+    assert result[0].address == "12 King St"
@@ -0,0 +1,135 @@
+import csv
+import gzip
+import io
+import random
+import zipfile
+import pytest
+from lxml import etree
+from app.models import Business, SearchCriteria
+from app.services.exporters import (
+    CsvRowWriter, XlsxRowWriter, EXPORT_COLUMNS, business_row, encode_rows, accepts_gzip, gzip_chunks
+)
+
+
+SHEET_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+TRICKY = Business(
+    name='Joe\'s "Best", Pizza\nand more',
+    phone="(416) 555-0100",
+    address="1 <Main> & King St",
+    rating=4.5,
+    reviews_count=12,
+    social_links={"facebook": "https://facebook.com/joes"},
+)
+
+
+def write(writer, batches: list[list[list]]) -> bytes:
+    return b"".join(writer.write_rows(rows) for rows in batches) + writer.finish()
+
+
+def test_business_row_follows_export_columns():
+    row = business_row(TRICKY, SearchCriteria(industry="pizza", location="toronto"))
+    values = dict(zip(EXPORT_COLUMNS, row))
+    assert len(row) == len(EXPORT_COLUMNS)
+    assert values["industry"] == "pizza"
+    assert values["name"] == TRICKY.name
+    assert values["facebook"] == "https://facebook.com/joes"
+    assert business_row(TRICKY)[0] is None
+
+
+class TestCsv:
+    def test_quotes_commas_quotes_and_newlines(self):
+        data = write(CsvRowWriter(), [[business_row(TRICKY)], [business_row(Business(name="Plain"))]])
+        rows = list(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))
+        assert rows[0] == list(EXPORT_COLUMNS)
+        assert rows[1][EXPORT_COLUMNS.index("name")] == TRICKY.name
+        assert rows[1][EXPORT_COLUMNS.index("rating")] == "4.5"
+        assert rows[2][EXPORT_COLUMNS.index("phone")] == ""
+        assert len(rows) == 3
+
+    def test_each_batch_is_returned_as_it_is_written(self):
+        writer = CsvRowWriter()
+        assert writer.write_rows([business_row(TRICKY)])
+        assert writer.finish() == b""
+
+
+class TestXlsx:
+    def sheet(self, data: bytes) -> etree._Element:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        assert archive.testzip() is None
+        assert {"[Content_Types].xml", "_rels/.rels", "xl/workbook.xml", "xl/_rels/workbook.xml.rels"} \
+            <= set(archive.namelist())
+        return etree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+
+    def test_is_a_valid_zip_with_one_row_per_business(self):
+        data = write(XlsxRowWriter(), [[business_row(TRICKY)] * 3, [business_row(Business(name="Plain"))]])
+        rows = self.sheet(data).findall(".//s:row", SHEET_NS)
+        assert len(rows) == 5
+        header = [t.text for t in rows[0].findall(".//s:t", SHEET_NS)]
+        assert header == list(EXPORT_COLUMNS)
+
+    def test_escapes_text_and_keeps_numbers_numeric(self):
+        data = write(XlsxRowWriter(), [[business_row(TRICKY)]])
+        cells = self.sheet(data).findall(".//s:row", SHEET_NS)[1].findall("s:c", SHEET_NS)
+        name = cells[EXPORT_COLUMNS.index("name")]
+        assert name.get("t") == "inlineStr"
+        assert name.find(".//s:t", SHEET_NS).text == TRICKY.name
+        assert cells[EXPORT_COLUMNS.index("address")].find(".//s:t", SHEET_NS).text == TRICKY.address
+        rating = cells[EXPORT_COLUMNS.index("rating")]
+        assert rating.get("t") is None and rating.find("s:v", SHEET_NS).text == "4.5"
+        assert cells[EXPORT_COLUMNS.index("email")].find("s:v", SHEET_NS) is None
+
+    def test_drops_characters_xml_cannot_hold(self):
+        data = write(XlsxRowWriter(), [[business_row(Business(name="Bad\x00\x0bName\x1f"))]])
+        cell = self.sheet(data).findall(".//s:row", SHEET_NS)[1].findall("s:c", SHEET_NS)[EXPORT_COLUMNS.index("name")]
+        assert cell.find(".//s:t", SHEET_NS).text == "BadName"
+
+    def test_streams_instead_of_buffering(self):
+        rng = random.Random(7)
+        writer = XlsxRowWriter()
+        chunks = [
+            writer.write_rows([
+                business_row(Business(name=f"{rng.getrandbits(64):x}", phone=str(rng.getrandbits(30))))
+                for _ in range(2000)
+            ])
+            for _ in range(3)
+        ]
+        # Every batch hands back compressed bytes rather than holding the sheet until finish()
+        assert all(chunks)
+        assert zipfile.ZipFile(io.BytesIO(b"".join(chunks) + writer.finish())).testzip() is None
+
+
+@pytest.mark.anyio
+async def test_encode_rows_skips_empty_batches_and_finishes():
+    async def batches():
+        yield [business_row(TRICKY)]
+        yield []
+        yield [business_row(Business(name="Plain"))]
+
+    data = b"".join([chunk async for chunk in encode_rows(CsvRowWriter(), batches())])
+    assert len(list(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))) == 3
+
+
+@pytest.mark.anyio
+async def test_gzip_chunks_round_trip():
+    async def chunks():
+        for i in range(100):
+            yield f"line {i}\n".encode()
+
+    data = b"".join([chunk async for chunk in gzip_chunks(chunks())])
+    assert gzip.decompress(data) == b"".join(f"line {i}\n".encode() for i in range(100))
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("deflate, gzip;q=0.5", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip;q=0.0", False),
+    ("gzip;q=bad", False),
+    ("br, deflate", False),
+    ("", False),
+    (None, False),
+])
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+from app.models import SearchCriteria, Business
+from app.services import rate_limiter
+from app.services.rate_limiter import (
+    TokenBucket, HostRateLimiter, RateLimitedSearchService, ThrottledError, is_empty_result
+)
+
+
+class Clock:
+    """Stands in for time.monotonic and asyncio.sleep in the rate limiter."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", clock.sleep)
+    # No jitter, so backoff is exact
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: 1.0)
+    return clock
+
+
+class TestTokenBucket:
+    def test_burst_then_waits_for_refill(self):
+        bucket = TokenBucket(rate_per_s=0.5, capacity=2)
+        now = bucket.updated
+        for _ in range(2):
+            assert bucket.delay(now) == 0
+            bucket.take()
+        assert bucket.delay(now) == pytest.approx(2.0)
+        assert bucket.delay(now + 1) == pytest.approx(1.0)
+        assert bucket.delay(now + 2) == 0
+
+    def test_refill_is_capped_at_capacity(self):
+        bucket = TokenBucket(rate_per_s=1, capacity=3)
+        bucket.delay(bucket.updated + 3600)
+        assert bucket.tokens == 3
+
+
+@pytest.mark.anyio
+class TestHostRateLimiter:
+    async def test_acquire_paces_after_the_burst(self, clock):
+        limiter = HostRateLimiter(rate_per_min=60, burst=2)
+        for _ in range(3):
+            await limiter.acquire("google.com")
+        assert clock.slept == [pytest.approx(1.0)]
+        assert limiter.stats()["hosts"]["google.com"]["granted"] == 3
+
+    async def test_hosts_have_their_own_buckets(self, clock):
+        limiter = HostRateLimiter(rate_per_min=60, burst=1)
+        await limiter.acquire("a")
+        await limiter.acquire("b")
+        assert clock.slept == []
+
+    async def test_backoff_doubles_per_strike_up_to_the_max(self, clock):
+        limiter = HostRateLimiter(rate_per_min=0, backoff_s=10, backoff_max_s=25)
+        blocked = []
+        for _ in range(3):
+            limiter.penalize("a", "captcha")
+            blocked.append(limiter.stats()["hosts"]["a"]["blocked_for_s"])
+        # 10, then 20, then 40 capped at 25
+        assert blocked == [10, 20, 25]
+
+    async def test_acquire_waits_out_the_backoff(self, clock):
+        limiter = HostRateLimiter(rate_per_min=0, backoff_s=30)
+        limiter.penalize("a", "captcha")
+        await limiter.acquire("a")
+        assert sum(clock.slept) == pytest.approx(30)
+
+    async def test_success_resets_strikes(self, clock):
+        limiter = HostRateLimiter(rate_per_min=0, backoff_s=10)
+        limiter.penalize("a", "captcha")
+        limiter.record_result("a", empty=False)
+        clock.now += 100
+        limiter.penalize("a", "captcha")
+        assert limiter.stats()["hosts"]["a"]["blocked_for_s"] == 10
+
+    async def test_run_of_empty_results_is_a_strike(self, clock):
+        limiter = HostRateLimiter(rate_per_min=0, backoff_s=10, empty_streak=3)
+        for _ in range(2):
+            limiter.record_result("a", empty=True)
+        assert limiter.stats()["hosts"]["a"]["throttled"] == 0
+        limiter.record_result("a", empty=True)
+        assert limiter.stats()["hosts"]["a"]["throttled"] == 1
+
+
+def test_is_empty_result():
+    assert is_empty_result([])
+    assert is_empty_result([Business(name="none")], placeholder_name="none")
+    assert not is_empty_result([Business(name="none")])
+    assert not is_empty_result([Business(name="a"), Business(name="none")], placeholder_name="none")
+
+
+@pytest.mark.anyio
+class TestRateLimitedSearchService:
+    async def test_throttled_search_penalizes_the_host(self, clock):
+        class Throttled:
+            async def search_businesses(self, criteria):
+                raise ThrottledError("consent page")
+
+        limiter = HostRateLimiter(rate_per_min=0, backoff_s=10)
+        service = RateLimitedSearchService(Throttled(), limiter, "google.com")
+        with pytest.raises(ThrottledError):
+            await service.search_businesses(SearchCriteria(industry="a", location="b"))
+        assert limiter.stats()["hosts"]["google.com"]["throttled"] == 1
+
+    async def test_each_scrape_takes_a_token(self, clock, fake_service, make_businesses):
+        limiter = HostRateLimiter(rate_per_min=60, burst=1)
+        service = RateLimitedSearchService(fake_service(make_businesses(2)), limiter, "google.com")
+        criteria = SearchCriteria(industry="a", location="b")
+        await service.search_businesses(criteria)
+        assert [b async for b in service.stream_businesses(criteria)] == make_businesses(2)
+        assert limiter.stats()["hosts"]["google.com"]["granted"] == 2
+        assert clock.slept == [pytest.approx(1.0)]
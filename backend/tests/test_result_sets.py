@@ -0,0 +1,127 @@
+import base64
+import json
+import pytest
+from app.models import Business, ResultSetQuery, ResultSetSort, SortOrder
+from app.services.result_sets import ResultSetStore, InvalidCursorError, _encode_cursor, _decode_cursor
+
+
+BUSINESSES = [
+    Business(name="bravo", rating=4.5, reviews_count=10, phone="1"),
+    Business(name="Alpha", rating=None, reviews_count=200, website="https://a.example"),
+    Business(name="charlie", rating=3.0, reviews_count=None, phone="2", email="c@example.com"),
+    Business(name="delta", rating=4.5, reviews_count=5),
+]
+
+
+@pytest.fixture
+def store() -> ResultSetStore:
+    return ResultSetStore()
+
+
+@pytest.fixture
+def result_set(store):
+    return store.create("q", businesses=BUSINESSES, partial=False)
+
+
+def names(page) -> list[str]:
+    return [row.business.name for row in page.rows]
+
+
+class TestViews:
+    def test_rank_order_and_reversed(self, store, result_set):
+        assert names(store.page(result_set, ResultSetQuery())) == ["bravo", "Alpha", "charlie", "delta"]
+        assert names(store.page(result_set, ResultSetQuery(order=SortOrder.DESC))) == \
+            ["delta", "charlie", "Alpha", "bravo"]
+
+    def test_sort_is_stable_and_puts_missing_values_last(self, store, result_set):
+        page = store.page(result_set, ResultSetQuery(sort=ResultSetSort.RATING, order=SortOrder.DESC))
+        # bravo and delta tie at 4.5 and keep the search's order; Alpha has no rating
+        assert names(page) == ["bravo", "delta", "charlie", "Alpha"]
+        page = store.page(result_set, ResultSetQuery(sort=ResultSetSort.RATING))
+        assert names(page) == ["charlie", "bravo", "delta", "Alpha"]
+
+    def test_name_sort_ignores_case(self, store, result_set):
+        assert names(store.page(result_set, ResultSetQuery(sort=ResultSetSort.NAME))) == \
+            ["Alpha", "bravo", "charlie", "delta"]
+
+    def test_filters(self, store, result_set):
+        assert names(store.page(result_set, ResultSetQuery(min_rating=4))) == ["bravo", "delta"]
+        assert names(store.page(result_set, ResultSetQuery(min_reviews=10))) == ["bravo", "Alpha"]
+        assert names(store.page(result_set, ResultSetQuery(has_phone=True))) == ["bravo", "charlie"]
+        assert names(store.page(result_set, ResultSetQuery(has_phone=False, has_website=False))) == ["delta"]
+        assert names(store.page(result_set, ResultSetQuery(has_email=True))) == ["charlie"]
+
+    def test_rows_keep_their_search_index(self, store, result_set):
+        page = store.page(result_set, ResultSetQuery(sort=ResultSetSort.REVIEWS_COUNT, order=SortOrder.DESC))
+        assert [row.index for row in page.rows] == [1, 0, 3, 2]
+        assert page.matching_results == page.total_results == 4
+
+    def test_views_are_rebuilt_after_an_update(self, store, result_set):
+        query = ResultSetQuery(has_email=True)
+        assert names(store.page(result_set, query)) == ["charlie"]
+        result_set.update(0, BUSINESSES[0].model_copy(update={"email": "b@example.com"}))
+        assert names(store.page(result_set, query)) == ["bravo", "charlie"]
+
+
+class TestCursors:
+    def test_pages_through_a_view(self, store, result_set):
+        query = ResultSetQuery(sort=ResultSetSort.NAME, limit=3)
+        first = store.page(result_set, query)
+        assert names(first) == ["Alpha", "bravo", "charlie"]
+        assert first.next_cursor is not None
+        second = store.page(result_set, query.model_copy(update={"cursor": first.next_cursor}))
+        assert names(second) == ["delta"]
+        assert second.next_cursor is None
+
+    def test_round_trip(self):
+        query = ResultSetQuery(min_rating=3.5, has_phone=True)
+        cursor = _encode_cursor(query, 75)
+        assert "=" not in cursor
+        assert _decode_cursor(query, cursor) == 75
+
+    def test_cursor_of_another_view_is_rejected(self):
+        cursor = _encode_cursor(ResultSetQuery(sort=ResultSetSort.NAME), 25)
+        with pytest.raises(InvalidCursorError):
+            _decode_cursor(ResultSetQuery(sort=ResultSetSort.RATING), cursor)
+
+    @pytest.mark.parametrize("cursor", [
+        "not base64!",
+        base64.urlsafe_b64encode(b"[1, 2]").decode(),
+        base64.urlsafe_b64encode(json.dumps({"view": [], "offset": "x"}).encode()).decode(),
+    ])
+    def test_malformed_cursor_is_rejected(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            _decode_cursor(ResultSetQuery(), cursor)
+
+    def test_negative_offset_is_rejected(self):
+        query = ResultSetQuery()
+        with pytest.raises(InvalidCursorError):
+            _decode_cursor(query, _encode_cursor(query, -1))
+
+
+class TestStore:
+    def test_streamed_result_set_is_incomplete_until_finished(self, store):
+        result_set = store.create("q")
+        result_set.add(BUSINESSES[0])
+        assert not store.page(result_set, ResultSetQuery()).complete
+        result_set.finish(partial=True)
+        page = store.page(result_set, ResultSetQuery())
+        assert page.complete and page.partial
+
+    def test_evicts_least_recently_read(self):
+        store = ResultSetStore(max_sets=2)
+        first, second = store.create("a"), store.create("b")
+        store.get(first.id)
+        store.create("c")
+        assert store.get(second.id) is None
+        assert store.get(first.id) is first
+
+    def test_expires_after_ttl(self, monkeypatch):
+        store = ResultSetStore(ttl_s=10)
+        clock = [100.0]
+        monkeypatch.setattr("app.services.result_sets.time.monotonic", lambda: clock[0])
+        result_set = store.create("a")
+        clock[0] += 5
+        assert store.get(result_set.id) is result_set
+        clock[0] += 11
+        assert store.get(result_set.id) is None
@@ -0,0 +1,136 @@
+import time
+import pytest
+from app.models import SearchCriteria, CachedSearch
+from app.services import geo_tiling
+from app.services.search_cache import (
+    SearchCache, CachedSearchService, InMemorySearchCacheBackend, SqliteSearchCacheBackend, search_cache_key
+)
+from app.services.deadline import deadline_scope, mark_partial
+
+
+def criteria(**overrides) -> SearchCriteria:
+    return SearchCriteria(**{"industry": "Pizza", "location": "Toronto", **overrides})
+
+
+class TestSearchCacheKey:
+    def test_folds_case_and_whitespace(self):
+        assert search_cache_key(criteria(industry="  PIZZA ", location="toronto")) == \
+            search_cache_key(criteria(industry="pizza", location=" Toronto"))
+
+    def test_ignores_max_results(self):
+        assert search_cache_key(criteria(max_results=5)) == search_cache_key(criteria(max_results=50))
+
+    def test_radius_is_part_of_the_key(self):
+        assert search_cache_key(criteria(radius_km=5)) != search_cache_key(criteria(radius_km=50))
+
+    def test_tiled_searches_have_their_own_key(self):
+        assert search_cache_key(criteria(tiling=True)) != search_cache_key(criteria(tiling=False))
+
+    def test_unset_tiling_follows_geo_tiling(self, monkeypatch):
+        monkeypatch.setattr(geo_tiling, "GEO_TILING", True)
+        assert search_cache_key(criteria()) == search_cache_key(criteria(tiling=True))
+        monkeypatch.setattr(geo_tiling, "GEO_TILING", False)
+        assert search_cache_key(criteria()) == search_cache_key(criteria(tiling=False))
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path) -> SearchCache:
+    if request.param == "memory":
+        backend = InMemorySearchCacheBackend()
+    else:
+        backend = SqliteSearchCacheBackend(str(tmp_path / "cache.sqlite3"))
+    return SearchCache(backend, ttl_s=60)
+
+
+@pytest.mark.anyio
+class TestSearchCache:
+    async def test_miss_then_hit(self, cache, make_businesses):
+        assert await cache.lookup(criteria()) is None
+        await cache.store(criteria(max_results=3), make_businesses(3))
+        assert await cache.lookup(criteria(max_results=3)) == make_businesses(3)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_larger_entry_answers_smaller_request(self, cache, make_businesses):
+        await cache.store(criteria(max_results=10), make_businesses(10))
+        assert await cache.lookup(criteria(max_results=4)) == make_businesses(4)
+
+    async def test_smaller_entry_does_not_answer_larger_request(self, cache, make_businesses):
+        await cache.store(criteria(max_results=5), make_businesses(5))
+        assert await cache.lookup(criteria(max_results=10)) is None
+
+    async def test_exhausted_source_answers_any_request(self, cache, make_businesses):
+        # Asked for 20, only 3 existed: that is everything there is
+        await cache.store(criteria(max_results=20), make_businesses(3))
+        assert await cache.lookup(criteria(max_results=50)) == make_businesses(3)
+
+    async def test_smaller_result_does_not_replace_larger_entry(self, cache, make_businesses):
+        await cache.store(criteria(max_results=10), make_businesses(10))
+        await cache.store(criteria(max_results=2), make_businesses(2))
+        assert await cache.lookup(criteria(max_results=10)) == make_businesses(10)
+
+    async def test_expired_entry_is_a_miss_and_is_dropped(self, cache, make_businesses):
+        key = search_cache_key(criteria())
+        await cache.backend.set(key, CachedSearch(
+            businesses=make_businesses(1), max_results=20, stored_at=time.time() - 61
+        ))
+        assert await cache.lookup(criteria()) is None
+        assert cache.expired == 1
+        assert await cache.backend.get(key) is None
+
+    async def test_max_age_s_caps_entry_age(self, cache, make_businesses):
+        await cache.backend.set(search_cache_key(criteria()), CachedSearch(
+            businesses=make_businesses(1), max_results=20, stored_at=time.time() - 30
+        ))
+        assert await cache.lookup(criteria(max_age_s=0)) is None
+        assert await cache.lookup(criteria(max_age_s=10)) is None
+        assert await cache.lookup(criteria(max_age_s=40)) == make_businesses(1)
+        assert await cache.lookup(criteria()) == make_businesses(1)
+
+
+class TestInMemoryBackend:
+    @pytest.mark.anyio
+    async def test_evicts_least_recently_used_over_max_bytes(self, make_businesses):
+        entry = CachedSearch(businesses=make_businesses(1), max_results=1, stored_at=0)
+        size = len(entry.model_dump_json())
+        backend = InMemorySearchCacheBackend(max_bytes=2 * size)
+        await backend.set("a", entry)
+        await backend.set("b", entry)
+        await backend.get("a")
+        await backend.set("c", entry)
+        assert await backend.get("b") is None
+        assert await backend.get("a") is not None
+        assert backend.evictions == 1
+
+
+@pytest.mark.anyio
+class TestCachedSearchService:
+    async def test_second_search_is_served_from_cache(self, fake_service, make_businesses):
+        inner = fake_service(make_businesses(5))
+        service = CachedSearchService(inner, SearchCache(InMemorySearchCacheBackend(), ttl_s=60))
+        first = await service.search_businesses(criteria(max_results=5))
+        second = [b async for b in service.stream_businesses(criteria(max_results=5))]
+        assert first == second == make_businesses(5)
+        assert inner.calls == 1
+
+    async def test_partial_results_are_not_cached(self, make_businesses):
+        class PartialService:
+            calls = 0
+
+            async def search_businesses(self, criteria):
+                self.calls += 1
+                mark_partial()
+                return make_businesses(1)
+
+        inner = PartialService()
+        service = CachedSearchService(inner, SearchCache(InMemorySearchCacheBackend(), ttl_s=60))
+        with deadline_scope(5):
+            await service.search_businesses(criteria())
+        await service.search_businesses(criteria())
+        assert inner.calls == 2
+
+    async def test_disabled_cache_passes_through(self, fake_service, make_businesses):
+        inner = fake_service(make_businesses(1))
+        service = CachedSearchService(inner, SearchCache(InMemorySearchCacheBackend(), ttl_s=0))
+        await service.search_businesses(criteria())
+        await service.search_businesses(criteria())
+        assert inner.calls == 2
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from app.models import SearchCriteria
+from app.services.single_flight import SingleFlight, CoalescingSearchService
+
+
+pytestmark = pytest.mark.anyio
+
+
+class Gate:
+    """A search that runs until released, counting how often it was started."""
+
+    def __init__(self, result):
+        self.result = result
+        self.started = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.result
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_callers_share_one_search(make_businesses):
+    flight = SingleFlight()
+    search = Gate(make_businesses(10))
+    callers = [asyncio.create_task(flight.run("k", 10, search)) for _ in range(3)]
+    await settle()
+    search.release.set()
+    results = await asyncio.gather(*callers)
+    assert search.started == 1
+    assert all(result == make_businesses(10) for result in results)
+    assert flight.stats() == {"in_flight": 0, "started": 1, "coalesced": 2}
+
+
+async def test_smaller_request_joins_and_is_truncated(make_businesses):
+    flight = SingleFlight()
+    search = Gate(make_businesses(10))
+    big = asyncio.create_task(flight.run("k", 10, search))
+    await settle()
+    small = asyncio.create_task(flight.run("k", 3, Gate([])))
+    await settle()
+    search.release.set()
+    assert await small == make_businesses(3)
+    assert len(await big) == 10
+    assert flight.coalesced == 1
+
+
+async def test_larger_request_starts_its_own_search(make_businesses):
+    flight = SingleFlight()
+    small_search, big_search = Gate(make_businesses(3)), Gate(make_businesses(10))
+    small = asyncio.create_task(flight.run("k", 3, small_search))
+    await settle()
+    big = asyncio.create_task(flight.run("k", 10, big_search))
+    await settle()
+    assert (small_search.started, big_search.started) == (1, 1)
+    small_search.release.set()
+    big_search.release.set()
+    await asyncio.gather(small, big)
+
+
+async def test_cancelling_one_waiter_keeps_the_search_for_the_others(make_businesses):
+    flight = SingleFlight()
+    search = Gate(make_businesses(2))
+    first = asyncio.create_task(flight.run("k", 2, search))
+    second = asyncio.create_task(flight.run("k", 2, search))
+    await settle()
+    first.cancel()
+    await settle()
+    assert not search.cancelled
+    search.release.set()
+    assert await second == make_businesses(2)
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_cancelling_the_last_waiter_cancels_the_search():
+    flight = SingleFlight()
+    search = Gate([])
+    caller = asyncio.create_task(flight.run("k", 2, search))
+    await settle()
+    caller.cancel()
+    await settle()
+    assert search.cancelled
+    assert flight.stats()["in_flight"] == 0
+
+
+async def test_join_without_a_running_search_is_none():
+    assert SingleFlight().join("k", 5) is None
+
+
+async def test_finished_search_is_forgotten(make_businesses):
+    flight = SingleFlight()
+    first, second = Gate(make_businesses(1)), Gate(make_businesses(1))
+    first.release.set()
+    second.release.set()
+    await flight.run("k", 1, first)
+    await flight.run("k", 1, second)
+    assert (first.started, second.started) == (1, 1)
+
+
+async def test_budgeted_searches_are_not_coalesced(fake_service, make_businesses):
+    inner = fake_service(make_businesses(2))
+    service = CoalescingSearchService(inner, SingleFlight())
+    criteria = SearchCriteria(industry="pizza", location="toronto", time_budget_s=5)
+    await asyncio.gather(service.search_businesses(criteria), service.search_businesses(criteria))
+    assert inner.calls == 2
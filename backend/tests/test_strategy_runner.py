@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from app.models import SearchCriteria, Business
+from app.services.strategy_runner import HedgedStrategyRunner
+from app.services.deadline import deadline_scope, is_partial
+
+
+pytestmark = pytest.mark.anyio
+
+CRITERIA = SearchCriteria(industry="pizza", location="toronto")
+
+
+class Strategy:
+    """Yields `count` businesses named after it after `delay_s`; counts runs and cancellations."""
+
+    def __init__(self, name: str, delay_s: float, count: int = 1):
+        self.name = name
+        self.delay_s = delay_s
+        self.count = count
+        self.runs = 0
+        self.cancelled = 0
+
+    async def search_businesses(self, criteria):
+        return [b async for b in self.stream_businesses(criteria)]
+
+    async def stream_businesses(self, criteria):
+        self.runs += 1
+        try:
+            await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        for i in range(self.count):
+            yield Business(name=f"{self.name} {i}")
+
+
+async def names(runner, criteria=CRITERIA) -> list[str]:
+    return [b.name async for b in runner.stream_businesses(criteria)]
+
+
+async def test_sequential_falls_back_only_when_empty():
+    maps, web = Strategy("maps", 0), Strategy("web", 0)
+    runner = HedgedStrategyRunner([("maps", maps), ("web", web)], mode="sequential")
+    assert await names(runner) == ["maps 0"]
+    assert web.runs == 0
+    maps.count = 0
+    assert await names(runner) == ["web 0"]
+
+
+async def test_hedge_starts_the_next_strategy_after_the_delay():
+    maps, web = Strategy("maps", 0.5), Strategy("web", 0.01)
+    runner = HedgedStrategyRunner([("maps", maps), ("web", web)], mode="hedge", delay_s=0.05)
+    assert await names(runner) == ["web 0"]
+    assert maps.cancelled == 1
+
+
+async def test_parallel_starts_everything():
+    maps, web = Strategy("maps", 0.01), Strategy("web", 0.5)
+    runner = HedgedStrategyRunner([("maps", maps), ("web", web)], mode="parallel")
+    assert await names(runner) == ["maps 0"]
+    assert (web.runs, web.cancelled) == (1, 1)
+
+
+async def test_cancelled_primary_raises_its_time_to_first_result():
+    maps, web = Strategy("maps", 0.3), Strategy("web", 0.01)
+    runner = HedgedStrategyRunner(
+        [("maps", maps), ("web", web)], mode="adaptive", delay_s=0.05, delay_factor=1.5, min_samples=3
+    )
+    assert runner.hedge_delay(CRITERIA) == 0.05
+    assert await names(runner) == ["web 0"]
+    stats = runner.stats()["patterns"]["pizza"]["maps"]
+    # Not a failed sample, but a lower bound on how long Maps takes
+    assert stats["samples"] == 0 and stats["unfinished"] == 1
+    assert stats["first_result_s"] >= 0.05
+    assert runner.hedge_delay(CRITERIA) >= 0.075
+
+
+async def test_adaptive_hedge_delay_grows_until_the_primary_wins():
+    maps, web = Strategy("maps", 0.2), Strategy("web", 0.01)
+    runner = HedgedStrategyRunner(
+        [("maps", maps), ("web", web)], mode="adaptive", delay_s=0.02, delay_factor=2, min_samples=3
+    )
+    winners = [(await names(runner))[0] for _ in range(8)]
+    assert winners[0] == "web 0"
+    assert winners[-1] == "maps 0"
+    assert runner.stats()["patterns"]["pizza"]["maps"]["samples"] >= 1
+
+
+async def test_adaptive_probes_the_primary_alone_while_warming_up():
+    runner = HedgedStrategyRunner(
+        [("maps", Strategy("maps", 0)), ("web", Strategy("web", 0))], mode="adaptive", probe_every=3
+    )
+    assert [runner.plan(CRITERIA) for _ in range(6)] == ["hedge", "hedge", "sequential"] * 2
+
+
+async def test_adaptive_skips_the_hedge_for_a_reliable_primary():
+    maps, web = Strategy("maps", 0), Strategy("web", 0)
+    runner = HedgedStrategyRunner([("maps", maps), ("web", web)], mode="adaptive", min_samples=2, probe_every=0)
+    for _ in range(2):
+        await names(runner)
+    assert runner.plan(CRITERIA) == "sequential"
+
+
+async def test_hedge_delay_is_capped():
+    runner = HedgedStrategyRunner([("maps", Strategy("maps", 0))], delay_factor=10, max_delay_s=5)
+    runner._stats_for("pizza", "maps").record_unfinished(3)
+    assert runner.hedge_delay(CRITERIA) == 5
+
+
+async def test_no_fallback_past_the_deadline_and_no_placeholder():
+    maps, web = Strategy("maps", 0.1, count=0), Strategy("web", 0)
+    runner = HedgedStrategyRunner(
+        [("maps", maps), ("web", web)], mode="sequential", no_results=lambda c: Business(name="none")
+    )
+    with deadline_scope(0.05):
+        assert await names(runner) == []
+        assert is_partial()
+    assert web.runs == 0
+
+
+async def test_placeholder_when_everything_came_back_empty():
+    runner = HedgedStrategyRunner(
+        [("maps", Strategy("maps", 0, count=0))], mode="sequential", no_results=lambda c: Business(name="none")
+    )
+    assert await names(runner) == ["none"]
@@ -8,19 +8,45 @@ import { useState } from 'react';
 import SearchHeader from '@/components/SearchHeader';
 import BusinessTable from '@/components/BusinessTable';
 import { businessApi } from '@/services/api';
-import { SearchCriteria, SearchResponse } from '@/types/business';
+import { BusinessEnrichment, SearchCriteria, SearchResponse } from '@/types/business';
+
+// Searches this large run as background jobs instead of one long request
+const BACKGROUND_SEARCH_THRESHOLD = 50;
 
 export default function Home() {
   const [searchResults, setSearchResults] = useState<SearchResponse | null>(null);
+  // Emails and social links that trickle in after the search, by result index
+  const [enrichments, setEnrichments] = useState<Record<number, BusinessEnrichment>>({});
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   const handleSearch = async (criteria: SearchCriteria) => {
     setIsLoading(true);
     setError(null);
+    setEnrichments({});
 
     try {
-      const results = await businessApi.searchBusinesses(criteria);
+      if ((criteria.max_results ?? 0) >= BACKGROUND_SEARCH_THRESHOLD) {
+        setSearchResults(await businessApi.searchBusinessesInBackground(criteria));
+        return;
+      }
+
+      // Fill the table in as each business arrives
+      const query = `${criteria.industry} near ${criteria.location}`;
+      setSearchResults({ query, total_results: 0, businesses: [] });
+      const results = await businessApi.streamBusinesses(
+        criteria,
+        (business) => {
+          setSearchResults((current) => {
+            const businesses = [...(current?.businesses ?? []), business];
+            return { query, total_results: businesses.length, businesses };
+          });
+        },
+        undefined,
+        (enrichment, index) => {
+          setEnrichments((current) => ({ ...current, [index]: enrichment }));
+        }
+      );
       setSearchResults(results);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An error occurred');
@@ -57,7 +83,7 @@ export default function Home() {
         )}
 
         {/* Loading State */}
-        {isLoading && (
+        {isLoading && !searchResults?.businesses.length && (
           <div className="bg-white rounded-xl shadow-lg p-12 text-center">
             <div className="inline-block animate-spin rounded-full h-12 w-12 border-4 border-indigo-200 border-t-indigo-600 mb-4"></div>
             <h3 className="text-lg font-semibold text-gray-800 mb-2">Searching for leads...</h3>
@@ -66,10 +92,13 @@ export default function Home() {
         )}
 
         {/* Results */}
-        {searchResults && !isLoading && (
+        {searchResults && (!isLoading || searchResults.businesses.length > 0) && (
           <BusinessTable
+            key={searchResults.result_set_id ?? 'live'}
             businesses={searchResults.businesses}
             query={searchResults.query}
+            resultSetId={searchResults.result_set_id}
+            enrichments={enrichments}
           />
         )}
 
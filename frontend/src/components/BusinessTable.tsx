@@ -1,17 +1,70 @@
 'use client';
 
-import { Business } from '@/types/business';
-import { useState } from 'react';
+import { Business, BusinessEnrichment, ResultPage, ResultSetRow, ResultSetView } from '@/types/business';
+import { businessApi } from '@/services/api';
+import { useEffect, useState } from 'react';
+
+const PAGE_SIZE = 25;
 
 interface BusinessTableProps {
   businesses: Business[];
   query: string;
+  // Once set, rows are read a page at a time, sorted and filtered by the server
+  resultSetId?: string | null;
+  // Contact details found after the search, by index in the results
+  enrichments?: Record<number, BusinessEnrichment>;
 }
 
-export default function BusinessTable({ businesses, query }: BusinessTableProps) {
+export default function BusinessTable({ businesses, query, resultSetId, enrichments }: BusinessTableProps) {
   const [selectedBusinesses, setSelectedBusinesses] = useState<Set<number>>(new Set());
+  const [view, setView] = useState<ResultSetView>({ sort: 'rank', order: 'asc' });
+  // Cursor of every page visited so far; the last one is showing
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [page, setPage] = useState<ResultPage | null>(null);
+  const [pageError, setPageError] = useState<string | null>(null);
+
+  useEffect(() => {
+    if (!resultSetId) return;
+    let cancelled = false;
+    businessApi
+      .getResultPage(resultSetId, view, cursors[cursors.length - 1], PAGE_SIZE)
+      .then((result) => {
+        if (cancelled) return;
+        setPage(result);
+        setPageError(null);
+        setSelectedBusinesses(new Set());
+      })
+      .catch((err) => {
+        if (!cancelled) setPageError(err instanceof Error ? err.message : 'Failed to load results');
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [resultSetId, view, cursors]);
+
+  const changeView = (change: Partial<ResultSetView>) => {
+    setView((current) => ({ ...current, ...change }));
+    setCursors([null]);
+  };
 
-  if (businesses.length === 0) {
+  // Until the first page arrives, show the start of what was streamed
+  const rows: ResultSetRow[] = resultSetId && page
+    ? page.rows
+    : businesses
+        .slice(0, resultSetId ? PAGE_SIZE : undefined)
+        .map((business, index) => ({ index, business }));
+  const visible: Business[] = rows.map(({ index, business }) => {
+    const enrichment = enrichments?.[index];
+    if (!enrichment) return business;
+    return {
+      ...business,
+      email: business.email || enrichment.email,
+      social_links: enrichment.social_links ?? business.social_links,
+    };
+  });
+  const totalResults = resultSetId && page ? page.total_results : businesses.length;
+
+  if (totalResults === 0 && !(resultSetId && !page)) {
     return (
       <div className="bg-white rounded-xl shadow-lg p-8 text-center border border-gray-100">
         <div className="text-6xl mb-4">🔍</div>
@@ -40,15 +93,15 @@ export default function BusinessTable({ businesses, query }: BusinessTableProps)
   };
 
   const selectAll = () => {
-    if (selectedBusinesses.size === businesses.length) {
+    if (selectedBusinesses.size === visible.length) {
       setSelectedBusinesses(new Set());
     } else {
-      setSelectedBusinesses(new Set(businesses.map((_, i) => i)));
+      setSelectedBusinesses(new Set(visible.map((_, i) => i)));
     }
   };
 
   const exportSelected = () => {
-    const selected = businesses.filter((_, i) => selectedBusinesses.has(i));
+    const selected = visible.filter((_, i) => selectedBusinesses.has(i));
     const csv = [
       ['Name', 'Phone', 'Email', 'Address', 'Rating', 'Reviews'],
       ...selected.map(b => [
@@ -83,13 +136,84 @@ export default function BusinessTable({ businesses, query }: BusinessTableProps)
           <div className="flex items-center space-x-3">
             <div className="bg-white px-4 py-2 rounded-lg shadow-sm border border-gray-200">
               <span className="text-2xl font-bold bg-gradient-to-r from-indigo-600 to-purple-600 bg-clip-text text-transparent">
-                {businesses.length}
+                {totalResults}
               </span>
               <span className="text-sm text-gray-600 ml-2">leads</span>
             </div>
           </div>
         </div>
 
+        {/* Server-side sort, filters and paging */}
+        {resultSetId && (
+          <div className="mt-4 flex flex-wrap items-center gap-3 text-sm text-gray-700">
+            <select
+              value={`${view.sort}:${view.order}`}
+              onChange={(e) => {
+                const [sort, order] = e.target.value.split(':') as [ResultSetView['sort'], ResultSetView['order']];
+                changeView({ sort, order });
+              }}
+              className="px-3 py-2 bg-white border border-gray-200 rounded-lg"
+            >
+              <option value="rank:asc">Best match</option>
+              <option value="rating:desc">Highest rated</option>
+              <option value="reviews_count:desc">Most reviewed</option>
+              <option value="name:asc">Name A–Z</option>
+            </select>
+            <select
+              value={view.min_rating ?? ''}
+              onChange={(e) => changeView({ min_rating: e.target.value ? Number(e.target.value) : undefined })}
+              className="px-3 py-2 bg-white border border-gray-200 rounded-lg"
+            >
+              <option value="">Any rating</option>
+              <option value="3">3★ and up</option>
+              <option value="4">4★ and up</option>
+              <option value="4.5">4.5★ and up</option>
+            </select>
+            <label className="flex items-center space-x-1">
+              <input
+                type="checkbox"
+                checked={view.has_phone ?? false}
+                onChange={(e) => changeView({ has_phone: e.target.checked || undefined })}
+                className="w-4 h-4 text-indigo-600 rounded focus:ring-indigo-500"
+              />
+              <span>Has phone</span>
+            </label>
+            <label className="flex items-center space-x-1">
+              <input
+                type="checkbox"
+                checked={view.has_website ?? false}
+                onChange={(e) => changeView({ has_website: e.target.checked || undefined })}
+                className="w-4 h-4 text-indigo-600 rounded focus:ring-indigo-500"
+              />
+              <span>Has website</span>
+            </label>
+            {page && (
+              <div className="ml-auto flex items-center space-x-2">
+                <span>
+                  {page.matching_results === 0
+                    ? 'No matches'
+                    : `${(cursors.length - 1) * PAGE_SIZE + 1}–${(cursors.length - 1) * PAGE_SIZE + page.rows.length} of ${page.matching_results}`}
+                </span>
+                <button
+                  onClick={() => setCursors((current) => current.slice(0, -1))}
+                  disabled={cursors.length === 1}
+                  className="px-3 py-1 bg-white border border-gray-200 rounded-lg disabled:opacity-50"
+                >
+                  ‹ Prev
+                </button>
+                <button
+                  onClick={() => setCursors((current) => [...current, page.next_cursor ?? null])}
+                  disabled={!page.next_cursor}
+                  className="px-3 py-1 bg-white border border-gray-200 rounded-lg disabled:opacity-50"
+                >
+                  Next ›
+                </button>
+              </div>
+            )}
+          </div>
+        )}
+        {pageError && <p className="mt-2 text-sm text-red-600">{pageError}</p>}
+
         {/* Bulk Actions */}
         {selectedBusinesses.size > 0 && (
           <div className="mt-4 flex items-center justify-between bg-white rounded-lg p-3 border border-indigo-200">
@@ -122,7 +246,7 @@ export default function BusinessTable({ businesses, query }: BusinessTableProps)
               <th className="px-6 py-4 text-left">
                 <input
                   type="checkbox"
-                  checked={selectedBusinesses.size === businesses.length}
+                  checked={visible.length > 0 && selectedBusinesses.size === visible.length}
                   onChange={selectAll}
                   className="w-4 h-4 text-indigo-600 rounded focus:ring-indigo-500"
                 />
@@ -145,7 +269,7 @@ export default function BusinessTable({ businesses, query }: BusinessTableProps)
             </tr>
           </thead>
           <tbody className="divide-y divide-gray-200">
-            {businesses.map((business, index) => (
+            {visible.map((business, index) => (
               <tr key={index} className="hover:bg-gray-50 transition-colors">
                 {/* Checkbox */}
                 <td className="px-6 py-4">
@@ -15,6 +15,8 @@ export default function SearchHeader({ onSearch, isLoading, resultsCount }: Sear
   const [radiusKm, setRadiusKm] = useState(10);
   const [maxResults, setMaxResults] = useState(20);
   const [showAdvanced, setShowAdvanced] = useState(false);
+  // Crawling every result's website is opt-in; unchecked leaves the server default
+  const [enrich, setEnrich] = useState(false);
 
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault();
@@ -29,6 +31,7 @@ export default function SearchHeader({ onSearch, isLoading, resultsCount }: Sear
       location: location.trim(),
       radius_km: radiusKm,
       max_results: maxResults,
+      ...(enrich ? { enrich: true } : {}),
     });
   };
 
@@ -184,6 +187,20 @@ export default function SearchHeader({ onSearch, isLoading, resultsCount }: Sear
                   <option value="50">50 results</option>
                 </select>
               </div>
+
+              {/* Website Enrichment */}
+              <div className="col-span-2">
+                <label className="flex items-center gap-2 text-xs font-medium text-gray-700 cursor-pointer">
+                  <input
+                    type="checkbox"
+                    checked={enrich}
+                    onChange={(e) => setEnrich(e.target.checked)}
+                    className="h-3.5 w-3.5 rounded border-gray-300 accent-indigo-600"
+                    disabled={isLoading}
+                  />
+                  Find emails and social links on business websites (slower)
+                </label>
+              </div>
             </div>
           </div>
         )}
@@ -3,9 +3,20 @@
  * Following Single Responsibility Principle - only handles API calls.
  */
 import axios from 'axios';
-import { SearchCriteria, SearchResponse } from '@/types/business';
+import {
+  Business,
+  BusinessEnrichment,
+  ExportFormat,
+  ResultPage,
+  ResultSetView,
+  SearchCriteria,
+  SearchJob,
+  SearchResponse,
+  SearchStreamFrame,
+} from '@/types/business';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+const JOB_POLL_INTERVAL_MS = 2000;
 
 class BusinessApiService {
   private api = axios.create({
@@ -33,6 +44,246 @@ class BusinessApiService {
     }
   }
 
+  /**
+   * Search for businesses, receiving each one as soon as the server has it.
+   * Uses fetch because axios cannot read a streaming body in the browser.
+   * Aborting `signal` closes the connection, which cancels the scrape.
+   *
+   * With criteria.enrich, contact details found on business websites keep
+   * arriving after the search has resolved; they are passed to
+   * `onEnrichment` with the business's index.
+   */
+  async streamBusinesses(
+    criteria: SearchCriteria,
+    onBusiness: (business: Business, index: number) => void,
+    signal?: AbortSignal,
+    onEnrichment?: (enrichment: BusinessEnrichment, index: number) => void
+  ): Promise<SearchResponse> {
+    const response = await fetch(`${API_BASE_URL}/api/businesses/search/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(criteria),
+      signal,
+    });
+    if (!response.ok || !response.body) {
+      throw new Error('Failed to search businesses');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const businesses: Business[] = [];
+    let buffer = '';
+
+    const handleLine = (line: string): SearchResponse | null => {
+      if (!line.trim()) return null;
+      const frame = JSON.parse(line) as SearchStreamFrame;
+      if (frame.type === 'business') {
+        businesses.push(frame.business);
+        onBusiness(frame.business, frame.index);
+        return null;
+      }
+      if (frame.type === 'error') {
+        throw new Error(frame.detail);
+      }
+      if (frame.type === 'enrichment') {
+        onEnrichment?.({ email: frame.email, social_links: frame.social_links }, frame.index);
+        return null;
+      }
+      if (frame.type === 'enrichment_done') {
+        return null;
+      }
+      return {
+        query: frame.query,
+        total_results: frame.total_results,
+        businesses,
+        partial: frame.partial,
+        result_set_id: frame.result_set_id,
+      };
+    };
+
+    // Enrichment frames follow the summary; read them without holding up the results
+    const readEnrichment = async (lines: string[]) => {
+      try {
+        lines.forEach(handleLine);
+        while (true) {
+          const { done, value } = await reader.read();
+          buffer += decoder.decode(value, { stream: !done });
+          const rest = buffer.split('\n');
+          buffer = rest.pop() ?? '';
+          rest.forEach(handleLine);
+          if (done) {
+            handleLine(buffer);
+            return;
+          }
+        }
+      } catch {
+        // Contact details are a bonus; losing them is not a search error
+      }
+    };
+
+    const finish = (summary: SearchResponse, rest: string[]): SearchResponse => {
+      if (criteria.enrich && onEnrichment) {
+        // After the caller has stored the results the enrichment applies to
+        setTimeout(() => void readEnrichment(rest), 0);
+      } else {
+        void reader.cancel();
+      }
+      return summary;
+    };
+
+    while (true) {
+      const { done, value } = await reader.read();
+      buffer += decoder.decode(value, { stream: !done });
+
+      const lines = buffer.split('\n');
+      buffer = lines.pop() ?? '';
+      for (let i = 0; i < lines.length; i++) {
+        const summary = handleLine(lines[i]);
+        if (summary) return finish(summary, lines.slice(i + 1));
+      }
+
+      if (done) {
+        const summary = handleLine(buffer);
+        if (summary) return summary;
+        throw new Error('Search ended unexpectedly');
+      }
+    }
+  }
+
+  /**
+   * Queue a search to run in the background on the server.
+   */
+  async submitSearchJob(criteria: SearchCriteria, priority = 0): Promise<SearchJob> {
+    try {
+      const response = await this.api.post<SearchJob>('/api/businesses/jobs', {
+        criteria,
+        priority,
+      });
+      return response.data;
+    } catch (error) {
+      if (axios.isAxiosError(error)) {
+        if (error.response?.status === 429) {
+          throw new Error('The server is busy, please try again in a moment');
+        }
+        throw new Error(error.response?.data?.detail || 'Failed to queue search');
+      }
+      throw error;
+    }
+  }
+
+  /**
+   * Get the status of a background search.
+   */
+  async getSearchJob(jobId: string): Promise<SearchJob> {
+    const response = await this.api.get<SearchJob>(`/api/businesses/jobs/${jobId}`);
+    return response.data;
+  }
+
+  /**
+   * Get the results of a completed background search.
+   */
+  async getSearchJobResults(jobId: string): Promise<SearchResponse> {
+    const response = await this.api.get<SearchResponse>(`/api/businesses/jobs/${jobId}/results`);
+    return response.data;
+  }
+
+  /**
+   * Cancel a queued or running background search.
+   */
+  async cancelSearchJob(jobId: string): Promise<SearchJob> {
+    const response = await this.api.delete<SearchJob>(`/api/businesses/jobs/${jobId}`);
+    return response.data;
+  }
+
+  /**
+   * Run a search as a background job and poll until it finishes.
+   * Used for large searches so no HTTP request is held open for minutes.
+   */
+  async searchBusinessesInBackground(
+    criteria: SearchCriteria,
+    onStatus?: (job: SearchJob) => void
+  ): Promise<SearchResponse> {
+    let job = await this.submitSearchJob(criteria);
+
+    while (job.status === 'queued' || job.status === 'running') {
+      onStatus?.(job);
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+      job = await this.getSearchJob(job.id);
+    }
+
+    if (job.status !== 'completed') {
+      throw new Error(job.error || `Search ${job.status}`);
+    }
+    if (job.result_set_id) {
+      // The table reads pages from the server; no need to download every row
+      return {
+        query: `${criteria.industry} near ${criteria.location}`,
+        total_results: job.total_results ?? 0,
+        businesses: [],
+        partial: job.partial ?? false,
+        result_set_id: job.result_set_id,
+      };
+    }
+    return this.getSearchJobResults(job.id);
+  }
+
+  /**
+   * Read one page of a search's results, sorted and filtered by the server.
+   * Pass the previous page's next_cursor (with the same view) for the next one.
+   */
+  async getResultPage(
+    resultSetId: string,
+    view: ResultSetView,
+    cursor?: string | null,
+    limit = 25
+  ): Promise<ResultPage> {
+    try {
+      const response = await this.api.get<ResultPage>(`/api/businesses/results/${resultSetId}`, {
+        params: { ...view, cursor: cursor ?? undefined, limit },
+      });
+      return response.data;
+    } catch (error) {
+      if (axios.isAxiosError(error)) {
+        if (error.response?.status === 404) {
+          throw new Error('These results have expired, please search again');
+        }
+        throw new Error(error.response?.data?.detail || 'Failed to load results');
+      }
+      throw error;
+    }
+  }
+
+  /**
+   * Download link for a result set with its sort and filters applied.
+   */
+  resultSetExportUrl(resultSetId: string, view: ResultSetView, format: ExportFormat = 'csv'): string {
+    const params = new URLSearchParams({ format });
+    Object.entries(view).forEach(([key, value]) => {
+      if (value !== undefined) params.set(key, String(value));
+    });
+    return `${API_BASE_URL}/api/businesses/results/${resultSetId}/export?${params}`;
+  }
+
+  /**
+   * Download link for a completed background search's results as a file.
+   * The server streams it, so large exports never sit in browser memory.
+   */
+  jobExportUrl(jobId: string, format: ExportFormat = 'csv'): string {
+    return `${API_BASE_URL}/api/businesses/jobs/${jobId}/export?format=${format}`;
+  }
+
+  /**
+   * Download link for every stored business, or the last run of one search.
+   */
+  storeExportUrl(format: ExportFormat = 'csv', industry?: string, location?: string): string {
+    const params = new URLSearchParams({ format });
+    if (industry && location) {
+      params.set('industry', industry);
+      params.set('location', location);
+    }
+    return `${API_BASE_URL}/api/businesses/store/export?${params}`;
+  }
+
   /**
    * Health check for API.
    */
@@ -11,6 +11,8 @@ export interface Business {
     website?: string | null;
     rating?: number | null;
     reviews_count?: number | null;
+    social_links?: Record<string, string> | null;
+    refreshed_at?: number | null;
   }
   
   export interface SearchCriteria {
@@ -18,10 +20,75 @@ export interface Business {
     location: string;
     radius_km?: number;
     max_results?: number;
+    detail_concurrency?: number;
+    max_age_s?: number;
+    tiling?: boolean;
+    time_budget_s?: number;
+    enrich?: boolean;
   }
   
   export interface SearchResponse {
     query: string;
     total_results: number;
     businesses: Business[];
-  }
\ No newline at end of file
+    partial?: boolean;
+    result_set_id?: string | null;
+  }
+
+  export type ExportFormat = 'csv' | 'xlsx' | 'parquet';
+
+  export type JobStatus = 'queued' | 'running' | 'completed' | 'failed' | 'cancelled';
+
+  export interface SearchJob {
+    id: string;
+    status: JobStatus;
+    priority: number;
+    criteria: SearchCriteria;
+    submitted_at: number;
+    started_at?: number | null;
+    finished_at?: number | null;
+    queue_position?: number | null;
+    total_results?: number | null;
+    partial?: boolean | null;
+    result_set_id?: string | null;
+    error?: string | null;
+  }
+
+  export type SearchStreamFrame =
+    | { type: 'business'; index: number; business: Business }
+    | { type: 'summary'; query: string; total_results: number; partial: boolean; result_set_id: string }
+    | { type: 'error'; detail: string }
+    | { type: 'enrichment'; index: number; email: string | null; social_links: Record<string, string> | null }
+    | { type: 'enrichment_done'; enriched: number };
+
+  /** Contact details found on a business website after the search finished. */
+  export type BusinessEnrichment = Pick<Business, 'email' | 'social_links'>;
+
+  export type ResultSetSort = 'rank' | 'rating' | 'reviews_count' | 'name';
+
+  /** Server-side sort and filters of a result set. */
+  export interface ResultSetView {
+    sort: ResultSetSort;
+    order: 'asc' | 'desc';
+    min_rating?: number;
+    min_reviews?: number;
+    has_phone?: boolean;
+    has_website?: boolean;
+    has_email?: boolean;
+  }
+
+  export interface ResultSetRow {
+    index: number;
+    business: Business;
+  }
+
+  export interface ResultPage {
+    result_set_id: string;
+    query: string;
+    total_results: number;
+    matching_results: number;
+    rows: ResultSetRow[];
+    next_cursor?: string | null;
+    complete: boolean;
+    partial: boolean;
+  }